@@ -16,142 +16,186 @@
 """
 Provides fitter functions.
 
-Import into BayesicFitting itself all classes that are directly usable.
-I.e. leave out the base classes and helper classes.
-
-TBC: How much time does this take. Everything is translated ??
+All classes that are directly usable are available from BayesicFitting itself.
+They are imported on first use (see __getattr__), so that importing the
+package is fast and only pulls in what is actually needed.
 
 """
 
-from .source.AmoebaFitter import AmoebaFitter
-from .source.AnnealingAmoeba import AnnealingAmoeba
-from .source.ArctanModel import ArctanModel
-from .source.BSplinesModel import BSplinesModel
-from .source.BaseFitter import BaseFitter
-from .source.BaseModel import BaseModel
-from .source.BirthEngine import BirthEngine
-from .source.BracketModel import BracketModel
-from .source.CauchyErrorDistribution import CauchyErrorDistribution
-from .source.CauchyPrior import CauchyPrior
-from .source.CircularUniformPrior import CircularUniformPrior
-from .source.ChebyshevPolynomialModel import ChebyshevPolynomialModel
-from .source.ChordEngine import ChordEngine
-from .source.ClassicProblem import ClassicProblem
-from .source.CombiModel import CombiModel
-from .source.ConstantModel import ConstantModel
-from .source.ConvergenceError import ConvergenceError
-from .source.CrossEngine import CrossEngine
-from .source.CurveFitter import CurveFitter
-from .source.DeathEngine import DeathEngine
-from .source.Dynamic import Dynamic
-from .source.Engine import Engine
-from .source.ErrorDistribution import ErrorDistribution
-from .source.ErrorsInXandYProblem import ErrorsInXandYProblem
-from .source.EtalonDriftModel import EtalonDriftModel
-from .source.EtalonModel import EtalonModel
-from .source.ExpModel import ExpModel
-from .source.Explorer import Explorer
-from .source.ExponentialErrorDistribution import ExponentialErrorDistribution
-from .source.ExponentialPrior import ExponentialPrior
-from .source.Fitter import Fitter
-from .source.FixedModel import FixedModel
-#from .source.FreeShape2dModel import FreeShape2dModel
-from .source.FreeShapeModel import FreeShapeModel
-from .source.GalileanEngine import GalileanEngine
-from .source.GaussErrorDistribution import GaussErrorDistribution
-from .source.GaussModel import GaussModel
-from .source.GaussPrior import GaussPrior
-#from .source.GenGaussErrorDistribution import GenGaussErrorDistribution
-from .source.GibbsEngine import GibbsEngine
-from .source.HarmonicModel import HarmonicModel
-from .source.HarmonicDynamicModel import HarmonicDynamicModel
-from .source.HyperParameter import HyperParameter
-from .source.ImageAssistant import ImageAssistant
-from .source.IterationPlotter import IterationPlotter
-from .source.IterativeFitter import IterativeFitter
-from .source.JeffreysPrior import JeffreysPrior
-from .source.Kepplers2ndLaw import Kepplers2ndLaw
-from .source.Kernel2dModel import Kernel2dModel
-from .source.KernelModel import KernelModel
-from .source.LaplaceErrorDistribution import LaplaceErrorDistribution
-from .source.LaplacePrior import LaplacePrior
-from .source.LevenbergMarquardtFitter import LevenbergMarquardtFitter
-from .source.LinearModel import LinearModel
-from .source.LogFactorial import logFactorial
-from .source.LorentzModel import LorentzModel
-from .source.MaxLikelihoodFitter import MaxLikelihoodFitter
-from .source.MixedErrorDistribution import MixedErrorDistribution
-from .source.Model import Model
-from .source.MonteCarlo import MonteCarlo
-from .source.MultipleOutputProblem import MultipleOutputProblem
-from .source.NestedSampler import NestedSampler
-from .source.NoiseScale import NoiseScale
-from .source.NonLinearModel import NonLinearModel
-#from .source.OrderEngine import OrderEngine
-from .source.OrthonormalBasis import OrthonormalBasis
-from .source.PadeModel import PadeModel
-from .source.PoissonErrorDistribution import PoissonErrorDistribution
-from .source.PolySineAmpModel import PolySineAmpModel
-from .source.PolySurfaceModel import PolySurfaceModel
-from .source.PolynomialDynamicModel import PolynomialDynamicModel
-from .source.PolynomialModel import PolynomialModel
-from .source.PowerLawModel import PowerLawModel
-from .source.PowerModel import PowerModel
-from .source.Prior import Prior
-from .source.Problem import Problem
-from .source.ProductModel import ProductModel
-from .source.PseudoVoigtModel import PseudoVoigtModel
-from .source.QRFitter import QRFitter
-from .source.RadialVelocityModel import RadialVelocityModel
-from .source.RandomEngine import RandomEngine
-from .source.RepeatingModel import RepeatingModel
-from .source.RobustShell import RobustShell
-from .source.Sample import Sample
-from .source.SampleList import SampleList
-from .source.ScaledErrorDistribution import ScaledErrorDistribution
-## import all fitters inside ScipyFitter
-from .source.ScipyFitter import *
-from .source.SincModel import SincModel
-from .source.SineAmpModel import SineAmpModel
-from .source.SineDriftModel import SineDriftModel
-from .source.SineModel import SineModel
-from .source.SineSplineDriftModel import SineSplineDriftModel
-from .source.SineSplineModel import SineSplineModel
-from .source.SplinesModel import SplinesModel
-from .source.StartEngine import StartEngine
-from .source.StepEngine import StepEngine
-from .source.StellarOrbitModel import StellarOrbitModel
-from .source.SurfaceSplinesModel import SurfaceSplinesModel
-from .source.UniformErrorDistribution import UniformErrorDistribution
-from .source.UniformPrior import UniformPrior
-from .source.VoigtModel import VoigtModel
-from .source.Walker import Walker
-from .source.WalkerList import WalkerList
+import importlib
+
+## name : module from which the name is imported on first use
+_lazy = {
+    "AmoebaFitter" : ".source.AmoebaFitter",
+    "AnnealingAmoeba" : ".source.AnnealingAmoeba",
+    "ArctanModel" : ".source.ArctanModel",
+    "BSplinesModel" : ".source.BSplinesModel",
+    "BaseFitter" : ".source.BaseFitter",
+    "BaseModel" : ".source.BaseModel",
+    "BirthEngine" : ".source.BirthEngine",
+    "BracketModel" : ".source.BracketModel",
+    "CauchyErrorDistribution" : ".source.CauchyErrorDistribution",
+    "CauchyPrior" : ".source.CauchyPrior",
+    "CircularUniformPrior" : ".source.CircularUniformPrior",
+    "ChebyshevPolynomialModel" : ".source.ChebyshevPolynomialModel",
+    "ChordEngine" : ".source.ChordEngine",
+    "ClassicProblem" : ".source.ClassicProblem",
+    "CombiModel" : ".source.CombiModel",
+    "ConstantModel" : ".source.ConstantModel",
+    "ConvergenceError" : ".source.ConvergenceError",
+    "CrossEngine" : ".source.CrossEngine",
+    "CurveFitter" : ".source.CurveFitter",
+    "DeathEngine" : ".source.DeathEngine",
+    "Dynamic" : ".source.Dynamic",
+    "EllipsoidEngine" : ".source.EllipsoidEngine",
+    "Engine" : ".source.Engine",
+    "EngineScheduler" : ".source.EngineScheduler",
+    "ErrorDistribution" : ".source.ErrorDistribution",
+    "ErrorsInXandYProblem" : ".source.ErrorsInXandYProblem",
+    "EtalonDriftModel" : ".source.EtalonDriftModel",
+    "EtalonModel" : ".source.EtalonModel",
+    "ExpModel" : ".source.ExpModel",
+    "Explorer" : ".source.Explorer",
+    "ExponentialErrorDistribution" : ".source.ExponentialErrorDistribution",
+    "ExponentialPrior" : ".source.ExponentialPrior",
+    "Fitter" : ".source.Fitter",
+    "FixedModel" : ".source.FixedModel",
+#    "FreeShape2dModel" : ".source.FreeShape2dModel",
+    "FreeShapeModel" : ".source.FreeShapeModel",
+    "GalileanEngine" : ".source.GalileanEngine",
+    "GaussErrorDistribution" : ".source.GaussErrorDistribution",
+    "GaussModel" : ".source.GaussModel",
+    "GaussPrior" : ".source.GaussPrior",
+#    "GenGaussErrorDistribution" : ".source.GenGaussErrorDistribution",
+    "GibbsEngine" : ".source.GibbsEngine",
+    "HarmonicModel" : ".source.HarmonicModel",
+    "HarmonicDynamicModel" : ".source.HarmonicDynamicModel",
+    "HyperParameter" : ".source.HyperParameter",
+    "ImageAssistant" : ".source.ImageAssistant",
+    "IterationPlotter" : ".source.IterationPlotter",
+    "IterativeFitter" : ".source.IterativeFitter",
+    "JeffreysPrior" : ".source.JeffreysPrior",
+    "Kepplers2ndLaw" : ".source.Kepplers2ndLaw",
+    "Kernel2dModel" : ".source.Kernel2dModel",
+    "KernelModel" : ".source.KernelModel",
+    "LaplaceErrorDistribution" : ".source.LaplaceErrorDistribution",
+    "LaplacePrior" : ".source.LaplacePrior",
+    "LevenbergMarquardtFitter" : ".source.LevenbergMarquardtFitter",
+    "LinearModel" : ".source.LinearModel",
+    "logFactorial" : ".source.LogFactorial",
+    "LorentzModel" : ".source.LorentzModel",
+    "MaxLikelihoodFitter" : ".source.MaxLikelihoodFitter",
+    "MixedErrorDistribution" : ".source.MixedErrorDistribution",
+    "Model" : ".source.Model",
+    "MonteCarlo" : ".source.MonteCarlo",
+    "MultipleOutputProblem" : ".source.MultipleOutputProblem",
+    "NestedSampler" : ".source.NestedSampler",
+    "NoiseScale" : ".source.NoiseScale",
+    "NonLinearModel" : ".source.NonLinearModel",
+#    "OrderEngine" : ".source.OrderEngine",
+    "OrthonormalBasis" : ".source.OrthonormalBasis",
+    "PadeModel" : ".source.PadeModel",
+    "PoissonErrorDistribution" : ".source.PoissonErrorDistribution",
+    "PolySineAmpModel" : ".source.PolySineAmpModel",
+    "PolySurfaceModel" : ".source.PolySurfaceModel",
+    "PolynomialDynamicModel" : ".source.PolynomialDynamicModel",
+    "PolynomialModel" : ".source.PolynomialModel",
+    "PowerLawModel" : ".source.PowerLawModel",
+    "PowerModel" : ".source.PowerModel",
+    "Prior" : ".source.Prior",
+    "PriorTable" : ".source.PriorTable",
+    "Problem" : ".source.Problem",
+    "ProductModel" : ".source.ProductModel",
+    "PseudoVoigtModel" : ".source.PseudoVoigtModel",
+    "QRFitter" : ".source.QRFitter",
+    "RadialVelocityModel" : ".source.RadialVelocityModel",
+    "RandomEngine" : ".source.RandomEngine",
+    "RepeatingModel" : ".source.RepeatingModel",
+    "RobustShell" : ".source.RobustShell",
+    "Sample" : ".source.Sample",
+    "SampleList" : ".source.SampleList",
+    "ScaledErrorDistribution" : ".source.ScaledErrorDistribution",
+    ## all fitters inside ScipyFitter
+    "ScipyFitter" : ".source.ScipyFitter",
+    "NelderMeadFitter" : ".source.ScipyFitter",
+    "PowellFitter" : ".source.ScipyFitter",
+    "ConjugateGradientFitter" : ".source.ScipyFitter",
+    "BfgsFitter" : ".source.ScipyFitter",
+    "NewtonCgFitter" : ".source.ScipyFitter",
+    "LbfgsbFitter" : ".source.ScipyFitter",
+    "TncFitter" : ".source.ScipyFitter",
+    "CobylaFitter" : ".source.ScipyFitter",
+    "SlsqpFitter" : ".source.ScipyFitter",
+    "DoglegFitter" : ".source.ScipyFitter",
+    "TrustNcgFitter" : ".source.ScipyFitter",
+    "SincModel" : ".source.SincModel",
+    "SineAmpModel" : ".source.SineAmpModel",
+    "SineDriftModel" : ".source.SineDriftModel",
+    "SineModel" : ".source.SineModel",
+    "SineSplineDriftModel" : ".source.SineSplineDriftModel",
+    "SineSplineModel" : ".source.SineSplineModel",
+    "SplinesModel" : ".source.SplinesModel",
+    "StartEngine" : ".source.StartEngine",
+    "StepEngine" : ".source.StepEngine",
+    "StopStart" : ".source.StopStart",
+    "StreamFitter" : ".source.StreamFitter",
+    "StellarOrbitModel" : ".source.StellarOrbitModel",
+    "SurfaceSplinesModel" : ".source.SurfaceSplinesModel",
+    "UniformErrorDistribution" : ".source.UniformErrorDistribution",
+    "UniformPrior" : ".source.UniformPrior",
+    "VoigtModel" : ".source.VoigtModel",
+    "Walker" : ".source.Walker",
+    "WalkerList" : ".source.WalkerList",
+
+    "formatter" : ".source.Formatter",
+    "fma" : ".source.Formatter",
+    "formatter_init" : ".source.Formatter",
+    "plotFit" : ".source.Plotter",
+    "printclass" : ".source.Tools",
+    "Tools" : ".source.Tools",
+#    "bspline" : ".source.bspline",
+#    "splinelab" : ".source.splinelab",
+
+#    "bspline" : ".source.bsplines.bspline",
+#    "splinelab" : ".source.bsplines.splinelab",
+
+    "Biweight" : ".source.kernels.Biweight",
+    "CosSquare" : ".source.kernels.CosSquare",
+    "Cosine" : ".source.kernels.Cosine",
+    "Gauss" : ".source.kernels.Gauss",
+    "Huber" : ".source.kernels.Huber",
+    "Kernel" : ".source.kernels.Kernel",
+    "Lorentz" : ".source.kernels.Lorentz",
+    "Parabola" : ".source.kernels.Parabola",
+    "Sinc" : ".source.kernels.Sinc",
+    "Triangle" : ".source.kernels.Triangle",
+    "Tophat" : ".source.kernels.Tophat",
+    "Tricube" : ".source.kernels.Tricube",
+    "Triweight" : ".source.kernels.Triweight",
+    "Uniform" : ".source.kernels.Uniform",
+}
+
+## names that are modules themselves
+_modules = ["Tools"]
+
+__all__ = list( _lazy )
 
-from .source.Formatter import formatter
-from .source.Formatter import fma
-from .source.Formatter import formatter_init
-from .source.Plotter import plotFit
-from .source.Tools import printclass
-from .source import Tools
-#from .source import bspline
-#from .source import splinelab
+def __getattr__( name ) :
+    """
+    Import the named class (or function) on first use and keep it.
 
-#from .source.bsplines.bspline import bspline
-#from .source.bsplines.splinelab import splinelab
+    Parameters
+    ----------
+    name : str
+        name of the class
+    """
+    if name not in _lazy :
+        raise AttributeError( "module %s has no attribute %s" % ( __name__, name ) )
 
-from .source.kernels.Biweight import Biweight
-from .source.kernels.CosSquare import CosSquare
-from .source.kernels.Cosine import Cosine
-from .source.kernels.Gauss import Gauss
-from .source.kernels.Huber import Huber
-from .source.kernels.Kernel import Kernel
-from .source.kernels.Lorentz import Lorentz
-from .source.kernels.Parabola import Parabola
-from .source.kernels.Sinc import Sinc
-from .source.kernels.Triangle import Triangle
-from .source.kernels.Tophat import Tophat
-from .source.kernels.Tricube import Tricube
-from .source.kernels.Triweight import Triweight
-from .source.kernels.Uniform import Uniform
+    module = importlib.import_module( _lazy[name], __name__ )
+    value = module if name in _modules else getattr( module, name )
+    globals()[name] = value
+    return value
 
+def __dir__( ) :
+    return sorted( set( globals() ) | set( _lazy ) )
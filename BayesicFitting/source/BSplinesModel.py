@@ -183,12 +183,15 @@ class BSplinesModel( LinearModel ):
         rerun = False
         if name == "knots" :
             setatt( self, name, value, type=float, islist=True )
+            self.clearDesign()
             rerun = True
         elif name == "order" :
             setatt( self, name, value, type=int )
+            self.clearDesign()
             rerun = True
         elif name == "eps" :
             setatt( self, name, value, type=float )
+            self.clearDesign()
 
         else :
             super( BSplinesModel, self ).__setattr__( name, value )
@@ -218,16 +221,42 @@ class BSplinesModel( LinearModel ):
         ValueError when xdata < knots[0] or xdata > knots[1]
 
         """
-        if numpy.any( xdata < self.knots[0] ) or numpy.any( xdata > self.knots[-1] ) :
-            print( "Min max data : ", numpy.min( xdata ), numpy.max( xdata ),
-                   "  knots : ", self.knots[0], self.knots[-1] )
-            raise ValueError( "Input data need to fall strictly in the domain spanned by knots" )
+        self.checkDomain( xdata )
 
         partial = Tools.toArray( self._bspline.collmat( xdata ), ndim=2 )
 
         return partial
 
 
+    def basePartialBand( self, xdata, params ):
+        """
+        Returns the partials at the input value in banded form ( values, first ).
+
+        At each xdata only order+1 consecutive basis splines are nonzero.
+        They are in values[i,:], starting at parameter first[i].
+
+        Parameters
+        ----------
+        xdata : array_like
+            value at which to calculate the partials
+        params : array_like
+            parameters to the model (ignored in LinearModels)
+
+        Raises
+        ------
+        ValueError when xdata < knots[0] or xdata > knots[1]
+
+        """
+        self.checkDomain( xdata )
+        return self._bspline.collband( xdata )
+
+    def checkDomain( self, xdata ) :
+        """ Raise ValueError when xdata fall outside the knots.  """
+        if numpy.any( xdata < self.knots[0] ) or numpy.any( xdata > self.knots[-1] ) :
+            print( "Min max data : ", numpy.min( xdata ), numpy.max( xdata ),
+                   "  knots : ", self.knots[0], self.knots[-1] )
+            raise ValueError( "Input data need to fall strictly in the domain spanned by knots" )
+
     def baseDerivative( self, xdata, params ) :
         """
         Return the derivative df/dx at each xdata (=x).
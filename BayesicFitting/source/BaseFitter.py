@@ -1,7 +1,6 @@
 import numpy as numpy
 import math
 import warnings
-import matplotlib.pyplot as plt
 
 from .ImageAssistant import ImageAssistant
 from .MonteCarlo import MonteCarlo
@@ -125,6 +124,21 @@ class BaseFitter( object ):
         the 10log of the evidence (logZ / log(10))
         returns self.getEvidence()
 
+    Attributes (available after a call to fitBatch())
+    ----------
+    batchParameters : ndarray of shape ( nsets, npchain )
+        parameters fitted to each of the datasets
+    batchChisq : ndarray of shape ( nsets, )
+        chisquared of each of the fits
+    batchIndex : ndarray of int (read only)
+        indices of the parameters fitted in the batch
+    batchSumwgt : float or ndarray (read only)
+        sum of the weights of each of the datasets
+    batchInverseDiagonal : ndarray (read only)
+        diagonal of the inverse hessian, shared or per dataset
+    batchLogDet : float or ndarray (read only)
+        log of the determinant of the hessian, shared or per dataset
+
     Attributes (available after a call to getLogZ() or getEvidence())
     ----------
     logOccam : float (read only)
@@ -485,6 +499,14 @@ class BaseFitter( object ):
         """
         if self.model.isNullModel() :
             return numpy.asarray( 0 )
+
+        band = self.getBand( index=index )
+        if band is not None :
+            ( values, first ) = band
+            ydata = numpy.asarray( ydata, dtype=float )
+            return sum( [numpy.bincount( first + k, weights=values[:,k] * ydata,
+                         minlength=self.model.npchain ) for k in range( values.shape[1] )] )
+
         design = self.getDesign( index=index )
 
         return numpy.inner( design.transpose(), ydata )
@@ -512,6 +534,10 @@ class BaseFitter( object ):
         if self.model.isNullModel() :
             return
 
+        band = self.getBand( params=params, index=index )
+        if band is not None :
+            return self.band2Hessian( self.getBandHessian( band, weights=weights ) )
+
         design = self.getDesign( xdata=self.xdata, params=params, index=index )
 
         if hasattr( self, "normweight" ) :
@@ -528,6 +554,76 @@ class BaseFitter( object ):
 
         return hessian
 
+    def getBand( self, params=None, index=None ):
+        """
+        Return the design matrix in banded form ( values, first ), when the model
+        provides it (see Model.partialBand); otherwise None.
+
+        The banded form is only used when all parameters are fitted and
+        no normalizing data are present.
+
+        Parameters
+        ----------
+        params : array_like
+            parameters of the model
+        index : list of int
+            index of parameters to be fitted
+
+        """
+        if ( self.ndim != 1 or hasattr( self, "normdfdp" ) or ( index is not None and
+             not numpy.array_equal( index, numpy.arange( self.model.npchain ) ) ) ) :
+            return None
+        if params is None : params = self.model.parameters
+        return self.model.partialBand( self.xdata, params )
+
+    def getBandHessian( self, band, weights=None ):
+        """
+        Return the hessian matrix in upper banded storage, as used by
+        scipy.linalg.solveh_banded, from the design matrix in banded form.
+
+        Only the products within the band are calculated: the costs are
+        proportional to nxdata * bandwidth^2 instead of nxdata * npars^2.
+
+        Parameters
+        ----------
+        band : tuple of ( values, first )
+            the design matrix in banded form (see getBand)
+        weights : array_like
+            weights to be used
+
+        """
+        ( values, first ) = band
+        nb = values.shape[1]
+        np = self.model.npchain
+        wvals = values if weights is None else values * numpy.asarray( weights )[:,numpy.newaxis]
+
+        ## element [i,j] (j >= i) is stored at ab[nb-1+i-j,j]
+        ab = numpy.zeros( ( nb, np ), dtype=float )
+        for k in range( nb ) :
+            for l in range( k, nb ) :
+                ab[nb-1-l+k,:] += numpy.bincount( first + l, weights=wvals[:,k] * values[:,l],
+                                                  minlength=np )
+        return ab
+
+    @staticmethod
+    def band2Hessian( ab ):
+        """
+        Return the full hessian matrix from its upper banded storage.
+
+        Parameters
+        ----------
+        ab : array_like
+            the hessian in upper banded storage (see getBandHessian)
+
+        """
+        nb, np = ab.shape
+        hessian = numpy.zeros( ( np, np ), dtype=float )
+        for u in range( min( nb, np ) ) :
+            j = numpy.arange( u, np )
+            hessian[j-u,j] = ab[nb-1-u,u:]
+            hessian[j,j-u] = ab[nb-1-u,u:]
+        return hessian
+
 #      * TBD Condition number see Wikipedia: Condition Number and Matrix Norm
 
     #  *************************************************************************
@@ -836,6 +932,31 @@ class BaseFitter( object ):
         if self.npfit == 0 :
             return self.logLikelihood + self.logOccam
 
+        spr += self.getLogPriorRange( limits=limits )
+
+        lidet = math.log( numpy.linalg.det( self.hessian ) )
+
+        # implementing eq 18 (Kester 2002) term by term
+        self.logOccam += -spr + 0.5 * ( self.npfit *
+                         math.log( 2 * math.pi * s2 ) - lidet )
+
+        return self.logLikelihood + self.logOccam
+
+    def getLogPriorRange( self, limits=None ) :
+        """
+        Return the sum of the logs of the prior ranges of the fitted parameters.
+
+        Parameters
+        ----------
+        limits : list of 2 floats/array_likes
+            possible range of the parameters. ( [low,high] )
+
+        Raises
+        ------
+        ValueError when no Prior is available
+
+        """
+        spr = 0.0
         priors = self.model.priors
         if limits is not None :
             prirange = Tools.toArray( limits[1] ) - Tools.toArray( limits[0] )
@@ -861,13 +982,210 @@ class BaseFitter( object ):
         if priorlength < self.npfit :                          # add enough times the last one
             spr += ( self.npfit - priorlength ) * prirange[-1]
 
-        lidet = math.log( numpy.linalg.det( self.hessian ) )
+        return spr
 
-        # implementing eq 18 (Kester 2002) term by term
-        self.logOccam += -spr + 0.5 * ( self.npfit *
-                         math.log( 2 * math.pi * s2 ) - lidet )
+    #  *****BATCH***************************************************************
+    def batchprolog( self, ydata, weights=None, keep=None ) :
+        """
+        Prolog for fits of a batch of datasets, which share the xdata.
 
-        return self.logLikelihood + self.logOccam
+        1. Checks data/weighs for Nans
+        2. Flattens maps
+        3. Makes fitIndex.
+
+        Parameters
+        ----------
+        ydata : array_like
+            the data vectors (or maps) to be fitted, one per row
+        weights : None or array_like
+            weights pertaining to the data, either one set shared by all
+            datasets or one set per dataset
+        keep : dict of {int:float}
+            dictionary of indices (int) to be kept at a fixed value (float)
+
+        Returns
+        -------
+        fitIndex : ndarray of int
+            Indices of the parameters that need fitting
+        ydata : ndarray of shape ( nsets, ndata )
+        weights : None or ndarray of shape ( ndata, ) or ( nsets, ndata )
+
+        """
+        self.checkNan( ydata, weights=weights )
+
+        ydata = numpy.asarray( ydata, dtype=float )
+        nsets = len( ydata )
+        if weights is not None :
+            weights = numpy.asarray( weights, dtype=float )
+            wshape = ( -1, ) if weights.ndim < ydata.ndim else ( nsets, -1 )
+
+        order = 'C' if self.imageAssistant is None else self.imageAssistant.order
+        ydata = numpy.reshape( ydata, ( nsets, -1 ), order=order )
+        if weights is not None :
+            weights = numpy.reshape( weights, wshape, order=order )
+
+        if keep is not None :
+            fitIndex = self.keepFixed( keep )
+        elif self.fitIndex is None :
+            fitIndex = numpy.arange( self.model.npchain, dtype=int )
+        else :
+            fitIndex = self.fitIndex
+
+        self.npfit = len( fitIndex )
+        return ( fitIndex, ydata, weights )
+
+    def batchDesign( self, ydata, weights=None, index=None ) :
+        """
+        Return the design matrix and the data and weights to be used with it.
+
+        The influence of the fixed parameters is subtracted from the data and
+        `normalized` data are appended, if present. See `normalize()`.
+
+        Parameters
+        ----------
+        ydata : ndarray of shape ( nsets, ndata )
+            the data vectors to be fitted
+        weights : None or ndarray of shape ( ndata, ) or ( nsets, ndata )
+            weights pertaining to the data
+        index : list of int
+            index of parameters to be fitted
+
+        Returns
+        -------
+        design : ndarray of shape ( ndata, npfit )
+        ydata : ndarray of shape ( nsets, ndata )
+        weights : None or ndarray of shape ( ndata, ) or ( nsets, ndata )
+
+        """
+        design = self.getDesign( index=index )
+
+        if index is not None and len( index ) < self.model.npchain :
+            fxpar = numpy.copy( self.model.parameters )
+            fxpar[index] = 0.0
+            ydata = ydata - self.model.result( self.xdata, fxpar )
+
+        if hasattr( self, "normdfdp" ) :
+            nsets = len( ydata )
+            ydata = numpy.append( ydata, numpy.tile( self.normdata, ( nsets, 1 ) ), axis=1 )
+            if weights is None :
+                weights = numpy.ones( self.nxdata, dtype=float )
+            if weights.ndim == 1 :
+                weights = numpy.append( weights, self.normweight )
+            else :
+                norm = numpy.tile( self.normweight, ( nsets, 1 ) )
+                weights = numpy.append( weights, norm, axis=1 )
+
+        return ( design, ydata, weights )
+
+    def batchpostscript( self, ydata, params, weights=None, index=None, invdiag=None,
+                         logdet=None ) :
+        """
+        Store the results of a batch fit.
+
+        Parameters
+        ----------
+        ydata : ndarray of shape ( nsets, ndata )
+            the fitted data vectors
+        params : ndarray of shape ( nsets, npchain )
+            the fitted parameters
+        weights : None or ndarray of shape ( ndata, ) or ( nsets, ndata )
+            weights pertaining to the data
+        index : list of int
+            index of the fitted parameters
+        invdiag : ndarray of shape ( npfit, ) or ( nsets, npfit )
+            diagonal of the inverse hessian(s)
+        logdet : float or ndarray of shape ( nsets, )
+            log of the determinant of the hessian(s)
+
+        """
+        design = self.model.partial( self.xdata, self.model.parameters )
+        res2 = numpy.square( ydata - numpy.inner( params, design ) )
+        if weights is not None :
+            res2 *= weights
+            self.batchSumwgt = numpy.sum( weights, axis=-1 )
+        else :
+            self.batchSumwgt = self.nxdata
+
+        self.batchParameters = params
+        self.batchIndex = index
+        self.batchChisq = numpy.sum( res2, axis=1 )
+        self.batchInverseDiagonal = invdiag
+        self.batchLogDet = logdet
+
+    def getBatchScale( self ):
+        """
+        Return the noise scales of the datasets in the last batch fit.
+
+        """
+        dof = self.nxdata - self.npfit
+        return numpy.sqrt( self.batchChisq / dof )
+
+    def getBatchStandardDeviations( self ):
+        """
+        Return the standard deviations of the parameters of the datasets
+        in the last batch fit, as an array of shape ( nsets, npchain ).
+
+        Parameters that are kept fixed have a standard deviation of 0.
+
+        """
+        scale = self.getBatchScale()
+        var = scale * scale
+        if hasattr( self, "minimumScale" ) :       # add minimum to scale when requested
+            var += self.minimumScale * self.minimumScale
+
+        stdevs = numpy.sqrt( self.batchInverseDiagonal * var[:,numpy.newaxis] )
+        if stdevs.shape[1] == self.model.npchain :
+            return stdevs
+
+        intostd = numpy.zeros( ( len( stdevs ), self.model.npchain ), dtype=float )
+        intostd[:,self.batchIndex] = stdevs
+        return intostd
+
+    def getBatchLogZ( self, limits=None, noiseLimits=None ):
+        """
+        Return the evidences, log( Z ), of the datasets in the last batch fit.
+
+        The calculation is the same as in `getLogZ()`, for all datasets at once.
+
+        Parameters
+        ----------
+        limits : list of 2 floats/array_likes
+            possible range of the parameters. ( [low,high] )
+        noiseLimits : list of 2 floats
+            possible range on noise scale ( [low,high] )
+
+        Raises
+        ------
+        ValueError when no Prior is available
+
+        """
+        dof = self.nxdata - self.npfit
+
+        if noiseLimits is not None :
+            scalerange = math.log( noiseLimits[1] ) - math.log( noiseLimits[0] )
+            s2 = numpy.square( self.getBatchScale() )
+            if hasattr( self, "minimumScale" ) :
+                s2 += self.minimumScale * self.minimumScale
+            logOccam = 0.5 * math.log( math.pi * dof ) - scalerange
+            spr = math.log( scalerange )
+        else :
+            scale = 1.0 if self.fixedScale is None else self.fixedScale
+            s2 = scale * scale
+            logOccam = 0.0
+            spr = 0.0
+
+        logL = -0.5 * ( self.batchSumwgt * numpy.log( 2 * math.pi * s2 ) +
+                        self.batchChisq / s2 )
+
+        if self.npfit == 0 :
+            return logL + logOccam
+
+        spr += self.getLogPriorRange( limits=limits )
+
+        logOccam += -spr + 0.5 * ( self.npfit *
+                    numpy.log( 2 * math.pi * s2 ) - self.batchLogDet )
+
+        return logL + logOccam
 
     def __str__( self ):
         """ Return name of the fitter.  """
@@ -906,6 +1224,7 @@ class BaseFitter( object ):
 
     def plotResultXXX( self, xdata, ydata, model ) :
 
+        import matplotlib.pyplot as plt
         plt.figure( "Fitter Result" )
         plt.plot( xdata, ydata, 'k,' )
 
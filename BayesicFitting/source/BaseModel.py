@@ -1,5 +1,4 @@
 import numpy as numpy
-from astropy import units
 import re
 import warnings
 from . import Tools
@@ -206,8 +205,183 @@ class BaseModel( object ):
 
         """
         self.checkParameter( param )
+        return self.cachedPartial( xdata, param, parlist=parlist )
+
+    def cachedPartial( self, xdata, param, parlist=None ):
+        """
+        Returns the partial derivatives, possibly from a cache.
+
+        Here it just calls basePartial. Models whose partials do not depend
+        on the parameters (LinearModel) keep them in a cache.
+
+        Parameters
+        ----------
+        xdata : array_like
+            values at which to calculate the result
+        param : array_like
+            values for the parameters.
+        parlist : None or array_like
+            indices of active parameters
+
+        """
         return self.basePartial( xdata, param, parlist=parlist )
 
+    #  *****ENSEMBLE************************************************************
+    def ensembleResult( self, xdata, params ):
+        """
+        Returns the results for an ensemble of parameter sets.
+
+        Parameters
+        ----------
+        xdata : array_like
+            values at which to calculate the result
+        params : array_like (nsets,npars)
+            values for the parameters, one set per row.
+
+        Returns
+        -------
+        array of shape (nsets,ndata)
+
+        """
+        self.checkEnsemble( params )
+        return self.baseEnsembleResult( xdata, params )
+
+    def ensemblePartial( self, xdata, params, parlist=None ):
+        """
+        Returns the partials for an ensemble of parameter sets.
+
+        Parameters
+        ----------
+        xdata : array_like
+            values at which to calculate the result
+        params : array_like (nsets,npars)
+            values for the parameters, one set per row.
+        parlist : None or array_like
+            indices of active parameters
+
+        Returns
+        -------
+        array of shape (nsets,ndata,npars)
+
+        """
+        self.checkEnsemble( params )
+        return self.baseEnsemblePartial( xdata, params, parlist=parlist )
+
+    def baseEnsembleResult( self, xdata, params ):
+        """
+        Returns the results of the model function for an ensemble of parameters.
+
+        This default loops over the sets. Models whose baseResult can be
+        broadcast, overwrite this method.
+
+        Parameters
+        ----------
+        xdata : array_like
+            values at which to calculate the result
+        params : array_like (nsets,npars)
+            values for the parameters, one set per row.
+
+        """
+        return numpy.asarray( [self.baseResult( xdata, par ) for par in params] )
+
+    def baseEnsemblePartial( self, xdata, params, parlist=None ):
+        """
+        Returns the partials of the model function for an ensemble of parameters.
+
+        This default loops over the sets. Models whose basePartial can be
+        broadcast, overwrite this method.
+
+        Parameters
+        ----------
+        xdata : array_like
+            values at which to calculate the partials
+        params : array_like (nsets,npars)
+            values for the parameters, one set per row.
+        parlist : None or array_like
+            indices of active parameters
+
+        """
+        return numpy.asarray( [self.basePartial( xdata, par, parlist=parlist )
+                            for par in params] )
+
+    #  *****UPDATE**************************************************************
+    def resultChange( self, xdata, param, kpar, oldval ):
+        """
+        Returns the change in the result when one parameter has changed.
+
+        Parameters
+        ----------
+        xdata : array_like
+            values at which to calculate the result
+        param : array_like
+            (new) values for the parameters.
+        kpar : int
+            index of the changed parameter
+        oldval : float
+            old value of the parameter
+
+        Returns
+        -------
+        tuple of ( change, index )
+            change : array_like
+                the change in the result at xdata[index]
+            index : array_like or None
+                indices of the xdata where the result changed (None for all)
+
+        """
+        oldpar = numpy.array( param, dtype=float )
+        oldpar[kpar] = oldval
+        self.checkParameter( param )
+        self.checkParameter( oldpar )
+        return self.baseResultChange( xdata, param, oldpar, kpar )
+
+    def baseResultChange( self, xdata, params, oldpars, kpar ):
+        """
+        Returns the change in the result of the model function and the indices
+        of the xdata where it changed.
+
+        This default calculates the result at old and new parameters, but only
+        at the xdata where either of them can be non-zero (see baseSupport).
+
+        Parameters
+        ----------
+        xdata : array_like
+            values at which to calculate the result
+        params : array_like
+            new values for the parameters.
+        oldpars : array_like
+            old values for the parameters.
+        kpar : int
+            index of the changed parameter
+
+        """
+        inew = self.baseSupport( xdata, params )
+        iold = self.baseSupport( xdata, oldpars )
+        if inew is None or iold is None :
+            return ( self.baseResult( xdata, params ) - self.baseResult( xdata, oldpars ),
+                     None )
+
+        index = numpy.union1d( inew, iold )
+        xd = xdata[index]
+        return ( self.baseResult( xd, params ) - self.baseResult( xd, oldpars ), index )
+
+    def baseSupport( self, xdata, params ):
+        """
+        Returns the indices of the xdata where the result can be non-zero.
+
+        None means everywhere, which is the default. Localized models are invited
+        to overwrite this method.
+
+        Parameters
+        ----------
+        xdata : array_like
+            values at which to calculate the result
+        params : array_like
+            values for the parameters.
+
+        """
+        return None
+
     def checkParameter( self, param ) :
         """
         Return parameters corrected for positivity and Non-zero.
@@ -252,6 +426,27 @@ class BaseModel( object ):
                 warnings.warn( msg )
                 param[k] = self.tiny
 
+    def checkEnsemble( self, params ) :
+        """
+        Check an ensemble of parameters for positivity and Non-zero.
+
+        Parameters
+        ----------
+        params : array_like (nsets,npars)
+            values for the parameters, one set per row.
+
+        """
+        for k in self.nonZero :
+            zero = params[:,k] == 0
+            if numpy.any( zero ) :
+                msg = ( ( self.shortName() + ": " + self.baseParameterName( k ) +
+                            " ( =parameter[%d] ) equals zero."%k ) )
+                warnings.warn( msg )
+                params[zero,k] = self.tiny
+        for k in self.posIndex :
+            params[:,k] = numpy.abs( params[:,k] )
+        return params
+
     def isDynamic( self ) :
         """
         Whether the model implements Dynamic
@@ -400,6 +595,7 @@ class BaseModel( object ):
         k : int
             parameter number.
         """
+        from astropy import units
         return units.Unit( 1.0 )
 
     def hasLimits( self, fitindex=None ) :
@@ -172,6 +172,30 @@ class CauchyErrorDistribution( ScaledErrorDistribution ):
         res2 = res * res
         return math.log( scale ) - self.LOGPI - numpy.log( res2 + s2 )
 
+    def ensembleLogL( self, problem, allpars ) :
+        """
+        Return the log( likelihood ) for each of an ensemble of parameter sets.
+
+        Parameters
+        ----------
+        problem : Problem
+            to be solved
+        allpars : array_like
+            parameters of the problem, shape ( nsets, npars + 1 )
+
+        Returns
+        -------
+        array of nsets log( likelihood )s
+        """
+        allpars = numpy.atleast_2d( allpars )
+        self.ncalls += len( allpars )
+
+        scale = allpars[:,-1]
+        res = problem.ensembleResiduals( allpars[:,:-1] )
+        s2 = ( scale * scale )[:,numpy.newaxis]
+        return ( problem.ndata * ( numpy.log( scale ) - self.LOGPI ) -
+                 numpy.sum( numpy.log( res * res + s2 ), axis=1 ) )
+
     def partialLogL_alt( self, problem, allpars, fitIndex ) :
         """
         Return the partial derivative of log( likelihood ) to the parameters
@@ -207,6 +231,28 @@ class CauchyErrorDistribution( ScaledErrorDistribution ):
 
         return dL
 
+    def logLdataAndPartial( self, problem, allpars, mockdata=None ) :
+        """
+        Return the log( likelihood ) for each residual and its derivatives
+        to the mock data and to the hyperparameters.
+
+        Parameters
+        ----------
+        problem : Problem
+            to be solved
+        allpars : array_like
+            list of all parameters in the problem
+        mockdata : array_like
+            as calculated by the model
+
+        """
+        res = problem.residuals( allpars[:-1], mockdata=mockdata )
+        scale = allpars[-1]
+        r2s = res * res + scale * scale
+        lld = math.log( scale ) - self.LOGPI - numpy.log( r2s )
+
+        return ( lld, 2 * res / r2s, [1.0 / scale - 2 * scale / r2s] )
+
     def nextPartialData( self, problem, allpars, fitIndex, mockdata=None ) :
         """
         Return the partial derivative of log( likelihood ) to the parameters
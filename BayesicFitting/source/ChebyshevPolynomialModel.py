@@ -2,7 +2,6 @@ import numpy as numpy
 from . import Tools
 from .Tools import setAttribute as setatt
 
-from astropy import units
 from .LinearModel import LinearModel
 
 __author__ = "Do Kester"
@@ -105,6 +104,7 @@ class ChebyshevPolynomialModel( LinearModel ):
         """
         if name == 'degree' :
             setatt( self, name, value, type=int )
+            self.clearDesign()
         else :
             super( ChebyshevPolynomialModel, self ).__setattr__( name, value )
 
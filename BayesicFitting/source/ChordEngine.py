@@ -50,6 +50,10 @@ class ChordEngine( Engine ):
     when the point is accepted select another random line orthogonal to
     the previous ones.
 
+    With precondition, the random lines are orthogonal in the frame whitened
+    by the covariance of the walkers (unitBasis), so they follow the
+    correlations between the parameters.
+
     This is an independent implementation inspired by the polychord engine
     described in:
     "POLYCHORD: next-generation nested sampling",
@@ -65,13 +69,15 @@ class ChordEngine( Engine ):
 
     Attributes from Engine
     ----------------------
-    walkers, errdis, maxtrials, rng, verbose, report, unitRange, unitMin
+    walkers, errdis, maxtrials, rng, verbose, report, unitRange, unitMin,
+    unitBasis, precondition
 
     Author       Do Kester.
 
     """
     #  *********CONSTRUCTORS***************************************************
-    def __init__( self, walkers, errdis, copy=None, seed=4213, debug=False, verbose=0 ):
+    def __init__( self, walkers, errdis, copy=None, seed=4213, debug=False,
+                  precondition=False, verbose=0 ):
         """
         Constructor.
 
@@ -85,12 +91,16 @@ class ChordEngine( Engine ):
             to be copied
         seed : int
             for rng
+        precondition : bool
+            draw the lines in the frame whitened by the covariance of the walkers
         verbose : int
             <= 4 : silent
             > 4  : info about engine execution
 
         """
         super( ).__init__( walkers, errdis, copy=copy, seed=seed, verbose=verbose )
+        if copy is None :
+            self.precondition = precondition
 
         self.nstep = 5
         self.maxtrials = 25
@@ -152,6 +162,11 @@ class ChordEngine( Engine ):
         onb = OrthonormalBasis( )
         vel = self.rng.rand( np ) - 0.5
 
+        ## directions are drawn in the whitened frame; uvel is in unit space
+        basis = self.unitBasis if self.precondition else None
+        if basis is not None and len( basis ) != np :
+            basis = None
+
         if self.verbose > 4 :
             print( "++++++++++++++++++++++++++++++++++++++++++" )
             print( walker.id, nstep, fmt(lowLhood), fmt( param ) )
@@ -170,6 +185,7 @@ class ChordEngine( Engine ):
 
             ## orthonormalise the random vector
             vel = onb.normalise( vel, reset=reset )
+            uvel = vel if basis is None else numpy.dot( basis, vel )
 
             if self.verbose > 4 :
                 print( ks, step, "vel   ", fmt( vel ) )
@@ -177,7 +193,7 @@ class ChordEngine( Engine ):
             ## append travel times wrt usav (==0) to all edges umin and umax
             ## tt contains entrance times as negative values
             ## and exit times as positive values.
-            tt = numpy.append( ( umin - usav ) / vel, ( umax - usav ) / vel )
+            tt = numpy.append( ( umin - usav ) / uvel, ( umax - usav ) / uvel )
 
             ## find smallest entrance and exit times
             t1 = numpy.min( numpy.where( tt > 0, tt, +math.inf ) )
@@ -185,12 +201,12 @@ class ChordEngine( Engine ):
 
             ## same now for the values at the edges of the unit box (0,1)
             if self.debug :
-                tt = numpy.append( - usav / vel, ( 1.0 - usav ) / vel )
+                tt = numpy.append( - usav / uvel, ( 1.0 - usav ) / uvel )
                 t1max = numpy.min( numpy.where( tt > 0, tt, +math.inf ) )
                 t0max = numpy.max( numpy.where( tt < 0, tt, -math.inf ) )
 
-                t0 = self.stepOut( problem, ptry, usav, vel, t0, t0max, lowLhood, fitIndex )
-                t1 = self.stepOut( problem, ptry, usav, vel, t1, t1max, lowLhood, fitIndex )
+                t0 = self.stepOut( problem, ptry, usav, uvel, t0, t0max, lowLhood, fitIndex )
+                t1 = self.stepOut( problem, ptry, usav, uvel, t1, t1max, lowLhood, fitIndex )
 
             kk = 0
             while True :
@@ -199,7 +215,7 @@ class ChordEngine( Engine ):
                 assert t0 < 0 < t1, "%f < %f < %f"%(t0,0,t1)
                 ## dt is timestep wrt. usav (at 0)
                 dt = t0 + self.rng.rand( 1 ) * ( t1 - t0 )
-                utry = usav + vel * dt
+                utry = usav + uvel * dt
 
                 ptry[fitIndex] = self.unit2Domain( problem, utry, kpar=fitIndex  )
 
@@ -1,5 +1,4 @@
 import numpy as numpy
-from astropy import units
 import re
 import warnings
 from . import Tools
@@ -65,6 +64,8 @@ class ClassicProblem( Problem ):
         """
         super( ).__init__( model=model, xdata=xdata, ydata=ydata, weights=weights,
                            copy=copy )
+        self._quadratic = ( None, 0, None ) if copy is None else copy._quadratic
+        self._linsol = ( None, None )
 
 
     def copy( self ):
@@ -88,6 +89,160 @@ class ClassicProblem( Problem ):
         """
         return self.model.result( self.xdata, param )
 
+    def ensembleResult( self, params ):
+        """
+        Returns the results for an ensemble of parameter sets.
+
+        Parameters
+        ----------
+        params : array_like
+            values for the parameters, shape ( nsets, npars )
+
+        """
+        return self.model.result( self.xdata, params )
+
+    def updateResult( self, param, parval ):
+        """
+        Returns the result at param, updated from a previous one where the
+        parameters in parval had their old values.
+
+        The last results are kept, so that a sequence of single-parameter
+        moves, accepted or not, can be updated incrementally by the model.
+        Dynamic models can change in between; they return None.
+
+        Parameters
+        ----------
+        param : array_like
+            (new) values for the parameters.
+        parval : dict of {int : float}
+            index and old value of the changed parameters
+
+        """
+        if self.model.isDynamic() :
+            return None
+
+        ## only model parameters; hyperparameters are at npars and beyond, or at -1
+        parval = {k : v for k, v in parval.items() if 0 <= k < self.npars}
+        newpar = numpy.array( param, dtype=float )
+        for par, res in self._cache :
+            if numpy.array_equal( par, newpar ) :
+                return res
+
+        if len( parval ) == 0 :
+            res = self.result( newpar )
+            self._cache = [( newpar, res )]
+            return res
+
+        oldpar = newpar.copy()
+        for k, v in parval.items() :
+            oldpar[k] = v
+
+        oldres = None
+        for par, res in self._cache :
+            if numpy.array_equal( par, oldpar ) :
+                oldres = res
+        if oldres is None :
+            oldres = self.result( oldpar )
+
+        res = self.model.updateResult( self.xdata, oldres, newpar, parval )
+        self._cache = [( oldpar, oldres ), ( newpar, res )]
+        return res
+
+    def quadraticForm( self ):
+        """
+        Return the weighted sum of squared residuals as a quadratic form
+        in the parameters, or None when the model is not linear.
+
+            chisq( p ) = chimin + ( p - pmin ) * hessian * ( p - pmin )
+
+        where pmin is the least squares solution, chimin the chisq there and
+        hessian = X^T W X, with X the design matrix and W the weights.
+        Fixed parameters enter as a constant offset of the model.
+
+        The form is calculated once; it is kept as long as the model, the data
+        and the weights are the same instances, with the same number of
+        parameters. Changes made in place are not noticed.
+
+        Returns
+        -------
+        tuple of ( pmin, hessian, chimin ) or None
+
+        """
+        key = ( self.model, self.xdata, self.ydata, self.weights )
+        ( kept, npars, form ) = self._quadratic
+        if ( kept is not None and npars == self.npars and
+                all( k is q for k, q in zip( key, kept ) ) ) :
+            return form
+
+        form = None
+        if self.model.isLinear() :
+            zero = numpy.zeros( self.npars, dtype=float )
+            design = self.model.partial( self.xdata, zero )
+            ydata = self.ydata - self.model.result( self.xdata, zero )
+            wgt = ( numpy.ones_like( ydata ) if self.weights is None else
+                    numpy.asarray( self.weights, dtype=float ) )
+
+            sqwgt = numpy.sqrt( wgt )
+            pmin = numpy.linalg.lstsq( design * sqwgt[:,numpy.newaxis], ydata * sqwgt,
+                                       rcond=None )[0]
+            res = ydata - numpy.dot( design, pmin )
+            hessian = numpy.dot( design.transpose(), design * wgt[:,numpy.newaxis] )
+            form = ( pmin, hessian, numpy.sum( wgt * res * res ) )
+
+        self._quadratic = ( key, self.npars, form )
+        return form
+
+    def solveLinear( self, param ):
+        """
+        Return the weighted least squares solution of the linear parameters,
+        given the other (nonlinear) parameters.
+
+        The linear parameters are given in the attribute linear. The model
+        is assumed to be linear in those, jointly.
+        The solution for the last nonlinear parameters is kept.
+
+        Parameters
+        ----------
+        param : array_like
+            values for the parameters; the linear ones are not used.
+
+        Returns
+        -------
+        tuple of ( param, chimin, chol ) or None when the linear parameters
+            are degenerate.
+            param : parameters with the linear ones at the solution
+            chimin : weighted sum of squared residuals at the solution
+            chol : lower triangular Cholesky factor of the hessian of the
+                   linear parameters, G^T W G, with G their partials
+
+        """
+        lin = self.linear
+        par = numpy.array( param[:self.npars], dtype=float )
+        par[lin] = 0.0
+        key = par.tobytes()
+        if self._linsol[0] == key :
+            return self._linsol[1]
+
+        ydata = self.ydata - self.model.result( self.xdata, par )
+        design = self.model.partial( self.xdata, par )[:,lin]
+        if self.weights is None :
+            wdesign = design
+        else :
+            wdesign = design * numpy.asarray( self.weights, dtype=float )[:,numpy.newaxis]
+        hessian = numpy.dot( wdesign.transpose(), design )
+
+        try :
+            chol = numpy.linalg.cholesky( hessian )
+            vec = numpy.linalg.solve( chol, numpy.dot( ydata, wdesign ) )
+            par[lin] = numpy.linalg.solve( chol.transpose(), vec )
+            res = ydata - numpy.dot( design, par[lin] )
+            res2 = res * res if self.weights is None else res * res * self.weights
+            solution = ( par, numpy.sum( res2 ), chol )
+        except numpy.linalg.LinAlgError :
+            solution = None
+
+        self._linsol = ( key, solution )
+        return solution
 
     def partial( self, param ) :
         return self.model.partial( self.xdata, param )
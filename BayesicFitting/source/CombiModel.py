@@ -1,5 +1,4 @@
 import numpy as numpy
-from astropy import units
 import math
 import re
 from . import Tools
@@ -178,6 +177,9 @@ class CombiModel( BracketModel ):
             setatt( self, "mulvalue", copy.mulvalue.copy() )
             setatt( self, "select", copy.select.copy() )
             setatt( self, "expandindex", copy.expandindex.copy() )
+            for name in ["xUnit", "yUnit"] :
+                if name in copy.__dict__ :
+                    setatt( self, name, copy.__dict__[name] )
 
         setatt( self, "_npchain", len( self.select ) )
         setatt( self, "npbase", self._npchain )
@@ -1,5 +1,4 @@
 import numpy as numpy
-from astropy import units
 from scipy.optimize import curve_fit
 import math
 from . import Tools
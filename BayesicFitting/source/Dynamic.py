@@ -162,6 +162,7 @@ class Dynamic( object ):
         setatt( self, "npmax", self.npmax + dnp )
         setatt( self, "npbase", self.npbase + dnp )
         setatt( self._head, "_npchain", self._head._npchain + dnp )
+        self.resetPlan()
 
 #        print( "DYN2  ", dnp, pat, self.npmax, self.npbase, self.npchain,
 #            mdlpar )
@@ -0,0 +1,343 @@
+import numpy as numpy
+import math
+
+from .Engine import Engine
+
+__author__ = "Do Kester"
+__year__ = 2018
+__license__ = "GPL3"
+__version__ = "0.9"
+__maintainer__ = "Do"
+__status__ = "Development"
+
+#  *
+#  * This file is part of the BayesicFitting package.
+#  *
+#  * BayesicFitting is free software: you can redistribute it and/or modify
+#  * it under the terms of the GNU Lesser General Public License as
+#  * published by the Free Software Foundation, either version 3 of
+#  * the License, or ( at your option ) any later version.
+#  *
+#  * BayesicFitting is distributed in the hope that it will be useful,
+#  * but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  * MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+#  * GNU Lesser General Public License for more details.
+#  *
+#  * The GPL3 license can be found at <http://www.gnu.org/licenses/>.
+#  *
+#  *    2018        Do Kester
+
+class EllipsoidEngine( Engine ):
+    """
+    Replace a walker by a random point inside ellipsoids around the walkers.
+
+    The walkers are clustered, in unit space, into one or more ellipsoids,
+    each enclosing all walkers of its cluster and enlarged in volume.
+    An ellipsoid is split in two (with 2-means clustering) when the two
+    parts together take less than half of its volume; the parts are split
+    further in the same way.
+    A point is drawn uniformly from the union of the ellipsoids. When its
+    likelihood is higher than the low likelihood, it replaces the walker.
+
+    The ellipsoids are refitted to the walkers once every refit iterations.
+    An iteration is recognized by a higher value of the low likelihood.
+    The Explorer calls getEllipsoids in the main process, before the walkers
+    are explored; the ellipsoids are sent along to threads and worker processes.
+
+    The engine is inspired by the ellipsoidal nested sampling in:
+    "MultiNest: an efficient and robust Bayesian inference tool for cosmology
+    and particle physics", F Feroz, MP Hobson and M Bridges.
+    MNRAS (2009) Volume 398, Issue 4, p 1601–1614
+
+    It works for static models only; it does not move walkers of dynamic models.
+
+    Attributes
+    ----------
+    enlarge : float
+        factor to enlarge the volume of the ellipsoids (default 1.5)
+    refit : int
+        number of iterations between refits of the ellipsoids (default 5)
+    bound : list of [ellipsoids, lowLhood, iterations]
+        the present ellipsoids as a list of ( center, cholesky factor, log volume ),
+        the last low likelihood and the number of iterations since the refit.
+        It is shared with the copies of this engine and kept in checkpoints.
+
+    Attributes from Engine
+    ----------------------
+    walkers, errdis, maxtrials, rng, verbose, report, unitRange, unitMin
+
+    Author       Do Kester.
+
+    """
+    #  *********CONSTRUCTORS***************************************************
+    def __init__( self, walkers, errdis, copy=None, seed=4213, verbose=0 ):
+        """
+        Constructor.
+
+        Parameters
+        ----------
+        walkers : WalkerList
+            walkers to be diffused
+        errdis : ErrorDistribution
+            error distribution to be used
+        copy : EllipsoidEngine
+            to be copied
+        seed : int
+            for rng
+        verbose : int
+            <= 4 : silent
+            > 4  : info about engine execution
+
+        """
+        super( ).__init__( walkers, errdis, copy=copy, seed=seed, verbose=verbose )
+        if copy is None :
+            self.maxtrials = 100
+            self.enlarge = 1.5
+            self.refit = 5
+            self.bound = [None, None, 0]
+        else :
+            self.enlarge = copy.enlarge
+            self.refit = copy.refit
+            self.bound = copy.bound
+
+    def copy( self ):
+        """ Return copy of this.  """
+        return EllipsoidEngine( self.walkers, self.errdis, copy=self )
+
+    def __str__( self ):
+        return str( "EllipsoidEngine" )
+
+    #  *********EXECUTE***************************************************
+    def execute( self, walker, lowLhood ):
+        """
+        Execute the engine by a random selection of the parameters
+        from the ellipsoids.
+
+        Parameters
+        ----------
+        walker : Walker
+            walker to diffuse
+        lowLhood : float
+            lower limit in logLikelihood
+
+        Returns
+        -------
+        int : the number of successfull moves
+
+        """
+        self.reportCall()
+
+        walker = walker.copy()
+        problem = walker.problem
+        if problem.model.isDynamic() :
+            return 0
+
+        fitIndex = walker.fitIndex
+        np = len( fitIndex )
+        ellipsoids = self.getEllipsoids( fitIndex, lowLhood )
+
+        ptry = walker.allpars.copy()
+        for kk in range( self.maxtrials ) :
+            utry = self.drawPoint( ellipsoids, fitIndex )
+            if utry is None :
+                break
+
+            ptry[fitIndex] = self.unit2Domain( problem, utry, kpar=fitIndex )
+            Ltry = self.errdis.logLikelihood( problem, ptry )
+
+            if Ltry >= lowLhood :
+                self.reportSuccess( )
+                self.checkBest( problem, ptry, Ltry, fitIndex )
+                self.setWalker( walker, problem, ptry, Ltry, fitIndex=fitIndex )
+                return np
+
+            self.reportReject( )
+
+        self.reportFailed( )
+        return 0
+
+    def getEllipsoids( self, fitIndex, lowLhood ) :
+        """
+        Return the ellipsoids, refitted to the walkers when they are too old.
+
+        Parameters
+        ----------
+        fitIndex : array_like
+            indices of the parameters to be fitted
+        lowLhood : float
+            lower limit in logLikelihood
+
+        """
+        bound = self.bound
+        if bound[1] is None or lowLhood > bound[1] :
+            bound[1] = lowLhood
+            bound[2] += 1
+
+        if bound[0] is None or bound[2] >= self.refit or len( bound[0][0][0] ) != len( fitIndex ) :
+            allpars = numpy.asarray( [w.allpars[fitIndex] for w in self.walkers] )
+            upars = self.domain2Unit( self.walkers[0].problem, allpars, kpar=fitIndex )
+            bound[0] = self.makeEllipsoids( upars )
+            bound[2] = 0
+        return bound[0]
+
+    def makeEllipsoids( self, upars ) :
+        """
+        Return a list of ellipsoids enclosing the points.
+
+        Each ellipsoid is a tuple of ( center, cholesky factor, log volume ), such that
+        center + factor * x is inside the ellipsoid for x inside the unit ball.
+        The volume is relative to the unit ball.
+
+        Parameters
+        ----------
+        upars : array_like of shape ( npoints, ndim )
+            points in unit space
+
+        """
+        ell = self.enclose( upars )
+        if ell is None :
+            return [self.boxEllipsoid( upars )]
+
+        ndim = upars.shape[1]
+        if len( upars ) < 2 * ( ndim + 1 ) :
+            return [ell]
+
+        ## cluster in the frame whitened by the ellipsoid
+        white = numpy.linalg.solve( ell[1], ( upars - ell[0] ).T ).T
+        label = self.twoMeans( white )
+        parts = [upars[label == k] for k in [0, 1]]
+        if min( len( p ) for p in parts ) < ndim + 1 :
+            return [ell]
+
+        ells = [self.enclose( p ) for p in parts]
+        if ( ells[0] is None or ells[1] is None or
+                numpy.logaddexp( ells[0][2], ells[1][2] ) > ell[2] + math.log( 0.5 ) ) :
+            return [ell]
+
+        return self.makeEllipsoids( parts[0] ) + self.makeEllipsoids( parts[1] )
+
+    def enclose( self, upars ) :
+        """
+        Return the (enlarged) ellipsoid with the shape of the covariance of the points,
+        that encloses all points; None if the points are degenerate.
+
+        Parameters
+        ----------
+        upars : array_like of shape ( npoints, ndim )
+            points in unit space
+
+        """
+        ndim = upars.shape[1]
+        center = numpy.mean( upars, axis=0 )
+        dev = upars - center
+        cov = numpy.dot( dev.T, dev ) / len( upars )
+        try :
+            chol = numpy.linalg.cholesky( cov )
+        except numpy.linalg.LinAlgError :
+            return None
+
+        ## largest (squared) Mahalanobis distance sets the size
+        white = numpy.linalg.solve( chol, dev.T )
+        dmax = math.sqrt( numpy.max( numpy.sum( white * white, axis=0 ) ) )
+        chol *= dmax * self.enlarge ** ( 1.0 / ndim )
+        logvol = numpy.sum( numpy.log( numpy.diag( chol ) ) )
+        return ( center, chol, logvol )
+
+    def boxEllipsoid( self, upars ) :
+        """
+        Return an ellipsoid around the box of the points.
+
+        Parameters
+        ----------
+        upars : array_like of shape ( npoints, ndim )
+            points in unit space
+
+        """
+        lo = numpy.min( upars, axis=0 )
+        hi = numpy.max( upars, axis=0 )
+        ndim = upars.shape[1]
+        half = numpy.maximum( 0.5 * ( hi - lo ), 1.0 / len( upars ) ) * math.sqrt( ndim )
+        chol = numpy.diag( half * self.enlarge ** ( 1.0 / ndim ) )
+        return ( 0.5 * ( hi + lo ), chol, numpy.sum( numpy.log( numpy.diag( chol ) ) ) )
+
+    def twoMeans( self, points, niter=10 ) :
+        """
+        Return labels (0 or 1) of a split of the points into 2 clusters.
+
+        Parameters
+        ----------
+        points : array_like of shape ( npoints, ndim )
+            the points
+        niter : int
+            maximum number of iterations
+
+        """
+        ## start from 2 points far apart
+        d0 = numpy.sum( ( points - points[self.rng.randint( len( points ) )] ) ** 2, axis=1 )
+        k0 = numpy.argmax( d0 )
+        d1 = numpy.sum( ( points - points[k0] ) ** 2, axis=1 )
+        centers = numpy.asarray( [points[k0], points[numpy.argmax( d1 )]] )
+
+        label = None
+        for k in range( niter ) :
+            dist = [numpy.sum( ( points - c ) ** 2, axis=1 ) for c in centers]
+            newlabel = numpy.where( dist[0] <= dist[1], 0, 1 )
+            if label is not None and numpy.array_equal( label, newlabel ) :
+                break
+            label = newlabel
+            if numpy.all( label == label[0] ) :
+                break
+            centers = numpy.asarray( [numpy.mean( points[label == j], axis=0 ) for j in [0, 1]] )
+        return label
+
+    def drawPoint( self, ellipsoids, fitIndex ) :
+        """
+        Return a random point from the union of the ellipsoids, inside the unit box.
+        Return None when none could be found.
+
+        Parameters
+        ----------
+        ellipsoids : list of ellipsoids
+            as made by makeEllipsoids
+        fitIndex : array_like
+            indices of the parameters to be fitted
+
+        """
+        np = len( fitIndex )
+        logvol = numpy.asarray( [ell[2] for ell in ellipsoids] )
+        prob = numpy.exp( logvol - numpy.max( logvol ) )
+        prob /= numpy.sum( prob )
+
+        for k in range( 100 * self.maxtrials ) :
+            ( center, chol, lv ) = ellipsoids[self.rng.choice( len( ellipsoids ), p=prob )]
+
+            ## uniform in the unit ball
+            ball = self.rng.randn( np )
+            ball *= self.rng.rand() ** ( 1.0 / np ) / numpy.linalg.norm( ball )
+            utry = center + numpy.dot( chol, ball )
+            if numpy.any( utry < 0 ) or numpy.any( utry > 1 ) :
+                continue
+
+            ## accept points in overlapping ellipsoids with 1 / (number of ellipsoids)
+            if len( ellipsoids ) > 1 :
+                nin = sum( [self.isInside( ell, utry ) for ell in ellipsoids] )
+                if self.rng.rand() * nin > 1 :
+                    continue
+            return utry
+
+        return None
+
+    def isInside( self, ellipsoid, upar ) :
+        """
+        Return whether upar is inside the ellipsoid.
+
+        Parameters
+        ----------
+        ellipsoid : tuple
+            as made by makeEllipsoids
+        upar : array_like
+            point in unit space
+        """
+        white = numpy.linalg.solve( ellipsoid[1], upar - ellipsoid[0] )
+        return numpy.dot( white, white ) <= 1.0
+
@@ -61,6 +61,18 @@ class Engine( object ):
         present max size of the parameter cloud (in unitspace: [0,1])
     unitMin : array_like (read only)
         present minimum values of the parameter cloud (in unitspace: [0,1])
+    priorTable : None or tuple of ( Model, PriorTable )
+        compiled priors of (the model of) the last problem
+    cloud : None or tuple of ( array_like, array_like, array_like )
+        parameters of all walkers, and the walkers holding their minimum and
+        maximum values (static models only; see calculateUnitRange)
+    precondition : bool
+        propose moves in the frame whitened by unitBasis (if the engine can)
+    unitBasis : None or array_like
+        lower Cholesky factor of the covariance of the walkers in unit space,
+        over the fitted parameters (static models only; see calculateUnitRange)
+    moments : None or list
+        unit values of the walkers and their sums, to update unitBasis
 
     Author       Do Kester.
 
@@ -100,6 +112,7 @@ class Engine( object ):
         self.walkers = walkers
         self.errdis = errdis
         self.report = [0]*5
+        self.priorTable = None
 
         if copy is None :
             self.maxtrials = 5
@@ -107,7 +120,8 @@ class Engine( object ):
             self.unitRange = None
             self.unitMin = None
             self.verbose = verbose
-
+            self.unitBasis = None
+            self.precondition = False
 
 #            if constrain is None or callable( constrain ) :
 #                self.constrain = constrain
@@ -120,6 +134,11 @@ class Engine( object ):
             self.unitRange = copy.unitRange
             self.unitMin   = copy.unitMin
             self.verbose   = copy.verbose
+            self.unitBasis = copy.unitBasis
+            self.precondition = copy.precondition
+
+        self.cloud = None
+        self.moments = None
 
     def copy( self ):
         """ Return a copy of this engine.  """
@@ -169,7 +188,8 @@ class Engine( object ):
             (new) fitIndex
         """
         if logL > self.walkers[-1].logL :
-            self.setWalker( self.walkers[-1], problem, allpars.copy(), logL, fitIndex )
+            ## replace, not update: threads may read the best walker meanwhile
+            self.setWalker( self.walkers[-1].copy(), problem, allpars.copy(), logL, fitIndex )
             self.reportBest()
 
 ######## domain <> unit ###########################################
@@ -182,8 +202,9 @@ class Engine( object ):
         ----------
         problem : Problem
             the problem involved
-        dval : float
-            domain value for the selected parameter
+        dval : float or array_like
+            domain value for the selected parameter(s)
+            An array of shape ( nsets, nsel ) converts a block of parameter sets.
         kpar : None or array_like
             selected parameter index, where kp is index in [parameters, hyperparams]
             None means all
@@ -196,14 +217,7 @@ class Engine( object ):
             return ( problem.domain2Unit( dval, kpar ) if kpar >= 0 else
                      self.errdis.domain2Unit( dval, kpar ) )
 
-        uval = numpy.ndarray( len( kpar ), dtype=float )
-
-        for i,kp in enumerate( kpar ) :
-            if kp >= 0 :
-                uval[i] = problem.domain2Unit( dval[i], kp )
-            else :
-                uval[i] = self.errdis.domain2Unit( dval[i], kp )
-        return uval
+        return self.getPriorTable( problem ).domain2Unit( dval, kpar )
 
     def unit2Domain( self, problem, uval, kpar=None ) :
         """
@@ -215,6 +229,7 @@ class Engine( object ):
             the problem involved
         uval : array_like
             unit value for the selected parameter
+            An array of shape ( nsets, nsel ) converts a block of parameter sets.
         kpar : None or array_like
             selected parameter indices, where kp is index in [parameters, hyperparams]
             None means all.
@@ -227,17 +242,31 @@ class Engine( object ):
             return ( problem.unit2Domain( uval, kpar ) if kpar >= 0 else
                      self.errdis.unit2Domain( uval, kpar ) )
 
-        dval = numpy.ndarray( len( kpar ), dtype=float )
-        for i,kp in enumerate( kpar ) :
-            if kp >= 0 :
-                dval[i] = problem.unit2Domain( uval[i], kp )
-            else :
-                dval[i] = self.errdis.unit2Domain( uval[i], kp )
-        return dval
+        return self.getPriorTable( problem ).unit2Domain( uval, kpar )
+
+    def getPriorTable( self, problem ) :
+        """
+        Return the priors of the problem and the hyperparameters, compiled
+        into a PriorTable.
+
+        The table is kept until a problem with another model, or with another
+        number of parameters (dynamic models), comes along.
+
+        Parameters
+        ----------
+        problem : Problem
+            the problem involved
+        """
+        npars = problem.npars + len( self.errdis.hyperpar )
+        if ( self.priorTable is None or self.priorTable[0] is not problem.model or
+                len( self.priorTable[1] ) != npars ) :
+            self.priorTable = ( problem.model,
+                                problem.makePriorTable( self.errdis.hyperpar ) )
+        return self.priorTable[1]
 
     def makeIndex( self, np, val ) :
         kpar = [k for k in range( np )]
-        nh = len( val ) - np
+        nh = numpy.shape( val )[-1] - np
         kpar += [-k for k in range( nh, 0, -1 )]
         return kpar
 
@@ -258,21 +287,48 @@ class Engine( object ):
         self.report[self.BEST] += 1
 
     def printReport( self ) :
-        print( " %10d %10d %10d %10d %10d" % (self.report[0], self.report[1],
-                              self.report[2], self.report[3], self.report[4] ) )
+        """
+        Print the report, followed by the acceptance rate of the trials and
+        the number of trials (calls to logL) per successful move.
+        """
+        ntry = self.report[self.SUCCESS] + self.report[self.REJECT] + self.report[self.FAILED]
+        accept = self.report[self.SUCCESS] / max( ntry, 1 )
+        permove = ntry / max( self.report[self.SUCCESS], 1 )
+        print( " %10d %10d %10d %10d %10d %8.3f %8.2f" % ( self.report[0], self.report[1],
+                              self.report[2], self.report[3], self.report[4], accept, permove ) )
 
 
-    def calculateUnitRange( self ):
+    def calculateUnitRange( self, changed=None, basis=False ):
         """
         Calculate the range of the present parameter values in unit values.
 
+        For static models the parameters of the walkers are kept, together with
+        the walkers that hold the minimum and maximum values. When only some walkers
+        changed, only those are inspected; a parameter is rescanned over all walkers
+        when the walker that held its minimum or maximum, changed.
+
         For Dynamic models the range is calculated for those parameters present in all models;
         it is 1.0 for other parameters.
 
+        Parameters
+        ----------
+        changed : None or list of int
+            indices of the walkers that changed since the last call.
+            None : calculate from all walkers.
+        basis : bool
+            also calculate the unitBasis (static models only; otherwise None).
+
         """
         kmx = 0
+        self.unitBasis = None
         if not self.walkers[0].problem.model.isDynamic() :
-            npmax = len( self.walkers[0].allpars )
+            minv, maxv = self.updateCloud( changed )
+            if basis :
+                self.unitBasis = self.updateMoments( changed )
+            problem = self.walkers[0].problem
+            fi = self.walkers[0].fitIndex
+            nval = numpy.zeros( len( minv ), dtype=int )
+            nval[fi] = len( self.walkers )
         else :
             npmax = 0
             for k, walker in enumerate( self.walkers ) :
@@ -280,21 +336,22 @@ class Engine( object ):
                     npmax = len( walker.allpars )
                     kmx = k
 
-        minv = self.walkers[kmx].allpars.copy()
-        maxv = self.walkers[kmx].allpars.copy()
-#        mean = numpy.zeros( npmax, dtype=float )
-        nval = numpy.zeros( npmax, dtype=int )
-
-        for walker in self.walkers :
-            fi = walker.fitIndex
-#            print( "Eng   ", fi, minv, walker.allpars )
-            minv[fi] = numpy.fmin( minv[fi], walker.allpars[fi] )
-            maxv[fi] = numpy.fmax( maxv[fi], walker.allpars[fi] )
-#            mean[fi] += walker.allpars[fi]
-            nval[fi] += 1
-
-        problem = self.walkers[kmx].problem
-        fi = self.walkers[kmx].fitIndex
+            minv = self.walkers[kmx].allpars.copy()
+            maxv = self.walkers[kmx].allpars.copy()
+#            mean = numpy.zeros( npmax, dtype=float )
+            nval = numpy.zeros( npmax, dtype=int )
+
+            for walker in self.walkers :
+                fi = walker.fitIndex
+#                print( "Eng   ", fi, minv, walker.allpars )
+                minv[fi] = numpy.fmin( minv[fi], walker.allpars[fi] )
+                maxv[fi] = numpy.fmax( maxv[fi], walker.allpars[fi] )
+#                mean[fi] += walker.allpars[fi]
+                nval[fi] += 1
+
+            problem = self.walkers[kmx].problem
+            fi = self.walkers[kmx].fitIndex
+
         maxv[fi] = self.domain2Unit( problem, maxv[fi], kpar=fi )
         minv[fi] = self.domain2Unit( problem, minv[fi], kpar=fi )
 
@@ -309,6 +366,92 @@ class Engine( object ):
 #        print( "Eng1  ", self.unitRange )
         return
 
+    def updateMoments( self, changed=None ):
+        """
+        Return the lower Cholesky factor of the covariance matrix of the walkers
+        in unit space, over the fitted parameters, or None if it is singular.
+
+        The walkers are taken from the cloud (see updateCloud). The sums of their
+        deviations from a reference point are updated for the changed walkers only.
+        They are recalculated from all walkers, with a new reference point,
+        after as many updates as there are walkers.
+
+        Parameters
+        ----------
+        changed : None or list of int
+            indices of the walkers that changed. None : all walkers.
+
+        """
+        allpars = self.cloud[0]
+        problem = self.walkers[0].problem
+        fi = self.walkers[0].fitIndex
+        nw = len( allpars )
+
+        if changed is None or self.moments is None or self.moments[4] >= nw :
+            upars = self.domain2Unit( problem, allpars[:,fi], kpar=fi )
+            ref = numpy.mean( upars, axis=0 )
+            dev = upars - ref
+            self.moments = [upars, ref, numpy.sum( dev, axis=0 ), numpy.dot( dev.T, dev ), 0]
+        else :
+            ( upars, ref, sum1, sum2, nupd ) = self.moments
+            changed = numpy.unique( changed )
+            dev = upars[changed] - ref
+            sum1 -= numpy.sum( dev, axis=0 )
+            sum2 -= numpy.dot( dev.T, dev )
+            upars[changed] = self.domain2Unit( problem, allpars[changed][:,fi], kpar=fi )
+            dev = upars[changed] - ref
+            sum1 += numpy.sum( dev, axis=0 )
+            sum2 += numpy.dot( dev.T, dev )
+            self.moments[4] += len( changed )
+
+        mean = self.moments[2] / nw
+        cov = self.moments[3] / nw - numpy.outer( mean, mean )
+        try :
+            return numpy.linalg.cholesky( cov )
+        except numpy.linalg.LinAlgError :
+            return None
+
+    def updateCloud( self, changed=None ):
+        """
+        Return the minimum and maximum values of the parameters of all walkers,
+        updated for the walkers that changed.
+
+        The parameters of the walkers are kept in the attribute cloud, as a tuple of
+        ( allpars, imin, imax ) with imin, imax the walkers holding the extremes.
+
+        Parameters
+        ----------
+        changed : None or list of int
+            indices of the walkers that changed. None : all walkers.
+
+        """
+        if changed is None or self.cloud is None or len( self.cloud[0] ) != len( self.walkers ) :
+            allpars = numpy.asarray( [walker.allpars for walker in self.walkers], dtype=float )
+            imin = numpy.argmin( allpars, axis=0 )
+            imax = numpy.argmax( allpars, axis=0 )
+        else :
+            ( allpars, imin, imax ) = self.cloud
+            changed = numpy.unique( changed )
+            allpars[changed] = [self.walkers[k].allpars for k in changed]
+
+            ## the holder of an extreme changed: rescan those parameters
+            lost = numpy.isin( imin, changed )
+            imin[lost] = numpy.argmin( allpars[:,lost], axis=0 )
+            lost = numpy.isin( imax, changed )
+            imax[lost] = numpy.argmax( allpars[:,lost], axis=0 )
+
+            ## otherwise the changed walkers can only extend the range
+            kp = numpy.arange( allpars.shape[1] )
+            cpars = allpars[changed]
+            kc = changed[numpy.argmin( cpars, axis=0 )]
+            imin = numpy.where( allpars[kc,kp] < allpars[imin,kp], kc, imin )
+            kc = changed[numpy.argmax( cpars, axis=0 )]
+            imax = numpy.where( allpars[kc,kp] > allpars[imax,kp], kc, imax )
+
+        self.cloud = ( allpars, imin, imax )
+        kp = numpy.arange( allpars.shape[1] )
+        return ( allpars[imin,kp], allpars[imax,kp] )
+
     def __str__( self ) :
         return str( "Engine" )
 
@@ -330,6 +473,23 @@ class Engine( object ):
         """
         pass
 
+    def executeEnsemble( self, walkers, lowLhood ):
+        """
+        Execute the engine for all walkers.
+        Return the number of succesfull moves.
+
+        In this base class it executes one walker at a time.
+
+        Parameters
+        ----------
+        walkers : WalkerList
+            walkers to diffuse
+        lowLhood : float
+            low limit on the loglikelihood
+
+        """
+        return sum( [self.execute( walker, lowLhood ) for walker in walkers] )
+
 
 class DummyPlotter( object ) :
 
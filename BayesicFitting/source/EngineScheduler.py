@@ -0,0 +1,181 @@
+import numpy as numpy
+
+__author__ = "Do Kester"
+__year__ = 2018
+__license__ = "GPL3"
+__version__ = "0.9"
+__maintainer__ = "Do"
+__status__ = "Development"
+
+#  *
+#  * This file is part of the BayesicFitting package.
+#  *
+#  * BayesicFitting is free software: you can redistribute it and/or modify
+#  * it under the terms of the GNU Lesser General Public License as
+#  * published by the Free Software Foundation, either version 3 of
+#  * the License, or ( at your option ) any later version.
+#  *
+#  * BayesicFitting is distributed in the hope that it will be useful,
+#  * but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  * MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+#  * GNU Lesser General Public License for more details.
+#  *
+#  * The GPL3 license can be found at <http://www.gnu.org/licenses/>.
+#  *
+#  *    2018        Do Kester
+
+class EngineScheduler( object ):
+    """
+    Adaptive selection of the engines in the Explorer.
+
+    For each engine it keeps the number of successful moves, the number of
+    calls to the likelihood (and its partials) and the wall-clock time spent.
+    Older results are slowly forgotten, so that the selection follows the
+    changing circumstances during the run.
+
+    The engines are selected with probabilities proportional to their
+    successful moves per second, mixed with a uniform floor so that all
+    engines keep being tried (a bandit with exploration floor).
+    Until all engines have been executed a minimum number of times,
+    the selection is uniform.
+
+    As the weights depend on timing, runs with an adaptive scheduler are not
+    exactly reproducible.
+
+    Attributes
+    ----------
+    floor : float (0.1)
+        fraction of the selections that is uniform over the engines
+    decay : float (0.999)
+        factor to forget older results, at each update
+    minexec : int (10)
+        minimum number of executions of each engine before adapting
+    moves : array_like
+        (decayed) number of successful moves per engine
+    calls : array_like
+        (decayed) number of calls to logL and its partials per engine
+    times : array_like
+        (decayed) wall-clock seconds per engine
+    nexec : array_like
+        number of executions per engine
+    weights : array_like
+        present selection probabilities of the engines
+
+    Author       Do Kester.
+
+    """
+    def __init__( self, nengines, floor=0.1, decay=0.999, minexec=10 ):
+        """
+        Constructor.
+
+        Parameters
+        ----------
+        nengines : int
+            number of engines
+        floor : float
+            fraction of the selections that is uniform over the engines
+        decay : float
+            factor to forget older results, at each update
+        minexec : int
+            minimum number of executions of each engine before adapting
+
+        """
+        self.floor = floor
+        self.decay = decay
+        self.minexec = minexec
+        self.moves = numpy.zeros( nengines, dtype=float )
+        self.calls = numpy.zeros( nengines, dtype=float )
+        self.times = numpy.zeros( nengines, dtype=float )
+        self.nexec = numpy.zeros( nengines, dtype=int )
+        self.weights = numpy.full( nengines, 1.0 / nengines )
+
+    def select( self, rng ) :
+        """
+        Return the indices of the engines to be executed in one round.
+
+        As many engines are drawn (with replacement) as there are engines,
+        according to the weights.
+
+        Parameters
+        ----------
+        rng : numpy.random.RandomState
+            random number generator
+        """
+        nengines = len( self.weights )
+        return rng.choice( nengines, size=nengines, p=self.weights )
+
+    def update( self, k, moves, calls, time ) :
+        """
+        Add the results of an execution of engine k, and recalculate the weights.
+
+        Parameters
+        ----------
+        k : int
+            index of the engine
+        moves : int
+            number of successful moves
+        calls : int
+            number of calls to logL and its partials
+        time : float
+            wall-clock seconds spent
+        """
+        self.moves *= self.decay
+        self.calls *= self.decay
+        self.times *= self.decay
+        self.moves[k] += moves
+        self.calls[k] += calls
+        self.times[k] += time
+        self.nexec[k] += 1
+        self.setWeights()
+
+    def merge( self, results ) :
+        """
+        Add the results of a number of executions, e.g. from a worker process.
+
+        Parameters
+        ----------
+        results : list of tuple of ( k, moves, calls, time )
+            results of executions of engine k
+        """
+        for res in results :
+            self.update( *res )
+
+    def setWeights( self ) :
+        """ Calculate the selection probabilities from the results. """
+        nengines = len( self.weights )
+        if numpy.any( self.nexec < self.minexec ) :
+            return
+
+        rate = self.movesPerSecond()
+        total = numpy.sum( rate )
+        if total <= 0 :
+            self.weights = numpy.full( nengines, 1.0 / nengines )
+            return
+        self.weights = self.floor / nengines + ( 1 - self.floor ) * rate / total
+
+    def movesPerCall( self ) :
+        """ Return the successful moves per call to logL (or its partials).  """
+        return self.moves / numpy.maximum( self.calls, 1e-300 )
+
+    def movesPerSecond( self ) :
+        """ Return the successful moves per wall-clock second.  """
+        return self.moves / numpy.maximum( self.times, 1e-300 )
+
+    def printReport( self, engines ) :
+        """
+        Print the weights and the performance of the engines.
+
+        Parameters
+        ----------
+        engines : list of Engine
+            the engines, in the same order
+        """
+        print( "Scheduler             weight moves/call  moves/sec" )
+        mpc = self.movesPerCall()
+        mps = self.movesPerSecond()
+        for k, engine in enumerate( engines ) :
+            print( "%-16.16s  %10.3f %10.3f %10.1f" % ( engine, self.weights[k], mpc[k], mps[k] ) )
+
+    def __str__( self ) :
+        return str( "EngineScheduler" )
+
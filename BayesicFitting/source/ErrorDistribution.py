@@ -333,6 +333,28 @@ class ErrorDistribution( object ):
         return numpy.sum( self.logLdata( problem, allpars ) )
 
 
+    def ensembleLogL( self, problem, allpars ):
+        """
+        Return the log( likelihood ) for each of an ensemble of parameter sets.
+
+        In this base class it calls logLikelihood for each set.
+        Distributions that can, should overwrite this with a vectorized version.
+
+        Parameters
+        ----------
+        problem : Problem
+            to be solved
+        allpars : array_like
+            parameters of the problem, shape ( nsets, npars + nphypar )
+
+        Returns
+        -------
+        array of nsets log( likelihood )s
+        """
+        allpars = numpy.atleast_2d( allpars )
+        return numpy.fromiter( ( self.logLikelihood( problem, ap ) for ap in allpars ),
+                               float, count=len( allpars ) )
+
     def partialLogL( self, problem, allpars, fitIndex ) :
         """
         Return the partial derivative of log( likelihood ) to the parameters.
@@ -348,6 +370,11 @@ class ErrorDistribution( object ):
 
         """
         self.nparts += 1                ## counts calls tp partialLogL
+        if problem.linear is not None :
+            ## marginalized linear parameters: at their solution
+            solution = problem.solveLinear( allpars )
+            if solution is not None :
+                allpars = numpy.append( solution[0], allpars[problem.npars:] )
         mock = problem.result( allpars[:problem.model.npars] )
 
         if True :
@@ -371,6 +398,131 @@ class ErrorDistribution( object ):
             return self.numPartialLogL( problem, allpars, fitIndex )
 
 
+    def logLikelihoodAndGradient( self, problem, allpars, fitIndex ) :
+        """
+        Return the log( likelihood ) and its partial derivatives to the
+        parameters in fitIndex.
+
+        The model is evaluated once; the derivatives to the model parameters
+        are obtained as one product of dL/dmock with the partials matrix.
+        Distributions that do not provide logLdataAndPartial, and problems
+        with marginalized linear parameters, fall back to logLikelihood and
+        partialLogL.
+
+        Parameters
+        ----------
+        problem : Problem
+            to be solved
+        allpars : array_like
+            parameters of the problem
+        fitIndex : array_like
+            indices of parameters to be fitted
+
+        Returns
+        -------
+        tuple of ( logL, dL/dp )
+        """
+        data = self.dataAndPartial( problem, allpars )
+        if data is None :
+            return ( self.logLikelihood( problem, allpars ),
+                     self.partialLogL( problem, allpars, fitIndex ) )
+
+        self.ncalls += 1
+        self.nparts += 1
+        return ( numpy.sum( data[0] ), self.combinePartial( problem, allpars, fitIndex, data ) )
+
+    def gradientLogL( self, problem, allpars, fitIndex ) :
+        """
+        Return the partial derivatives of the log( likelihood ) to the
+        parameters in fitIndex, as partialLogL does.
+
+        As in logLikelihoodAndGradient, the derivatives to the model parameters
+        are one product of dL/dmock with the partials matrix. The logL itself
+        is not summed, nor counted as a call.
+
+        Parameters
+        ----------
+        problem : Problem
+            to be solved
+        allpars : array_like
+            parameters of the problem
+        fitIndex : array_like
+            indices of parameters to be fitted
+
+        """
+        data = self.dataAndPartial( problem, allpars )
+        if data is None :
+            return self.partialLogL( problem, allpars, fitIndex )
+
+        self.nparts += 1
+        return self.combinePartial( problem, allpars, fitIndex, data )
+
+    def dataAndPartial( self, problem, allpars ) :
+        """
+        Return the result of logLdataAndPartial at the mock data of allpars,
+        or None when not available, or when linear parameters are marginalized.
+
+        Parameters
+        ----------
+        problem : Problem
+            to be solved
+        allpars : array_like
+            parameters of the problem
+        """
+        if problem.linear is not None :
+            return None
+        mock = problem.result( allpars[:problem.npars] )
+        return self.logLdataAndPartial( problem, allpars, mockdata=mock )
+
+    def combinePartial( self, problem, allpars, fitIndex, data ) :
+        """
+        Return the partial derivatives to the parameters in fitIndex, from
+        those to the mock data and to the hyperparameters.
+
+        Parameters
+        ----------
+        problem : Problem
+            to be solved
+        allpars : array_like
+            parameters of the problem
+        fitIndex : array_like
+            indices of parameters to be fitted
+        data : tuple
+            as returned by logLdataAndPartial
+        """
+        ( lld, dLdm, dLdh ) = data
+        fitIndex = numpy.asarray( fitIndex, dtype=int )
+        dL = numpy.zeros( len( fitIndex ), dtype=float )
+        q = fitIndex >= 0
+        if numpy.any( q ) :
+            dL[q] = numpy.dot( dLdm, problem.partial( allpars[:problem.npars] )[:,fitIndex[q]] )
+        for i in numpy.flatnonzero( ~q ) :
+            dL[i] = numpy.sum( dLdh[fitIndex[i]] )
+        return dL
+
+    def logLdataAndPartial( self, problem, allpars, mockdata=None ) :
+        """
+        Return the log( likelihood ) for each residual and its derivatives
+        to the mock data and to the hyperparameters.
+
+        Default implementation: returns None (not available).
+
+        Parameters
+        ----------
+        problem : Problem
+            to be solved
+        allpars : array_like
+            parameters of the problem
+        mockdata : array_like
+            as calculated for the problem
+
+        Returns
+        -------
+        tuple of ( logLdata, dL/dmock, [dL/dhyp] ) where the last is a list
+            with one array for each hyperparameter, in the order of allpars
+        """
+        return None
+
     def partialLogL_alt( self, problem, allpars, fitIndex ) :
         """
         Return the partial derivative of log( likelihood ) to the parameters.
@@ -421,9 +573,10 @@ class ErrorDistribution( object ):
         """"
         Return a update of the log( likelihood ) given a change in a few parameter.
 
-        This method provides the opportunity to optimize the logL calculation.
-        Providing this one, automatically provides the previous one.
-        For now it just refers to logLikelihood() itself.
+        The problem is asked for an update of its previous result; when the
+        changed parameters are in additive (linear or localized) components of
+        the model, only those are recalculated.
+        Otherwise it just refers to logLikelihood() itself.
 
         Parameters
         ----------
@@ -435,7 +588,13 @@ class ErrorDistribution( object ):
             int index of a parameter
             float (old) value of the parameter
         """
-        return self.logLikelihood( problem, allpars )
+        mock = None if parval is None else problem.updateResult(
+                        allpars[:problem.npars], parval )
+        if mock is None :
+            return self.logLikelihood( problem, allpars )
+
+        self.ncalls += 1
+        return numpy.sum( self.logLdata( problem, allpars, mockdata=mock ) )
 
     def setResult( self ):
         pass
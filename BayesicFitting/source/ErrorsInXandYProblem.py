@@ -1,10 +1,10 @@
 import numpy as numpy
-from astropy import units
 import re
 import warnings
 from . import Tools
 
 from .Problem import Problem
+from .PriorTable import PriorTable
 from .Formatter import formatter as fmt
 
 #  * This file is part of the BayesicFitting package.
@@ -179,6 +179,26 @@ class ErrorsInXandYProblem( Problem ):
 
         return self.prior.unit2Domain( uval ) + self.xdata[kpar-self.model.npars]
 
+    def makePriorTable( self, hyperpar=[] ) :
+        """
+        Return a PriorTable for the parameters of the problem, followed by
+        the hyperparameters.
+
+        Parameters
+        ----------
+        hyperpar : list of HyperParameter
+            hyperparameters of the error distribution
+
+        """
+        np = self.model.npars
+        nx = self.npars - np
+        priors = [self.model.getPrior( k ) for k in range( np )]
+        priors += [self.prior] * nx
+        priors += [hp.prior for hp in hyperpar]
+        offset = numpy.zeros( len( priors ), dtype=float )
+        offset[np:np+nx] = self.xdata
+        return PriorTable( priors, offset=offset )
+
     def residuals( self, param, mockdata=None ) :
         """
         Return the (weighted) true distance between (xdata,ydata) and (xtry,ytry) where xtry are
@@ -198,6 +218,17 @@ class ErrorsInXandYProblem( Problem ):
         return numpy.hypot( res, self.xdata - xd )
 
 
+    def ensembleResiduals( self, params ) :
+        """
+        Return the true distances for an ensemble of parameter sets.
+
+        Parameters
+        ----------
+        params : array_like
+            model parameters and xdata parameters, shape ( nsets, npars )
+        """
+        return numpy.asarray( [self.residuals( par ) for par in params] )
+
     def weightedResiduals( self, param, mockdata=None, extra=False ) :
         """
         Returns the (weighted) residuals, calculated at the xdata.
@@ -1,5 +1,4 @@
 import numpy as numpy
-from astropy import units
 import math
 from . import Tools
 from .NonLinearModel import NonLinearModel
@@ -191,6 +190,7 @@ class EtalonDriftModel( NonLinearModel ):
             the kth parameter.
 
         """
+        from astropy import units
         if k == 0:
             return self.yUnit
         if k == 1:
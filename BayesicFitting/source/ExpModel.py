@@ -114,10 +114,9 @@ class ExpModel( NonLinearModel ):
             list of indices active parameters (or None for all)
 
         """
-        np = self.npbase if parlist is None else len( parlist )
-        partial = numpy.ndarray( ( Tools.length( xdata ), np ) )
-
         e = numpy.exp( params[1] * xdata )
+        np = self.npbase if parlist is None else len( parlist )
+        partial = numpy.ndarray( numpy.shape( e ) + ( np, ) )
 
         parts = { 0 : ( lambda: e ),
                   1 : ( lambda: params[0] * e * xdata ) }
@@ -126,10 +125,40 @@ class ExpModel( NonLinearModel ):
             parlist = range( self.npmax )
 
         for k,kp in enumerate( parlist ) :
-            partial[:,k] = parts[kp]()
+            partial[...,k] = parts[kp]()
 
         return partial
 
+    def baseEnsembleResult( self, xdata, params ):
+        """
+        Returns the results of the model function for an ensemble of parameters.
+
+        Parameters
+        ----------
+        xdata : array_like
+            values at which to calculate the result
+        params : array_like (nsets,npars)
+            values for the parameters, one set per row.
+
+        """
+        return self.baseResult( xdata, params.T[:,:,numpy.newaxis] )
+
+    def baseEnsemblePartial( self, xdata, params, parlist=None ):
+        """
+        Returns the partials for an ensemble of parameters.
+
+        Parameters
+        ----------
+        xdata : array_like
+            values at which to calculate the partials
+        params : array_like (nsets,npars)
+            values for the parameters, one set per row.
+        parlist : array_like
+            list of indices active parameters (or None for all)
+
+        """
+        return self.basePartial( xdata, params.T[:,:,numpy.newaxis], parlist=parlist )
+
     def baseDerivative( self, xdata, params ):
         """
         Returns the derivative df/dx at the input value.
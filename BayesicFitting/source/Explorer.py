@@ -1,8 +1,13 @@
 import numpy as numpy
+import time
+import copy
+import queue
 from threading import Thread
+from multiprocessing import Pool
 
 #from OrderProblem import OrderProblem
 from .Engine import Engine
+from .Walker import Walker
 
 __author__ = "Do Kester"
 __year__ = 2017
@@ -40,7 +45,12 @@ class Explorer( object ):
     Explorer is a helper class of NestedSampler, which contains and runs the
     diffusion engines.
 
-    It uses Threads to parallelise the diffusion engines.
+    It uses Threads or a pool of worker Processes to parallelise the
+    diffusion engines.
+
+    The walkers are explored in batches (explore), or asynchronously: each
+    walker is dispatched on its own and collected as soon as it is done
+    (dispatch and collect).
 
     Attributes
     ----------
@@ -62,19 +72,31 @@ class Explorer( object ):
         present low likelihood level
     generation : int
         counting explorer calls
+    processes : int (0)
+        number of worker processes in the pool. 0 : no pool
+    scheduler : None or EngineScheduler
+        None : all engines are executed in random order.
+        EngineScheduler : selects the engines according to their performance
+    done : queue.Queue
+        dispatched walkers that are explored, to be collected
 
     Author       Do Kester.
 
     """
     TWOP32 = 2 ** 32
 
-    def __init__( self, ns, threads=False ):
+    def __init__( self, ns, threads=False, processes=0 ):
         """
         Construct Explorer from a NestedSampler object.
         Parameters
         ----------
         ns : NestedSampler
             the calling NestedSampler
+        threads : bool (False)
+            use a thread for each walker to be explored
+        processes : int (0)
+            number of processes in a persistent pool of workers.
+            The walkers are shipped to the workers, explored and sent back.
 
         """
         self.walkers = ns.walkers
@@ -88,7 +110,45 @@ class Explorer( object ):
 #           return
 #        self.engines[0].calculateUnitRange( )
         self.threads = threads
+        self.processes = processes
+        self.scheduler = ns.scheduler
+        self.done = queue.Queue()
+        self.pool = None
+        if processes > 0 :
+            self.pool = Pool( processes, initializer=_initWorker,
+                              initargs=( self.workerExplorer(), ) )
+
+    def workerExplorer( self ) :
+        """
+        Return a copy of this Explorer, suitable to be sent to a worker process.
 
+        The copy has no walkers and no pool; its engines are copies.
+        """
+        wex = object.__new__( Explorer )
+        wex.walkers = None
+        wex.engines = [eng.copy() for eng in self.engines]
+        for eng in wex.engines :
+            eng.walkers = None
+        wex.errdis = self.errdis
+        wex.problem = self.walkers[0].problem
+        wex.rng = None
+        wex.rate = self.rate
+        wex.maxtrials = self.maxtrials
+        wex.verbose = self.verbose
+        wex.threads = False
+        wex.processes = 0
+        wex.scheduler = copy.deepcopy( self.scheduler )
+        wex.pool = None
+        return wex
+
+    def close( self ) :
+        """
+        Close the pool of worker processes, if present.
+        """
+        if self.pool is not None :
+            self.pool.close()
+            self.pool.join()
+            self.pool = None
 
     def explore( self, worst, lowLhood ):
         """
@@ -102,6 +162,12 @@ class Explorer( object ):
             level of the low likelihood
 
         """
+        self.updateEngines( worst[0], lowLhood )
+
+        if self.pool is not None :
+            self.exploreInPool( worst, lowLhood )
+            return
+
         if not self.threads :
             for kw in worst :
                 walker = self.walkers[kw]
@@ -113,7 +179,6 @@ class Explorer( object ):
         explorerThreads = []
         self.lowLhood = lowLhood
 
-        nrep = Engine.NCALLS
         for kw in worst :
             seed = self.rng.randint( self.TWOP32 )
             walker = self.walkers[kw]
@@ -124,18 +189,10 @@ class Explorer( object ):
 
         for thread in explorerThreads :
             thread.join( )
+            self.addReports( thread.engines )
+            self.addRecord( thread )
 
-            for k,engine in enumerate( self.engines ) :
-                nc = 0
-                for i in range( nrep ) :
-                    nc += thread.engines[k].report[i]
-                    engine.report[i] += thread.engines[k].report[i]
-                engine.report[nrep] += nc
-
-        if len( threadErrors ) > 0: #check if there are any errors
-            for e in threadErrors:
-                print( e )
-            raise Exception( "Thread Error" )
+        self.checkThreadErrors()
 
         # recalculate  TBC
 #        if isinstance( self.walkers[0].model, OrderProblem ) :
@@ -143,7 +200,212 @@ class Explorer( object ):
 
 #        self.engines[0].calculateUnitRange( )
 
-    def exploreWalker( self, walker, lowLhood, engines, rng ):
+    def exploreInPool( self, worst, lowLhood ):
+        """
+        Explore the walkers in the pool of worker processes.
+
+        Each walker is sent with its own seed, taken from rng, so that the results
+        do not depend on which worker picks up which walker.
+
+        Parameters
+        ----------
+        worst : [int]
+            list of walkers to be explored/updated
+        lowLhood : float
+            level of the low likelihood
+
+        """
+        ensemble = self.packEnsemble()
+        tasks = [self.makeTask( kw, lowLhood, ensemble=ensemble ) for kw in worst]
+
+        results = self.pool.map( _exploreTask, tasks )
+
+        for kw, result in zip( worst, results ) :
+            self.storeResult( kw, result )
+
+    def updateEngines( self, kw, lowLhood ):
+        """
+        Update the state that engines keep over the iterations, here in the main
+        process, before the walkers are explored. Engines in threads or worker
+        processes only use it.
+
+        At present only the ellipsoids of EllipsoidEngine.
+
+        Parameters
+        ----------
+        kw : int
+            a walker to be explored
+        lowLhood : float
+            level of the low likelihood
+
+        """
+        walker = self.walkers[kw]
+        if walker.problem.model.isDynamic() :
+            return
+        for eng in self.engines :
+            if hasattr( eng, "getEllipsoids" ) :
+                eng.getEllipsoids( walker.fitIndex, lowLhood )
+
+    def packEnsemble( self ):
+        """
+        Return the walkers of the ensemble (without the best one), packed to be
+        sent to a worker process. Engines like CrossEngine need them all.
+        """
+        return [_packWalker( walker ) for walker in self.walkers[:-1]]
+
+    def makeTask( self, kw, lowLhood, ensemble=None ):
+        """
+        Return a task to explore walker kw in a worker process.
+
+        Parameters
+        ----------
+        kw : int
+            walker to be explored
+        lowLhood : float
+            level of the low likelihood
+        ensemble : None or list
+            the packed walkers (see packEnsemble). None : pack them here.
+
+        """
+        if ensemble is None :
+            ensemble = self.packEnsemble()
+        seed = self.rng.randint( self.TWOP32 )
+        weights = None if self.scheduler is None else self.scheduler.weights
+        bounds = [getattr( eng, "bound", None ) for eng in self.engines]
+        return ( _packWalker( self.walkers[kw] ), _packWalker( self.walkers[-1] ),
+                 ensemble, lowLhood, self.engines[0].unitRange,
+                 self.engines[0].unitMin, self.engines[0].unitBasis, bounds, weights, seed )
+
+    def storeResult( self, kw, result ):
+        """
+        Store the result of a task from a worker process.
+
+        Parameters
+        ----------
+        kw : int
+            walker that was explored
+        result : tuple
+            as returned by the worker
+
+        """
+        ( wpack, bpack, reports, ncalls, nparts, record ) = result
+        walker = _unpackWalker( wpack, self.walkers[kw].problem )
+        self.walkers[kw] = walker
+
+        if bpack[4] > self.walkers[-1].logL :
+            newbest = _unpackWalker( bpack, self.walkers[-1].problem )
+            newbest.id = self.walkers[-1].id
+            self.walkers[-1] = newbest
+
+        for engine, report in zip( self.engines, reports ) :
+            for i, r in enumerate( report ) :
+                engine.report[i] += r
+
+        self.errdis.ncalls += ncalls
+        self.errdis.nparts += nparts
+        if self.scheduler is not None :
+            self.scheduler.merge( record )
+
+    def dispatch( self, kw, lowLhood ):
+        """
+        Start the exploration of walker kw, without waiting for the result.
+
+        With threads or a pool, the exploration runs in the background; walkers
+        that are done, are obtained with collect(). Otherwise the walker is
+        explored right away.
+
+        Parameters
+        ----------
+        kw : int
+            walker to be explored
+        lowLhood : float
+            level of the low likelihood
+
+        """
+        self.updateEngines( kw, lowLhood )
+
+        if self.pool is not None :
+            self.pool.apply_async( _exploreTask, ( self.makeTask( kw, lowLhood ), ),
+                    callback=lambda result : self.done.put( ( kw, result ) ),
+                    error_callback=lambda error : self.done.put( ( kw, error ) ) )
+        elif self.threads :
+            seed = self.rng.randint( self.TWOP32 )
+            exThread = ExplorerThread( "explorer_%d"%kw, self.walkers[kw], self, seed,
+                                       lowLhood=lowLhood, done=self.done )
+            exThread.start( )
+        else :
+            self.exploreWalker( self.walkers[kw], lowLhood, self.engines, self.rng )
+            self.done.put( ( kw, None ) )
+
+    def collect( self ):
+        """
+        Wait until a dispatched walker is explored and return its index.
+
+        The walkers are collected in the order in which they are done.
+
+        Raises
+        ------
+        Exception when the exploration failed
+
+        """
+        ( kw, result ) = self.done.get()
+        if isinstance( result, ExplorerThread ) :
+            result.join( )
+            self.addReports( result.engines )
+            self.addRecord( result )
+            self.checkThreadErrors()
+        elif isinstance( result, Exception ) :
+            raise result
+        elif result is not None :
+            self.storeResult( kw, result )
+        return kw
+
+    def addReports( self, engines ):
+        """
+        Add the reports of (copies of) the engines, as used in a thread.
+
+        Parameters
+        ----------
+        engines : list of Engine
+            copies of the engines
+
+        """
+        nrep = Engine.NCALLS
+        for k,engine in enumerate( self.engines ) :
+            nc = 0
+            for i in range( nrep ) :
+                nc += engines[k].report[i]
+                engine.report[i] += engines[k].report[i]
+            engine.report[nrep] += nc
+
+    def addRecord( self, thread ):
+        """
+        Add the calls to logL and the results of the engine executions in a thread,
+        to the error distribution and the scheduler.
+
+        Parameters
+        ----------
+        thread : ExplorerThread
+            the thread that is done
+
+        """
+        if thread.record is None :
+            return
+        errdis = thread.engines[0].errdis
+        self.errdis.ncalls += errdis.ncalls
+        self.errdis.nparts += errdis.nparts
+        self.scheduler.merge( thread.record )
+
+    def checkThreadErrors( self ):
+        """
+        Raise an Exception when errors occurred in one of the threads.
+        """
+        if len( threadErrors ) > 0: #check if there are any errors
+            for e in threadErrors:
+                print( e )
+            raise Exception( "Thread Error" )
+
+    def exploreWalker( self, walker, lowLhood, engines, rng, record=None ):
         oldlogL = walker.logL
 
         maxmoves = len( walker.fitIndex ) / self.rate
@@ -154,6 +416,11 @@ class Explorer( object ):
 
         while moves < maxmoves and trials < maxtrials :
             i = 0
+            if self.scheduler is not None :
+                moves += self.scheduleEngines( walker, lowLhood, engines, rng, record=record )
+                trials += 1
+                continue
+
             for engine in rng.permutation( engines ) :
 #                print( "Exp   ", engine, walker.id, walker.allpars, walker.fitIndex )
 
@@ -178,6 +445,47 @@ class Explorer( object ):
 #        print( moves, maxmoves, trials, maxtrials )
         return
 
+    def scheduleEngines( self, walker, lowLhood, engines, rng, record=None ):
+        """
+        Execute one round of engines, as selected by the scheduler.
+        Return the number of successful moves.
+
+        The moves, calls to logL (and partials) and the time spent by each engine,
+        are sent to the scheduler, or to the record in a thread or a worker process.
+        The calls are counted by the error distribution of the engines, which
+        is a copy of its own in a thread.
+
+        Parameters
+        ----------
+        walker : Walker
+            walker to diffuse
+        lowLhood : float
+            lower limit in logLikelihood
+        engines : list of Engine
+            engines to select from
+        rng : numpy.random.RandomState
+            random number generator
+        record : None or list
+            to collect the results in. None : update the scheduler
+        """
+        moves = 0
+        for k in self.scheduler.select( rng ) :
+            errdis = engines[k].errdis
+            ncalls = errdis.ncalls + errdis.nparts
+            tstart = time.perf_counter()
+
+            nmov = engines[k].execute( walker, lowLhood )
+
+            result = ( k, nmov, errdis.ncalls + errdis.nparts - ncalls,
+                       time.perf_counter() - tstart )
+            if record is None :
+                self.scheduler.update( *result )
+            else :
+                record += [result]
+            moves += nmov
+
+        return moves
+
     def logLcheck( self, walker ) :
         wlogL = self.errdis.logLikelihood( walker.problem, walker.allpars )
         if wlogL != walker.logL :
@@ -185,6 +493,82 @@ class Explorer( object ):
                                 ( walker.logL, wlogL ) )
 
 
+## Worker process part of the Explorer. The state lives in module globals
+## because it is installed once per worker by the pool initializer.
+workerExplorer = None
+
+def _initWorker( explorer ) :
+    """
+    Install the (copied) Explorer in the worker process.
+    """
+    global workerExplorer
+    workerExplorer = explorer
+
+def _packWalker( walker ) :
+    """
+    Return the contents of a walker as a tuple to be sent to/from a worker.
+
+    The problem is only included for dynamic models; otherwise the workers
+    use the problem they already have.
+    """
+    problem = walker.problem if walker.problem.model.isDynamic() else None
+    return ( walker.id, walker.parent, walker.allpars, walker.fitIndex,
+             walker.logL, problem )
+
+def _unpackWalker( pack, problem ) :
+    """
+    Return a Walker from a packed tuple, using problem when it was not packed.
+    """
+    ( id, parent, allpars, fitIndex, logL, prob ) = pack
+    walker = Walker( id, problem if prob is None else prob, allpars, fitIndex,
+                     parent=parent )
+    walker.logL = logL
+    return walker
+
+def _exploreTask( task ) :
+    """
+    Explore one walker inside a worker process.
+
+    Returns the packed walker and the packed best walker, the reports of the
+    engines and the numbers of calls to logL and to its partials.
+    """
+    ( wpack, bpack, ensemble, lowLhood, unitRange, unitMin, unitBasis, bounds, weights,
+      seed ) = task
+    explorer = workerExplorer
+    problem = explorer.problem
+
+    walkers = [_unpackWalker( pack, problem ) for pack in ensemble] + [None]
+    walker = _unpackWalker( wpack, problem )
+    walkers[walker.id] = walker
+    walkers[-1] = _unpackWalker( bpack, problem )
+
+    rng = numpy.random.RandomState( seed )
+    for eng, bound in zip( explorer.engines, bounds ) :
+        eng.walkers = walkers
+        eng.unitRange = unitRange
+        eng.unitMin = unitMin
+        eng.unitBasis = unitBasis
+        if bound is not None :
+            eng.bound = bound
+        eng.report = [0] * len( eng.report )
+        eng.rng = numpy.random.RandomState( rng.randint( Explorer.TWOP32 ) )
+
+    ## the scheduler of the main process decides; the results are sent back
+    record = []
+    if weights is not None :
+        explorer.scheduler.weights = weights
+
+    ncalls = explorer.errdis.ncalls
+    nparts = explorer.errdis.nparts
+
+    explorer.exploreWalker( walker, lowLhood, explorer.engines, rng, record=record )
+
+    reports = [eng.report for eng in explorer.engines]
+    return ( _packWalker( walkers[walker.id] ), _packWalker( walkers[-1] ), reports,
+             explorer.errdis.ncalls - ncalls, explorer.errdis.nparts - nparts,
+             record )
+
+
 class ExplorerThread( Thread ):
     """
     One thread for the Explorer. It updates one walker.
@@ -199,25 +583,43 @@ class ExplorerThread( Thread ):
         random number generator
     engines : [Engine]
         copy of the list of Engines of Explorer
+    lowLhood : float
+        level of the low likelihood
+    done : None or queue.Queue
+        to put ( walker index, thread ) in when done
+    record : None or list
+        results of the engine executions, for the scheduler of the Explorer.
+        The engines then count the calls to logL in a copy of the error distribution.
     """
 
     global threadErrors
 
-    def __init__( self, name, walker, explorer, seed ):
+    def __init__( self, name, walker, explorer, seed, lowLhood=None, done=None ):
         super( ExplorerThread, self ).__init__( name=name )
         self.walker = walker
         self.explorer = explorer
         self.engines = [eng.copy() for eng in explorer.engines]
         self.rng = numpy.random.RandomState( seed )
+        self.lowLhood = explorer.lowLhood if lowLhood is None else lowLhood
+        self.done = done
+        self.record = None
+        if explorer.scheduler is not None :
+            self.record = []
+            errdis = explorer.errdis.copy()
+            for eng in self.engines :
+                eng.errdis = errdis
 
 
     def run( self ):
         try :
-            self.explorer.exploreWalker( self.walker, self.explorer.lowLhood,
-                                         self.engines, self.rng )
+            self.explorer.exploreWalker( self.walker, self.lowLhood,
+                                         self.engines, self.rng, record=self.record )
         except Exception as e :
             threadErrors.append( [repr(e) + " occurred in walker %d" % self.walker.id] )
             raise
+        finally :
+            if self.done is not None :
+                self.done.put( ( self.walker.id, self ) )
 
 
 
@@ -182,6 +182,34 @@ class ExponentialErrorDistribution( ScaledErrorDistribution ):
             lld *= problem.weights
         return lld
 
+    def ensembleLogL( self, problem, allpars ) :
+        """
+        Return the log( likelihood ) for each of an ensemble of parameter sets.
+
+        Parameters
+        ----------
+        problem : Problem
+            to be solved
+        allpars : array_like
+            parameters of the problem, shape ( nsets, npars + 2 )
+
+        Returns
+        -------
+        array of nsets log( likelihood )s
+        """
+        allpars = numpy.atleast_2d( allpars )
+        self.ncalls += len( allpars )
+
+        scale = allpars[:,-2]
+        power = allpars[:,-1]
+        res = problem.ensembleResiduals( allpars[:,:-2] )
+
+        ars = numpy.power( numpy.abs( res / scale[:,numpy.newaxis] ), power[:,numpy.newaxis] )
+        if problem.weights is not None :
+            ars = ars * problem.weights
+        norm = numpy.log( power / ( 2 * scale ) ) - special.gammaln( 1.0 / power )
+        return problem.sumweight * norm - numpy.sum( ars, axis=1 )
+
     def getChipow( self, problem, allpars=None ) :
         """
         Return chisq.
@@ -267,6 +295,39 @@ class ExponentialErrorDistribution( ScaledErrorDistribution ):
 
         return dL
 
+    def logLdataAndPartial( self, problem, allpars, mockdata=None ) :
+        """
+        Return the log( likelihood ) for each residual and its derivatives
+        to the mock data and to the hyperparameters.
+
+        Parameters
+        ----------
+        problem : Problem
+            to be solved
+        allpars : array_like
+            list of all parameters in the problem
+        mockdata : array_like
+            as calculated by the model
+
+        """
+        res = problem.residuals( allpars[:-2], mockdata=mockdata )
+        scale = allpars[-2]
+        power = allpars[-1]
+
+        ars = numpy.abs( res / scale )
+        rsp = numpy.power( ars, power )
+        wgt = 1.0 if problem.weights is None else problem.weights
+        rsp = rsp * wgt
+
+        norm = math.log( power / ( 2 * scale ) ) - special.gammaln( 1.0 / power )
+        lld = norm * wgt - rsp
+
+        # special.psi( x ) is the same as special.polygamma( 1, x )
+        dlp = wgt * ( power + special.psi( 1.0 / power ) ) / ( power * power )
+
+        return ( lld, power * rsp / res,
+                 [( power * rsp - wgt ) / scale, dlp - rsp * numpy.log( ars )] )
+
     def nextPartialData( self, problem, allpars, fitIndex, mockdata=None ) :
         """
         Return the partial derivative of all elements of the log( likelihood )
@@ -93,6 +93,16 @@ class ExponentialPrior( Prior ):
     def copy( self ):
         return ExponentialPrior( scale=self.scale, prior=self )
 
+    def __getstate__( self ) :
+        ## the random module cannot be pickled; it is attached again on unpickling
+        state = self.__dict__.copy()
+        state.pop( "_rng", None )
+        return state
+
+    def __setstate__( self, state ) :
+        self.__dict__.update( state )
+        object.__setattr__( self, "_rng", random )
+
     def __setattr__( self, name, value ):
         """
         Set attributes: zeroFraction
@@ -1,4 +1,5 @@
 import numpy as numpy
+import scipy.linalg
 from .BaseFitter import BaseFitter
 
 from .Formatter import formatter as fmt
@@ -54,6 +55,11 @@ class Fitter( BaseFitter ):
     >>> yfit  = poly( x )                   # same as previous
     >>> yband = fitter.monteCarloError( )        # 1 sigma confidence region
 
+    # many datasets on the same x, one per row of ys
+    >>> params = fitter.fitBatch( ys )           # shape ( nsets, npars )
+    >>> stdevs = fitter.getBatchStandardDeviations( )
+    >>> chisq  = fitter.batchChisq
+
 
     Limitations
     -----------
@@ -131,7 +137,10 @@ class Fitter( BaseFitter ):
             self.chiSquared( ydata, weights )
             return numpy.asarray( 0 )
 
-        hessian = self.getHessian( weights=weights, index=fitIndex )
+        ## for models with banded partials (e.g. splines) the hessian is banded too.
+        band = self.getBand( index=fitIndex )
+        if band is None :
+            hessian = self.getHessian( weights=weights, index=fitIndex )
         ydatacopy = ydata.copy( )
         # subtract influence of fixed parameters on the data
         if fitIndex is not None :
@@ -146,7 +155,11 @@ class Fitter( BaseFitter ):
 
         vector = self.getVector( ydatacopy, index=fitIndex )
 #        print( fmt( hessian ) )
-        params = numpy.linalg.solve( hessian, vector )
+        if band is None :
+            params = numpy.linalg.solve( hessian, vector )
+        else :
+            params = scipy.linalg.solveh_banded( self.getBandHessian( band, weights=weights ),
+                                                 vector )
 
         params = self.insertParameters( params, index=fitIndex )
         self.model.parameters = params
@@ -156,6 +169,67 @@ class Fitter( BaseFitter ):
 
         return params
 
+    def fitBatch( self, ydata, weights=None, keep=None ):
+        """
+        Return model parameters fitted to a batch of datasets, sharing the xdata.
+
+        When the weights are shared by all datasets, the hessian is
+        Cholesky-decomposed once and used for all datasets. Otherwise all
+        hessians are made and solved in one stacked operation.
+
+        The chisq, stdevs and evidence of the datasets are available through
+        batchChisq, getBatchStandardDeviations() and getBatchLogZ().
+
+        Parameters
+        ----------
+        ydata : array_like of shape ( nsets, ndata )
+            the data vectors to be fitted, one per row
+        weights : None or array_like of shape ( ndata, ) or ( nsets, ndata )
+            weights pertaining to the data ( = 1.0 / sigma^2 ), shared by all
+            datasets or one set per dataset
+        keep : dict of {int:float}
+            dictionary of indices (int) to be kept at a fixed value (float)
+            The values will override those at initialization.
+            They are only used in this call of fit.
+
+        Returns
+        -------
+        params : ndarray of shape ( nsets, npchain )
+
+        Raises
+        ------
+            ValueError when ydata or weights contain a NaN
+
+        """
+        fitIndex, ydata, weights = self.batchprolog( ydata, weights=weights, keep=keep )
+        design, ydatacopy, wgts = self.batchDesign( ydata, weights, index=fitIndex )
+
+        if wgts is None or wgts.ndim == 1 :
+            wdesign = design if wgts is None else design * wgts[:,numpy.newaxis]
+            cfac = scipy.linalg.cho_factor( numpy.dot( wdesign.transpose(), design ), lower=True )
+            params = scipy.linalg.cho_solve( cfac, numpy.dot( wdesign.transpose(),
+                                                              ydatacopy.transpose() ) )
+            params = params.transpose()
+            invhes = scipy.linalg.cho_solve( cfac, numpy.eye( len( design[0] ) ) )
+            invdiag = invhes.diagonal()
+            logdet = 2 * numpy.sum( numpy.log( cfac[0].diagonal() ) )
+        else :
+            hessian = numpy.einsum( "kn,ni,nj->kij", wgts, design, design )
+            vector = numpy.einsum( "kn,ni->ki", wgts * ydatacopy, design )
+            chol = numpy.linalg.cholesky( hessian )
+            params = numpy.linalg.solve( hessian, vector[:,:,numpy.newaxis] )[:,:,0]
+            invdiag = numpy.diagonal( numpy.linalg.inv( hessian ), axis1=1, axis2=2 )
+            logdet = 2 * numpy.sum( numpy.log( numpy.diagonal( chol, axis1=1, axis2=2 ) ),
+                                    axis=1 )
+
+        pars = numpy.tile( self.model.parameters, ( len( ydata ), 1 ) )
+        pars[:,fitIndex] = params
+
+        self.batchpostscript( ydata, pars, weights=weights, index=fitIndex,
+                              invdiag=invdiag, logdet=logdet )
+
+        return pars
+
     def __str__( self ):
         """ Return the name of the fitter. """
         return "Fitter"
@@ -1,5 +1,4 @@
 import numpy as numpy
-from astropy import units
 import re
 import warnings
 from . import Tools
@@ -301,6 +300,62 @@ class FixedModel( BaseModel ):
             nb += ne
         return partial
 
+    def ensembleResult( self, xdata, params ):
+        """
+        Returns the results for an ensemble of parameter sets.
+
+        Parameters
+        ----------
+        xdata : array_like
+            values at which to calculate the result
+        params : array_like (nsets,npars)
+            values for the parameters, one set per row.
+
+        """
+        if self.fixed is None :
+            return super( FixedModel, self ).ensembleResult( xdata, params )
+        return numpy.asarray( [FixedModel.result( self, xdata, par ) for par in params] )
+
+    def ensemblePartial( self, xdata, params ):
+        """
+        Returns the partials for an ensemble of parameter sets.
+
+        Parameters
+        ----------
+        xdata : array_like
+            values at which to calculate the result
+        params : array_like (nsets,npars)
+            values for the parameters, one set per row.
+
+        """
+        if self.fixed is None :
+            return super( FixedModel, self ).ensemblePartial( xdata, params )
+        return numpy.asarray( [FixedModel.partial( self, xdata, par ) for par in params] )
+
+    def resultChange( self, xdata, param, kpar, oldval ):
+        """
+        Returns the change in the result when one parameter has changed,
+        and the indices of the xdata where it changed (None for all).
+
+        Parameters
+        ----------
+        xdata : array_like
+            values at which to calculate the result
+        param : array_like
+            (new) values for the parameters.
+        kpar : int
+            index of the changed parameter
+        oldval : float
+            old value of the parameter
+
+        """
+        if self.fixed is None :
+            return super( FixedModel, self ).resultChange( xdata, param, kpar, oldval )
+        oldpar = numpy.array( param, dtype=float )
+        oldpar[kpar] = oldval
+        return ( FixedModel.result( self, xdata, param ) -
+                 FixedModel.result( self, xdata, oldpar ), None )
+
     def numPartial( self, xdata, params, parlist=None ) :
         """
         Returns numerical partial derivatives of the model to params.
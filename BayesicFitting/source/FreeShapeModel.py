@@ -1,6 +1,5 @@
 import numpy as numpy
 import numpy.linalg
-from astropy import units
 import math
 
 from . import Tools
@@ -146,15 +145,19 @@ class FreeShapeModel( LinearModel ):
     def __setattr__( self, name, value ) :
         if name == "shape" :
             setatt( self, name, value, type=Kernel )
+            self.clearDesign()
             return
         if name == "xlo" :
             setatt( self, name, value, type=float )
+            self.clearDesign()
             return
         if name == "xhi" :
             setatt( self, name, self.npbase if value is None else value, type=float )
+            self.clearDesign()
             return
         if name == "center" and ( 0 <= value <= 1 ) :
             setatt( self, name, value, type=float )
+            self.clearDesign()
             return
 
         super( FreeShapeModel, self ).__setattr__( name, value )
@@ -229,6 +232,29 @@ class FreeShapeModel( LinearModel ):
 #        print( fmt( partial ) )
         return partial
 
+    def baseResultChange( self, xdata, params, oldpars, kpar ):
+        """
+        Returns the change in the result when one pixel has changed.
+        Only the xdata under the shape of that pixel are touched.
+
+        Parameters
+        ----------
+        xdata : array_like
+            value at which to calculate the result
+        params : array_like
+            new values for the parameters
+        oldpars : array_like
+            old values for the parameters
+        kpar : int
+            index of the changed parameter
+
+        """
+        xpix = self.npbase * ( xdata - self.xlo ) / ( self.xhi - self.xlo )
+        xpix += self.center - kpar
+        index = numpy.flatnonzero( numpy.abs( xpix ) <= self.shape.range + 1e-10 )
+        part = self.basePartial( xdata[index], params, parlist=[kpar] )
+        return ( ( params[kpar] - oldpars[kpar] ) * part[:,0], index )
+
     def TBCbaseDerivative( self, xdata, params ):
         """
         Returns the derivative of the model function df/dx.
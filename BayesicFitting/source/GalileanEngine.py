@@ -1,5 +1,4 @@
 import numpy as numpy
-from astropy import units
 import math
 import warnings
 from . import Tools
@@ -152,7 +151,7 @@ class GalileanEngine( Engine ):
                 pedge = ptry.copy()
                 pedge[fitIndex] = um.stepPars( f )                # ptry on edge
 
-                dLdp = self.errdis.partialLogL( problem, pedge, fitIndex )
+                dLdp = self.errdis.gradientLogL( problem, pedge, fitIndex )
                 self.plotter.move( allpars, pedge, col=1, sym=4 )
 
                 um.mirrorOnLowL( dLdp )
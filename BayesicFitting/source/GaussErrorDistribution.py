@@ -109,6 +109,107 @@ class GaussErrorDistribution( ScaledErrorDistribution ):
         return self.getGaussianScale( problem, allpars=allpars )
 
     #  *********LIKELIHOODS***************************************************
+    def logLikelihood( self, problem, allpars ) :
+        """
+        Return the log( likelihood ) for a Gaussian distribution.
+
+        When the problem provides a quadratic form of chisq (i.e. the model
+        is linear in its parameters), it is used, independent of the number
+        of data points. Otherwise it is the sum of logLdata.
+        When the problem has linear parameters to marginalize, the marginal
+        likelihood is returned (see marginalLogL).
+
+        Parameters
+        ----------
+        problem : Problem
+            to be solved
+        allpars : array_like
+            list of all parameters in the problem
+
+        """
+        if problem.linear is not None :
+            return self.marginalLogL( problem, allpars )
+
+        form = problem.quadraticForm()
+        if form is None :
+            return super( GaussErrorDistribution, self ).logLikelihood( problem, allpars )
+
+        self.ncalls += 1
+
+        ( pmin, hessian, chimin ) = form
+        dp = allpars[:-1] - pmin
+        scale = allpars[-1]
+        chisq = ( chimin + numpy.dot( dp, numpy.dot( hessian, dp ) ) ) / ( scale * scale )
+        return ( - problem.sumweight * ( 0.5 * self.LOG2PI + math.log( scale ) ) -
+                       0.5 * chisq )
+
+    def marginalLogL( self, problem, allpars ) :
+        """
+        Return the log( likelihood ), marginalized over the linear parameters
+        of the problem.
+
+        For given nonlinear parameters, the likelihood is Gaussian in the
+        linear ones. Its integral over them, times their priors (taken at
+        the solution), is
+
+            logL = logL( solution ) + 0.5 * nl * log( 2 pi s^2 ) -
+                   0.5 * log( det( G^T W G ) ) + sum( log( prior( solution ) ) )
+
+        where nl is the number of linear parameters and s the scale.
+        The priors are assumed to be broad compared to the likelihood.
+
+        Parameters
+        ----------
+        problem : Problem
+            to be solved; with attribute linear
+        allpars : array_like
+            list of all parameters in the problem; the linear ones are not used.
+
+        """
+        self.ncalls += 1
+
+        solution = problem.solveLinear( allpars )
+        if solution is None :
+            return -math.inf
+        ( param, chimin, chol ) = solution
+
+        scale = allpars[-1]
+        nlin = len( problem.linear )
+        model = problem.model
+        logpr = 0.0
+        for k in problem.linear :
+            pr = model.getPrior( k ).result( param[k] )
+            if pr <= 0 :
+                return -math.inf
+            logpr += math.log( pr )
+
+        return ( - ( problem.sumweight - nlin ) * ( 0.5 * self.LOG2PI + math.log( scale ) ) -
+                 0.5 * chimin / ( scale * scale ) -
+                 numpy.sum( numpy.log( numpy.diag( chol ) ) ) + logpr )
+
+    def updateLogL( self, problem, allpars, parval=None ):
+        """
+        Return a update of the log( likelihood ) given a change in a few parameter.
+
+        When the problem provides a quadratic form of chisq, the full
+        logLikelihood is cheaper than an update. When it marginalizes linear
+        parameters, there is nothing to update.
+
+        Parameters
+        ----------
+        problem : Problem
+            to be solved
+        allpars : array_like
+            list of all parameters in the problem
+        parval : dict of {int : float}
+            int index of a parameter
+            float (old) value of the parameter
+        """
+        if problem.linear is not None or problem.quadraticForm() is not None :
+            return self.logLikelihood( problem, allpars )
+        return super( GaussErrorDistribution, self ).updateLogL( problem, allpars,
+                        parval=parval )
+
     def logLikelihood_alt( self, problem, allpars ) :
         """
         Return the log( likelihood ) for a Gaussian distribution.
@@ -159,6 +260,41 @@ class GaussErrorDistribution( ScaledErrorDistribution ):
         return res2
 
 
+    def ensembleLogL( self, problem, allpars ) :
+        """
+        Return the log( likelihood ) for each of an ensemble of parameter sets.
+
+        Parameters
+        ----------
+        problem : Problem
+            to be solved
+        allpars : array_like
+            parameters of the problem, shape ( nsets, npars + 1 )
+
+        Returns
+        -------
+        array of nsets log( likelihood )s
+        """
+        allpars = numpy.atleast_2d( allpars )
+        if problem.linear is not None :
+            return numpy.asarray( [self.marginalLogL( problem, ap ) for ap in allpars] )
+
+        self.ncalls += len( allpars )
+
+        scale = allpars[:,-1]
+        form = problem.quadraticForm()
+        if form is None :
+            res = problem.ensembleResiduals( allpars[:,:-1] )
+            res2 = res * res if problem.weights is None else res * res * problem.weights
+            chisq = numpy.sum( res2, axis=1 )
+        else :
+            ( pmin, hessian, chimin ) = form
+            dp = allpars[:,:-1] - pmin
+            chisq = chimin + numpy.sum( dp * numpy.dot( dp, hessian ), axis=1 )
+        chisq /= ( scale * scale )
+        return ( - problem.sumweight * ( 0.5 * self.LOG2PI + numpy.log( scale ) ) -
+                       0.5 * chisq )
+
     def partialLogL_alt( self, problem, allpars, fitIndex ) :
         """
         Return the partial derivative of log( likelihood ) to the parameters in fitIndex.
@@ -196,6 +332,30 @@ class GaussErrorDistribution( ScaledErrorDistribution ):
         return dL
 
 
+    def logLdataAndPartial( self, problem, allpars, mockdata=None ) :
+        """
+        Return the log( likelihood ) for each residual and its derivatives
+        to the mock data and to the hyperparameters.
+
+        Parameters
+        ----------
+        problem : Problem
+            to be solved
+        allpars : array_like
+            list of all parameters in the problem
+        mockdata : array_like
+            as calculated by the model
+
+        """
+        ( res2, res ) = problem.weightedResSq( allpars[:-1], mockdata=mockdata, extra=True )
+
+        scale = allpars[-1]
+        s2 = scale * scale
+        wgt = 1.0 if problem.weights is None else problem.weights
+        lld = -0.5 * res2 / s2 - ( 0.5 * self.LOG2PI + math.log( scale ) ) * wgt
+
+        return ( lld, res / s2, [( res2 / s2 - wgt ) / scale] )
+
     def nextPartialData( self, problem, allpars, fitIndex, mockdata=None ) :
         """
         Return the partial derivative all elements of the log( likelihood )
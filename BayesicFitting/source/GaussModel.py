@@ -1,5 +1,4 @@
 import numpy as numpy
-from astropy import units
 import math
 from . import Tools
 from .Tools import setAttribute as setatt
@@ -136,11 +135,11 @@ class GaussModel( NonLinearModel ):
             list of indices active parameters (or None for all)
 
         """
-        partial = numpy.ndarray( ( Tools.length( xdata ), self.npbase ) )
         a = params[0]
         s = 1 / params[2]
         x = ( xdata - params[1] ) * s
         e = numpy.exp( -0.5 * x * x )
+        partial = numpy.ndarray( numpy.shape( e ) + ( self.npbase, ) )
 
         parts = { 0 : ( lambda: e ),
                   1 : ( lambda: a * e * x * s ),
@@ -150,10 +149,57 @@ class GaussModel( NonLinearModel ):
             parlist = range( self.npmax )
 
         for k,kp in enumerate( parlist ) :
-            partial[:,k] = parts[kp]()
+            partial[...,k] = parts[kp]()
 
         return partial
 
+    def baseEnsembleResult( self, xdata, params ):
+        """
+        Returns the results of the model function for an ensemble of parameters.
+
+        Parameters
+        ----------
+        xdata : array_like
+            values at which to calculate the result
+        params : array_like (nsets,npars)
+            values for the parameters, one set per row.
+
+        """
+        return self.baseResult( xdata, params.T[:,:,numpy.newaxis] )
+
+    def baseEnsemblePartial( self, xdata, params, parlist=None ):
+        """
+        Returns the partials for an ensemble of parameters.
+
+        Parameters
+        ----------
+        xdata : array_like
+            values at which to calculate the partials
+        params : array_like (nsets,npars)
+            values for the parameters, one set per row.
+        parlist : array_like
+            list of indices active parameters (or None for all)
+
+        """
+        return self.basePartial( xdata, params.T[:,:,numpy.newaxis], parlist=parlist )
+
+    def baseSupport( self, xdata, params ):
+        """
+        Returns the indices of the xdata where the result is non-zero.
+
+        Beyond 40 sigma the Gaussian underflows to zero.
+
+        Parameters
+        ----------
+        xdata : array_like
+            values at which to calculate the result
+        params : array_like
+            values for the parameters.
+
+        """
+        x = ( xdata - params[1] ) / params[2]
+        return numpy.flatnonzero( numpy.abs( x ) < 40 )
+
     def baseDerivative( self, xdata, params ) :
         """
         Return the derivative df/dx at each xdata (=x).
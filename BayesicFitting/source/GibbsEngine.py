@@ -131,7 +131,8 @@ class GibbsEngine( Engine ):
 
             if Ltry > Lbest :
                 Lbest = Ltry
-                self.setWalker( self.walkers[-1], problem, param.copy(), Lbest, fitIndex=fitIndex )
+                self.setWalker( self.walkers[-1].copy(), problem, param.copy(), Lbest,
+                                fitIndex=fitIndex )
                 self.reportBest()
 
         return t                        # nr of succesfull steps
@@ -1,5 +1,4 @@
 import numpy as numpy
-from astropy import units
 import math
 from .import Tools
 from .Tools import setAttribute as setatt
@@ -154,6 +153,7 @@ class HarmonicDynamicModel( HarmonicModel, Dynamic ):
 
     def changeNComp( self, dn ) :
         setatt( self, "order", self.order + dn )
+        self.clearDesign()
 
     def __setattr__( self, name, value ) :
         if self.setDynamicAttribute( name, value ) :
@@ -1,5 +1,4 @@
 import numpy as numpy
-from astropy import units
 import math
 from . import Tools
 from .Tools import setAttribute as setatt
@@ -114,8 +113,10 @@ class HarmonicModel( LinearModel ):
         """
         if name == 'order' :
             setatt( self, name, value, type=int )
+            self.clearDesign()
         elif name == 'period' :
             setatt( self, name, value, type=float )
+            self.clearDesign()
         else :
             super( HarmonicModel, self ).__setattr__( name, value )
 
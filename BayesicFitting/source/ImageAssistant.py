@@ -1,5 +1,4 @@
 import numpy as numpy
-from astropy import units
 import math
 from . import Tools
 
@@ -34,14 +33,19 @@ __status__ = "Development"
 
 class ImageAssistant( object ):
     """
-    ImageAssistant contains 2 methods to assist with more dimensional
+    ImageAssistant contains methods to assist with more dimensional
     fitting.
 
     1. getIndices Generates indices for data arrays of any dimension.
        To be used as input in the Fitter classes.
-    2. resizeData Resizes the data arrays into a 1-dimensional array.
+    2. getPositions Generates the positions of the pixels.
+       getAxes returns them per axis, for models that are separable.
+    3. resizeData Resizes the data arrays into a 1-dimensional array.
        To be used as data in the Fitter.
 
+    The indices and positions are constructed per axis and broadcast into
+    the result, optionally into a memory-mapped file.
+
 
 
 
@@ -89,18 +93,24 @@ class ImageAssistant( object ):
         self.order = order
         self.shape = None
 
-    def getIndices( self, ya, order='C' ):
+    def getIndices( self, ya, order=None, filename=None ):
         """
         Generates indices for data arrays of any dimension.
 
         To be used as input in the Fitter classes.
 
+        The indices are constructed per axis and broadcast into the array,
+        without looping over the pixels.
+
         Parameters
         ----------
         ya : map
             array of y ( data ) values for which an indexed array
-        order : 'C' or 'F'
-            set index view according to character
+        order : None or 'C' or 'F'
+            set index view according to character. None: as in the constructor
+        filename : None or str
+            name of a (.npy) file to hold the indices as a memory-mapped array.
+            For large maps that do not need to be in memory.
 
         Returns
         -------
@@ -109,26 +119,13 @@ class ImageAssistant( object ):
         """
         self.shape = ya.shape
 
-        size = ya.size
-        rank = ya.ndim
+        if ya.ndim == 1:
+            return numpy.arange( ya.size, dtype=int )
 
-        if rank == 1:
-            return numpy.arange( size, dtype=int )
-        else:
-            kdata = numpy.zeros( ( size, rank ), dtype=int )
+        axes = [numpy.arange( n, dtype=int ) for n in self.shape]
+        return self.fillGrid( axes, int, order=order, filename=filename )
 
-            dd = 1
-            kr = rank - 1
-            for k in range( rank ) :
-                for i in range( size ) :
-                    kk = kr if self.order == 'C' else k
-                    kdata[i,kk] = ( i // dd ) % self.shape[kr]
-                dd *= self.shape[kr]
-                kr -= 1
-
-            return kdata
-
-    def getPositions( self, ymap, order='C', center=True, deproject=None ) :
+    def getPositions( self, ymap, order=None, center=True, deproject=None, filename=None ) :
         """
         Return the (x,y) positions of the pixels in the map.
 
@@ -136,8 +133,8 @@ class ImageAssistant( object ):
         ----------
         ya : map
             array of y ( data ) values for which an indexed array
-        order : 'C' or 'F'
-            set index view according to character
+        order : None or 'C' or 'F'
+            set index view according to character. None: as in the constructor
         center : bool
             if True, return the positions of the center of the pixels.
             otherwise the (left,lower) corner
@@ -145,18 +142,94 @@ class ImageAssistant( object ):
             Deprojection method: from projected map to sky position,
             returning (x,y,...) position given the map indices (ix,iy,...)
             Default: returning the indices as floats (+0.5 if center)
+        filename : None or str
+            name of a (.npy) file to hold the positions as a memory-mapped array.
+            Not used with deproject.
 
         Returns
         -------
         numpy.array of floats : the positions of the pixels
         """
-        xdata = numpy.asarray( self.getIndices( ymap, order=order ), dtype=float )
-        if center :
-            xdata += 0.5
+        self.shape = ymap.shape
+        axes = self.getAxes( ymap, order='C', center=center )
+
+        if ymap.ndim == 1 :
+            xdata = axes[0]
+        else :
+            xdata = self.fillGrid( axes, float, order=order,
+                                   filename=None if deproject is not None else filename )
         if deproject is not None :
             xdata = deproject( xdata )
         return xdata
 
+    def getAxes( self, ymap, order=None, center=True ) :
+        """
+        Return the positions of the pixels along each of the axes of the map.
+
+        The positions of getPositions (without deproject) are the grid spanned
+        by these axes. Models that are separable in their inputs, can be
+        calculated on the axes, without the full arrays of positions.
+
+        Parameters
+        ----------
+        ymap : map
+            array of y ( data ) values
+        order : None or 'C' or 'F'
+            order of the axes, as in the columns of getPositions.
+            None: as in the constructor
+        center : bool
+            if True, return the positions of the center of the pixels.
+            otherwise the (left,lower) corner
+
+        Returns
+        -------
+        list of 1-dim numpy.arrays of floats : one per axis
+        """
+        off = 0.5 if center else 0.0
+        axes = [numpy.arange( n, dtype=float ) + off for n in ymap.shape]
+        return axes if self.getOrder( order ) == 'C' else axes[::-1]
+
+    def fillGrid( self, axes, dtype, order=None, filename=None ) :
+        """
+        Return an array of ( size, rank ) with the grid spanned by the axes.
+
+        Column k contains the values of axes[k] (order 'C') or the reverse (order 'F'),
+        repeated over the other axes, such that the rows run over the pixels
+        in C order.
+
+        Parameters
+        ----------
+        axes : list of 1-dim arrays
+            values along each of the axes, in the order of the shape
+        dtype : type
+            of the resulting array
+        order : None or 'C' or 'F'
+            set index view according to character. None: as in the constructor
+        filename : None or str
+            name of a (.npy) file to hold the result as a memory-mapped array.
+
+        """
+        shape = tuple( len( ax ) for ax in axes )
+        rank = len( shape )
+        size = int( numpy.prod( shape ) )
+        if filename is None :
+            kdata = numpy.empty( ( size, rank ), dtype=dtype )
+        else :
+            kdata = numpy.lib.format.open_memmap( filename, mode='w+', dtype=dtype,
+                                                  shape=( size, rank ) )
+
+        kr = ( lambda k : k ) if self.getOrder( order ) == 'C' else ( lambda k : rank - 1 - k )
+        grid = kdata.reshape( shape + ( rank, ) )
+        for k in range( rank ) :
+            bshape = [1] * rank
+            bshape[k] = shape[k]
+            grid[...,kr( k )] = axes[k].reshape( bshape )
+
+        return kdata
+
+    def getOrder( self, order ) :
+        """ Return order, or the one of the constructor when None.  """
+        return self.order if order is None else order
 
     def getydata( self, ya ):
         """
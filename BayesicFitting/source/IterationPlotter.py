@@ -1,9 +1,7 @@
 import time
 import numpy as numpy
-from astropy import units
 import math
 from . import Tools
-import matplotlib.pyplot as pyplot
 
 __author__ = "Do Kester"
 __year__ = 2017
@@ -54,6 +52,7 @@ class IterationPlotter( object ):
         pyplot.title( title )
         pyplot.show( block=False )
         """
+        import matplotlib.pyplot as pyplot
 
         self.p = pyplot.gca()
         self.p.plot( x, y, 'k.' )
@@ -73,6 +72,8 @@ class IterationPlotter( object ):
         pyplot.plot( x, r, 'r-' )
         pyplot.show( block=False )
         """
+        import matplotlib.pyplot as pyplot
+
         self.p.plot( x, r, 'r-' )
         pyplot.show( block=False )
         time.sleep( 1 )
@@ -1,5 +1,4 @@
 import numpy as numpy
-from astropy import units
 import math
 from . import Tools
 from .Tools import setAttribute as setatt
@@ -167,6 +166,74 @@ class KernelModel( NonLinearModel ):
 
         return partial
 
+    def baseEnsembleResult( self, xdata, params ):
+        """
+        Returns the results of the model function for an ensemble of parameters.
+
+        The kernels are evaluated on the flattened (nsets,ndata) arguments.
+
+        Parameters
+        ----------
+        xdata : array_like
+            values at which to calculate the result
+        params : array_like (nsets,npars)
+            values for the parameters, one set per row.
+
+        """
+        amp = params[:,0:1]
+        x = ( xdata - params[:,1:2] ) / params[:,2:3]
+        return amp * self.kernel.result( x.flatten() ).reshape( x.shape )
+
+    def baseEnsemblePartial( self, xdata, params, parlist=None ):
+        """
+        Returns the partials for an ensemble of parameters.
+
+        Parameters
+        ----------
+        xdata : array_like
+            values at which to calculate the result
+        params : array_like (nsets,npars)
+            values for the parameters, one set per row.
+        parlist : array_like
+            list of indices active parameters (or None for all)
+
+        """
+        amp = params[:,0:1]
+        wid = params[:,2:3]
+        x = ( xdata - params[:,1:2] ) / wid
+        dfdx = self.kernel.partial( x.flatten() ).reshape( x.shape )
+
+        parts = { 0 : ( lambda: self.kernel.result( x.flatten() ).reshape( x.shape ) ),
+                  1 : ( lambda: -amp * dfdx / wid ),
+                  2 : ( lambda: -amp * dfdx * x / wid ) }
+
+        if parlist is None :
+            parlist = range( self.npmax )
+
+        partial = numpy.ndarray( x.shape + ( self.npbase, ) )
+        for k,kp in enumerate( parlist ) :
+            partial[:,:,k] = parts[kp]()
+
+        return partial
+
+
+    def baseSupport( self, xdata, params ):
+        """
+        Returns the indices of the xdata where the result can be non-zero.
+        Only bound kernels have a limited support.
+
+        Parameters
+        ----------
+        xdata : array_like
+            values at which to calculate the result
+        params : array_like
+            values for the parameters.
+
+        """
+        if not self.isBound() :
+            return None
+        x = ( xdata - params[1] ) / params[2]
+        return numpy.flatnonzero( numpy.abs( x ) <= self.kernel.range )
 
     def baseDerivative( self, xdata, params ):
         """
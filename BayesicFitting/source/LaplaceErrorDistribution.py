@@ -191,6 +191,31 @@ class LaplaceErrorDistribution( ScaledErrorDistribution ):
             res = res * problem.weights
         return res
 
+    def ensembleLogL( self, problem, allpars ) :
+        """
+        Return the log( likelihood ) for each of an ensemble of parameter sets.
+
+        Parameters
+        ----------
+        problem : Problem
+            to be solved
+        allpars : array_like
+            parameters of the problem, shape ( nsets, npars + 1 )
+
+        Returns
+        -------
+        array of nsets log( likelihood )s
+        """
+        allpars = numpy.atleast_2d( allpars )
+        self.ncalls += len( allpars )
+
+        scale = allpars[:,-1]
+        res = numpy.abs( problem.ensembleResiduals( allpars[:,:-1] ) )
+        if problem.weights is not None :
+            res = res * problem.weights
+        sumres = numpy.sum( res, axis=1 ) / scale
+        return - problem.sumweight * ( self.LOG2 + numpy.log( scale ) ) - sumres
+
     def partialLogL_alt( self, problem, allpars, fitIndex ) :
         """
         Return the partial derivative of log( likelihood ) to the parameters.
@@ -223,6 +248,30 @@ class LaplaceErrorDistribution( ScaledErrorDistribution ):
                 dL[-1] = self.getSumRes( problem, allpars ) / scale - problem.sumweight
         return dL / scale
 
+    def logLdataAndPartial( self, problem, allpars, mockdata=None ) :
+        """
+        Return the log( likelihood ) for each residual and its derivatives
+        to the mock data and to the hyperparameters.
+
+        Parameters
+        ----------
+        problem : Problem
+            to be solved
+        allpars : array_like
+            list of all parameters in the problem
+        mockdata : array_like
+            as calculated by the model
+
+        """
+        scale = allpars[-1]
+        res = problem.residuals( allpars[:-1], mockdata=mockdata )
+
+        wgt = numpy.ones_like( res, dtype=float ) if problem.weights is None else problem.weights
+        ares = numpy.abs( res ) * wgt / scale
+        lld = - ares - ( self.LOG2 + math.log( scale ) ) * wgt
+
+        return ( lld, numpy.copysign( wgt, res ) / scale, [( ares - wgt ) / scale] )
+
     def nextPartialData( self, problem, allpars, fitIndex, mockdata=None ) :
         """
         Return the partial derivative of elements of the log( likelihood )
@@ -1,5 +1,7 @@
 import numpy as numpy
+from collections import OrderedDict
 from .Model import Model
+from .Tools import setAttribute as setatt
 
 __author__ = "Do Kester"
 __year__ = 2017
@@ -43,9 +45,16 @@ class LinearModel( Model ):
     The ``baseResult`` follows from that one.
     It is implemented here.
 
+    As the partials do not depend on the parameters, the design matrix is
+    calculated once for each xdata and kept in a small cache. The xdata are
+    recognized by identity; they should not be changed in place.
+    The cache is cleared when an attribute of the model changes or
+    when a dynamic model grows or shrinks.
+
     Attributes
     ----------
-    None of its own
+    NCACHE : int
+        maximum number of design matrices kept (default 4)
 
     Attributes from Model
     ---------------------
@@ -65,6 +74,8 @@ class LinearModel( Model ):
 
 
     """
+    NCACHE = 4
+
     def __init__( self, nparams, ndim=1, copy=None, **kwargs ):
         """
         class for all linear models.
@@ -81,6 +92,73 @@ class LinearModel( Model ):
         """
         super( LinearModel, self ).__init__( nparams, ndim=ndim, copy=copy, **kwargs )
 
+        ## The copy is equal to the original, so it can inherit its designs.
+        designs = OrderedDict() if copy is None else OrderedDict( copy._designs )
+        setatt( self, "_designs", designs )
+
+    def clearDesign( self ) :
+        """
+        Clear the cache of design matrices.
+
+        To be called when the partials change otherwise than by the parameters.
+        """
+        setatt( self, "_designs", OrderedDict() )
+
+    def design( self, xdata, params ) :
+        """
+        Returns the (cached) design matrix, i.e. the partials to all parameters.
+
+        The matrix is read-only; the least recently used ones are removed
+        from the cache when more than NCACHE are present. A copy of xdata is
+        kept with it, so that xdata changed in place is recognized.
+
+        Parameters
+        ----------
+        xdata : array_like
+            values at which to calculate the partials
+        params : array_like
+            values for the parameters (not in use, except for the number).
+
+        """
+        key = ( id( xdata ), self.npmax )
+        designs = self._designs
+        if key in designs :
+            ( xd, dsgn ) = designs[key]
+            ## O(n) to check against O(n*p) to recalculate
+            if numpy.array_equal( xd, xdata ) :
+                designs.move_to_end( key )
+                return dsgn
+
+        dsgn = self.basePartial( xdata, params, parlist=numpy.arange( self.npmax ) )
+        dsgn.flags.writeable = False
+        designs[key] = ( numpy.array( xdata ), dsgn )
+        if len( designs ) > self.NCACHE :
+            designs.popitem( last=False )
+        return dsgn
+
+    def baseIsLinear( self ):
+        """
+        Return True, unless some parameters are fixed to (nonlinear) models.
+        """
+        return len( self.mlist ) == 0
+
+    def cachedPartial( self, xdata, params, parlist=None ):
+        """
+        Returns the partials from the cached design matrix.
+
+        Parameters
+        ----------
+        xdata : array_like
+            values at which to calculate the partials
+        params : array_like
+            values for the parameters.
+        parlist : array_like
+            list of indices active parameters (or None for all)
+
+        """
+        dsgn = self.design( xdata, params )
+        return dsgn if parlist is None else dsgn[:,parlist]
+
     def baseResult( self, xdata, params ):
         """
         Returns the base result of linear models.
@@ -96,14 +174,68 @@ class LinearModel( Model ):
             values for the parameters.
 
         """
-        parlist = numpy.arange( self.npmax )
-        part = self.basePartial( xdata, params, parlist=parlist  )
+        part = self.design( xdata, params )
+        if numpy.asarray( params ).dtype != object :
+            return numpy.dot( part, params[:self.npmax] )
 
+        ## some parameters are fixed to the result of a model
         res = numpy.zeros( part.shape[0], dtype=float )
-#        print( res.shape, params, part.shape )
-
-        for k in parlist :
+        for k in range( self.npmax ) :
             res += params[k] * part[:,k]
-
         return res
 
+    def baseResultChange( self, xdata, params, oldpars, kpar ):
+        """
+        Returns the change in the result of linear models when one parameter
+        has changed: the difference times the partial of that parameter.
+
+        Parameters
+        ----------
+        xdata : array_like
+            values at which to calculate the result
+        params : array_like
+            new values for the parameters.
+        oldpars : array_like
+            old values for the parameters.
+        kpar : int
+            index of the changed parameter
+
+        """
+        part = self.design( xdata, params )[:,kpar]
+        return ( ( params[kpar] - oldpars[kpar] ) * part, None )
+
+    def baseEnsembleResult( self, xdata, params ):
+        """
+        Returns the base results of linear models for an ensemble of parameters.
+
+        As the partials do not depend on the parameters, they are calculated
+        once, and multiplied by all sets.
+
+        Parameters
+        ----------
+        xdata : array_like
+            values at which to calculate the result
+        params : array_like (nsets,npars)
+            values for the parameters, one set per row.
+
+        """
+        part = self.design( xdata, params[0] )
+        return numpy.dot( params[:,:self.npmax], part.transpose() )
+
+    def baseEnsemblePartial( self, xdata, params, parlist=None ):
+        """
+        Returns the base partials of linear models for an ensemble of parameters.
+
+        Parameters
+        ----------
+        xdata : array_like
+            values at which to calculate the partials
+        params : array_like (nsets,npars)
+            values for the parameters, one set per row.
+        parlist : array_like
+            list of indices active parameters (or None for all)
+
+        """
+        part = self.cachedPartial( xdata, params[0], parlist=parlist )
+        return numpy.repeat( part[numpy.newaxis,:,:], len( params ), axis=0 )
+
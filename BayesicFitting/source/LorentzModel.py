@@ -155,13 +155,13 @@ class LorentzModel( NonLinearModel ):
             list of indices active parameters (or None for all)
 
         """
-        partial = numpy.ndarray( (Tools.length( xdata ), self.npbase ) )
 
         a = params[0]
         s = abs( params[2] )
         s2 = s * s
         x = ( xdata - params[1] )
         e = 1 / ( x * x + s2 )
+        partial = numpy.ndarray( numpy.shape( e ) + ( self.npbase, ) )
 
         parts = { 0 : ( lambda: s2 * e ),
                   1 : ( lambda: a * 2 * s2 * x * e * e ),
@@ -171,11 +171,41 @@ class LorentzModel( NonLinearModel ):
             parlist = range( self.npmax )
 
         for k,kp in enumerate( parlist ) :
-            partial[:,k] = parts[kp]()
+            partial[...,k] = parts[kp]()
 
         return partial
 
 
+    def baseEnsembleResult( self, xdata, params ):
+        """
+        Returns the results of the model function for an ensemble of parameters.
+
+        Parameters
+        ----------
+        xdata : array_like
+            values at which to calculate the result
+        params : array_like (nsets,npars)
+            values for the parameters, one set per row.
+
+        """
+        return self.baseResult( xdata, params.T[:,:,numpy.newaxis] )
+
+    def baseEnsemblePartial( self, xdata, params, parlist=None ):
+        """
+        Returns the partials for an ensemble of parameters.
+
+        Parameters
+        ----------
+        xdata : array_like
+            values at which to calculate the partials
+        params : array_like (nsets,npars)
+            values for the parameters, one set per row.
+        parlist : array_like
+            list of indices active parameters (or None for all)
+
+        """
+        return self.basePartial( xdata, params.T[:,:,numpy.newaxis], parlist=parlist )
+
     def baseDerivative( self, xdata, params ) :
         """
         Return the derivative df/dx at each xdata (=x).
@@ -152,6 +152,65 @@ class MixedErrorDistribution( ErrorDistribution ):
                 self.errdis1.logLdata( problem, p1, mockdata=mockdata ) + math.log( f ),
                 self.errdis2.logLdata( problem, p2, mockdata=mockdata ) + math.log( 1 - f ) )
 
+    def logLdataAndPartial( self, problem, allpars, mockdata=None ) :
+        """
+        Return the log( likelihood ) for each residual and its derivatives
+        to the mock data and to the hyperparameters.
+
+        Returns None when one of the distributions does not provide it.
+
+        Parameters
+        ----------
+        problem : Problem
+            to be solved
+        allpars : array_like
+            list of all parameters in the problem
+        mockdata : array_like
+            as calculated for the problem
+
+        """
+        if mockdata is None :
+            mockdata = problem.result( allpars[:problem.npars] )
+
+        f = allpars[-1]
+        emf = 1 - f
+        n1 = self.errdis1.nphypar
+        n2 = self.errdis2.nphypar
+        p1 = allpars[:-n2-1]
+        p2 = allpars[:-n1-1].copy()
+        p2[-n2:] = allpars[-n2-1:-1]
+
+        data1 = self.errdis1.logLdataAndPartial( problem, p1, mockdata=mockdata )
+        data2 = self.errdis2.logLdataAndPartial( problem, p2, mockdata=mockdata )
+        if data1 is None or data2 is None :
+            return None
+        ( lld1, dLdm1, dLdh1 ) = data1
+        ( lld2, dLdm2, dLdh2 ) = data2
+
+        if f <= 0 :
+            lld = lld2
+        elif f >= 1 :
+            lld = lld1
+        else :
+            lld = numpy.logaddexp( lld1 + math.log( f ), lld2 + math.log( emf ) )
+
+        lhd1 = numpy.exp( lld1 )
+        lhd2 = numpy.exp( lld2 )
+        ff1 = f * lhd1 + emf * lhd2
+
+        # As in nextPartialData: where ff1 is indistinguishable from 0,
+        # the partials are 0 too.
+        fff = numpy.zeros_like( ff1 )
+        q = numpy.where( ff1 > sys.float_info.min )
+        fff[q] = 1.0 / ff1[q]
+
+        w1 = f * lhd1 * fff
+        w2 = emf * lhd2 * fff
+        dLdh = [w1 * dh for dh in dLdh1] + [w2 * dh for dh in dLdh2]
+        dLdh += [( lhd1 - lhd2 ) * fff]
+
+        return ( lld, w1 * dLdm1 + w2 * dLdm2, dLdh )
+
     def nextPartialData( self, problem, allpars, fitIndex, mockdata=None ) :
         """
         Return the partial derivative of log( likelihood ) to the parameters in fitIndex.
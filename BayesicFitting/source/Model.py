@@ -2,7 +2,6 @@ from __future__ import print_function
 
 import numpy as numpy
 import random
-from astropy import units
 import warnings
 
 from .FixedModel import FixedModel
@@ -53,8 +52,9 @@ class Model( FixedModel ):
     i.e. the output of the left-hand process in used as input of the
     right-hand process.
 
-    Methods defined in `BaseModel` as eg. `baseResult()` are recursively called
-    here as result(). They are the ones used in the fitters.
+    Methods defined in `BaseModel` as eg. `baseResult()` are called for each
+    model in the chain, here in result(). They are the ones used in the fitters.
+    The chain is evaluated following a plan (see getPlan), which is made once.
 
     The Model is the place where model-related items are kept, like parameters,
     stdevs.
@@ -163,6 +163,7 @@ class Model( FixedModel ):
 
         setatt( self, "_next", None )
         setatt( self, "_head", self )
+        setatt( self, "_plan", None )
 
         if params is None :
             params = numpy.zeros( nparams, dtype=float )
@@ -174,10 +175,7 @@ class Model( FixedModel ):
         setatt( self, "_npchain", nparams )
         setatt( self, "stdevs", None )
 
-        # xUnit is by default a (list[ndim] of) scalars, unitless
-        xUnit = units.Unit( 1.0 ) if ndim == 1 else [units.Unit( 1.0 )]*ndim
-        setatt( self, "xUnit", xUnit )
-        setatt( self, "yUnit", units.Unit( 1.0 ) )                  # scalar
+        # xUnit and yUnit are by default unitless (see getattr)
         setatt( self, "_operation", self.NOP )
 
         if copy is None : return
@@ -194,8 +192,9 @@ class Model( FixedModel ):
         if copy.stdevs is not None :
             setatt( self, "stdevs", copy.stdevs.copy() )
 
-        setatt( self, "xUnit", copy.xUnit )
-        setatt( self, "yUnit", copy.yUnit )
+        for name in ["xUnit", "yUnit"] :
+            if name in copy.__dict__ :
+                setatt( self, name, copy.__dict__[name] )
 
     def copy( self ):
         """ Return a copy.  """
@@ -221,6 +220,7 @@ class Model( FixedModel ):
             setatt( self, name, value, type=float, islist=True, isnone=True )
 
         elif name in ['xUnit', 'yUnit'] :
+            from astropy import units
             isl = ( name == 'xUnit' and self.ndim == 2 )
             setatt( self, name, value, type=units.core.UnitBase, islist=isl, isnone=True )
 
@@ -239,6 +239,12 @@ class Model( FixedModel ):
         if name == 'npars' or name == 'npchain' :
             return self._head._npchain
 
+        if name in ['xUnit', 'yUnit'] :
+            ## unitless by default; astropy is only imported when units are asked for.
+            from astropy import units
+            unit = units.Unit( 1.0 )
+            return [unit] * self.ndim if name == 'xUnit' and self.ndim > 1 else unit
+
         return super( Model, self ).__getattr__( name )
 
 
@@ -425,6 +431,7 @@ class Model( FixedModel ):
             setatt( last, "_head", self._head )
 
         setatt( self, "_npchain", len( self.parameters ) + len( model.parameters ) )
+        self.resetPlan()
 
         setatt( self, "parameters", self._optAppend( self.parameters, model.parameters ) )
 
@@ -439,6 +446,40 @@ class Model( FixedModel ):
             else : return numpy.append( x, y )
         else : return x
 
+    #  *****PLAN***************************************************************
+    def getPlan( self ):
+        """
+        Return the evaluation plan of the chain, starting at this model.
+
+        The plan is a tuple of ( model, operation, start, stop ), one for each
+        model in the chain, where [start:stop] is the slice of its parameters.
+        It is made on first use and kept until the chain changes, so that
+        the chain can be evaluated in a simple loop.
+
+        """
+        if self._plan is None :
+            plan = []
+            at = 0
+            model = self
+            while model is not None :
+                op = self.NOP if model is self else model._operation
+                plan += [( model, op, at, at + model.npbase )]
+                at += model.npbase
+                model = model._next
+            setatt( self, "_plan", tuple( plan ) )
+        return self._plan
+
+    def resetPlan( self ):
+        """
+        Remove the evaluation plans of all models in the chain.
+
+        To be called when the chain or the number of parameters changes.
+        """
+        model = self._head
+        while model is not None :
+            setatt( model, "_plan", None )
+            model = model._next
+
     #  *****CHECK**************************************************************
     def correctParameters( self, params ):
         """
@@ -450,20 +491,9 @@ class Model( FixedModel ):
             parameters for the model.
 
         """
-        newpar = numpy.asarray( [], dtype=float )
-
-        pp = self._recursiveCorrect( params, newpar )
-        return pp
-
-    def _recursiveCorrect( self, params, newpar ) :
-
-        np = self.npbase
-        newpar = numpy.append( newpar,  super( Model, self ).checkParameter( params[:np] ) )
-        model = self._next
-        if model is None :
-            return newpar
-
-        newpar = model._recursiveCorrect( params[np:], newpar )
+        newpar = numpy.zeros( len( params ), dtype=float )
+        for model, op, lo, hi in self.getPlan() :
+            newpar[lo:hi] = super( Model, model ).checkParameter( params[lo:hi] )
         return newpar
 
     #  *****RESULT**************************************************************
@@ -477,44 +507,122 @@ class Model( FixedModel ):
             input data
         param : array_like
             parameters for the model. Default parameters from the Model
+            When param is 2-dimensional (nsets,npars), the results for all
+            sets are returned as an array of shape (nsets,ndata).
 
         """
         if param is None :
             param = self.parameters
 
-        res = None
         xdata = Tools.toArray( xdata )
-        return self._recursiveResult( xdata, param, res )
+        if numpy.ndim( param ) == 2 :
+            param = numpy.asarray( param, dtype=float )
+            return self._ensembleResult( xdata, param )
 
-    def _recursiveResult( self, xdata, param, res ) :
+        res = None
+        for model, op, lo, hi in self.getPlan() :
+            if op == self.PIP :
+                res = super( Model, model ).result( res, param[lo:hi] )
+            else :
+                res = self.operate( op, res,
+                            super( Model, model ).result( xdata, param[lo:hi] ) )
+        return res
 
-        np = self.npbase
+    def _ensembleResult( self, xdata, param ) :
+        """
+        Workhorse for result of an ensemble of parameter sets.
 
-        if not self._operation == self.PIP :
-            nextres = super( Model, self ).result( xdata, param[:np] )
-        else :
-            nextres = None
-        res = self.operate( res, param[:np], nextres )
-        model = self._next
-        if model is None :
-            return res
+        The operations ADD, SUB, MUL and DIV act on (nsets,ndata) arrays;
+        PIP needs its own input per set, so it loops over the sets.
 
-        res = model._recursiveResult( xdata, param[np:], res )
+        """
+        res = None
+        for model, op, lo, hi in self.getPlan() :
+            pars = param[:,lo:hi]
+            if op == self.PIP :
+                res = numpy.asarray( [super( Model, model ).result( r, p )
+                            for r, p in zip( res, pars )] )
+            else :
+                res = self.operate( op, res,
+                            super( Model, model ).ensembleResult( xdata, pars ) )
         return res
 
-    def operate( self, res, pars, next ):
-        if res is None or self._operation == self.NOP: # first one
-            res = next
-        elif self._operation == self.ADD:                 # NOP & ADD
-            res = numpy.add( res, next )
-        elif self._operation == self.SUB:
-            res = numpy.subtract( res, next )
-        elif self._operation == self.MUL:
-            res = numpy.multiply( res, next )
-        elif self._operation == self.DIV:
-            res = numpy.divide( res, next )
-        elif self._operation == self.PIP:
-            res = super( Model, self ).result( res, pars )
+    def operate( self, op, res, next ):
+        """
+        Return the combination of the result so far with the next result.
+
+        Parameters
+        ----------
+        op : int
+            operation (not PIP)
+        res : array_like or None
+            result of the chain so far
+        next : array_like
+            result of the next model
+
+        """
+        if res is None or op == self.NOP :               # first one
+            return next
+        elif op == self.ADD :
+            return numpy.add( res, next )
+        elif op == self.SUB :
+            return numpy.subtract( res, next )
+        elif op == self.MUL :
+            return numpy.multiply( res, next )
+        elif op == self.DIV :
+            return numpy.divide( res, next )
+        raise ValueError( "Unknown operation: %d" % op )
+
+    def updateResult( self, xdata, result, param, parval ):
+        """
+        Return the result of the model, updated from a previous result.
+
+        The previous result was calculated at param, except for the parameters
+        in parval, which had their old values then.
+        Only the models in the chain that contain a changed parameter are
+        recalculated, provided that they are added (or subtracted) to the rest.
+        Linear models just add the change times the partial; localized models
+        only touch the xdata where they are non-zero. Otherwise the result is
+        calculated in full.
+
+        Parameters
+        ----------
+        xdata : array_like
+            input data
+        result : array_like
+            previous result of the model
+        param : array_like
+            (new) parameters for the model
+        parval : dict of {int : float}
+            index and old value of the changed parameters
+
+        """
+        xdata = Tools.toArray( xdata )
+        par = numpy.array( param, dtype=float )
+        for k, v in parval.items() :
+            par[k] = v
+
+        res = numpy.array( result, dtype=float )
+        plan = self.getPlan()
+        for k in parval :
+            i = 0
+            while plan[i][3] <= k :
+                i += 1
+            model, op, at, hi = plan[i]
+
+            for item in plan[i:] :
+                if item[1] not in [self.NOP, self.ADD, self.SUB] :
+                    return self.result( xdata, param )
+
+            oldval = par[k]
+            par[k] = param[k]
+            change, index = model.resultChange( xdata, par[at:hi], k - at, oldval )
+            if op == self.SUB :
+                change = -change
+            if index is None :
+                res += change
+            else :
+                res[index] += change
 
         return res
 
@@ -533,66 +641,46 @@ class Model( FixedModel ):
             if true, numeric derivatives are used.
 
         """
-        result = None
-        df = numpy.zeros_like( xdata )
         xdata = Tools.toArray( xdata )
-        df = self._recursiveDerivative( xdata, param, result, df,
-                    useNum=useNum )
-        return df
-
-    def _recursiveDerivative( self, xdata, param, result, df, useNum=False ):
-        """
-        Workhorse for derivative.
-
-        Implements the optional concatenation of models via recursion
+        plan = self.getPlan()
+        last = plan[-1][0]
 
-        """
-        np = self.npbase
-        par = param[:np]
-        nextres = None
-
-#        print( self.shortName(), self._operation )
-
-        if self.npmax > 0:            #  the base model has no parameters at all: skip
-            xd = xdata if self._operation is not self.PIP else result
-            if useNum:
-                nextdf = super( Model, self ).numDerivative( xd, par )
-            else:
-                nextdf = super( Model, self ).derivative( xd, par )
-
-        else :
-            nextdf = numpy.zeros_like( xdata, dtype=float )
-
-        if self._operation <= self.ADD :
-            df += nextdf
-
-        elif self._operation == self.SUB :
-            df -= nextdf
-
-        elif self._operation == self.MUL :
-            nextres = super( Model, self ).result( xdata, par )
-            df = df * nextres + nextdf * result
-
-        elif self._operation == self.DIV :
-            nextres = super( Model, self ).result( xdata, par )
-            df = ( df * nextres - nextdf * result ) / ( nextres * nextres )
-
-        elif self._operation == self.PIP :
-            nextres = 'dummy'           ## not needed, but needs something
-            df *= nextdf
-        else :
-            raise ValueError( "Unknown operation: %d" & self.PIP )
+        res = None
+        df = None
+        for model, op, lo, hi in plan :
+            par = param[lo:hi]
+            base = super( Model, model )
+            xd = res if op == self.PIP else xdata
+            if model.npmax == 0 :       #  the base model has no parameters at all
+                nextdf = numpy.zeros_like( xd, dtype=float )
+            elif useNum :
+                nextdf = base.numDerivative( xd, par )
+            else :
+                nextdf = base.derivative( xd, par )
 
-        if self._next is None :
-            return df
-        if nextres is None:
-            nextres = super( Model, self ).result( xdata, par )
-        result = self.operate( result, par, nextres )
-        #  append the dfs of the _next model
+            nextres = None
+            if op in [self.MUL, self.DIV] or ( op != self.PIP and model is not last ) :
+                nextres = base.result( xdata, par )
+
+            if df is None or op == self.NOP :
+                df = nextdf
+            elif op == self.ADD :
+                df = df + nextdf
+            elif op == self.SUB :
+                df = df - nextdf
+            elif op == self.MUL :
+                df = df * nextres + nextdf * res
+            elif op == self.DIV :
+                df = ( df * nextres - nextdf * res ) / ( nextres * nextres )
+            elif op == self.PIP :
+                df = df * nextdf
+
+            if model is last :
+                break
+            res = ( base.result( res, par ) if op == self.PIP else
+                    self.operate( op, res, nextres ) )
 
-        model = self._next
-        return model._recursiveDerivative( xdata, param[np:], result, df,
-                    useNum=useNum )
+        return df
 
     #  *****PARTIAL*************************************************************
     def partial( self, xdata, param, useNum=False ):
@@ -608,73 +696,155 @@ class Model( FixedModel ):
         useNum : bool
             if true, numeric partials are used.
 
+        When param is 2-dimensional (nsets,npars), the partials for all
+        sets are returned as an array of shape (nsets,ndata,npars).
+
         """
-        result = None
-        partial = None
         xdata = Tools.toArray( xdata )
-        partial = self._recursivePartial( xdata, param, 0, result,
-                            partial, useNum=useNum )
+        if numpy.ndim( param ) == 2 :
+            param = numpy.asarray( param, dtype=float )
+            if useNum :
+                return numpy.asarray( [self.partial( xdata, par, useNum=True )
+                            for par in param] )
+            return self._ensemblePartial( xdata, param )
+
+        plan = self.getPlan()
+        if len( plan ) == 1 and self.npbase > 0 :
+            if useNum :
+                return super( Model, self ).numPartial( xdata, param )
+            return super( Model, self ).partial( xdata, param )
+
+        last = plan[-1][0]
+        partial = numpy.zeros( ( Tools.length( xdata ), plan[-1][3] ), dtype=float )
+        res = None
+        for model, op, lo, hi in plan :
+            par = param[lo:hi]
+            base = super( Model, model )
+            xd = res if op == self.PIP else xdata
+            if hi == lo :
+                nextpartial = 0.0
+            elif useNum :
+                nextpartial = base.numPartial( xd, par )
+            else :
+                nextpartial = base.partial( xd, par )
+
+            nextres = None
+            if op == self.SUB :
+                partial[:,lo:hi] = numpy.negative( nextpartial )
+
+            elif op == self.MUL :
+                nextres = base.result( xdata, par )
+                partial[:,:lo] *= nextres[:,numpy.newaxis]
+                partial[:,lo:hi] = nextpartial * res[:,numpy.newaxis]
+
+            elif op == self.DIV :
+                nextres = base.result( xdata, par )
+                partial[:,:lo] /= nextres[:,numpy.newaxis]
+                invres = - res / ( nextres * nextres )
+                partial[:,lo:hi] = nextpartial * invres[:,numpy.newaxis]
+
+            elif op == self.PIP :
+                if useNum :
+                    dfdx = base.numDerivative( res, par )
+                else :
+                    dfdx = base.derivative( res, par )
+                partial[:,:lo] *= dfdx[:,numpy.newaxis]
+                partial[:,lo:hi] = nextpartial
+
+            else :
+                partial[:,lo:hi] = nextpartial
+
+            if model is last :
+                break
+            if op == self.PIP :
+                res = base.result( res, par )
+            else :
+                if nextres is None :
+                    nextres = base.result( xdata, par )
+                res = self.operate( op, res, nextres )
+
         return partial
 
-    def _recursivePartial( self, xdata, param, at, result, partial, useNum=False ):
+    def partialBand( self, xdata, param=None ):
         """
-        Workhorse for partial.
+        Return the partial derivatives in banded form, if the model can provide them.
 
-        Implements the optional concatenation of models via recursion
+        The banded form is a tuple ( values, first ), where row i of values holds
+        the consecutive nonzero partials of datapoint i, starting at parameter
+        index first[i]. The zero partials outside the band are not stored.
 
-        """
-        np = self.npbase
-        par = param[at:at+np]
-        nextres = None
+        Only single models without fixed parameters can provide them;
+        otherwise it returns None.
 
-        if np > 0 :
-            xd = xdata if self._operation is not self.PIP else result
-            if useNum:
-                nextpartial = super( Model, self ).numPartial( xd, par )
-            else:
-                nextpartial = super( Model, self ).partial( xd, par )
+        Parameters
+        ----------
+        xdata : array_like
+            an input vector
+        param : array_like
+            parameters for the model
 
-        else :
-            inlen = Tools.length( xdata )
-            nextpartial = numpy.ndarray( (inlen,0), dtype=float )
+        """
+        if self._next is not None or self.npbase != self.npmax :
+            return None
+        return self.basePartialBand( Tools.toArray( xdata ), param )
 
-        if self._operation == self.SUB :
-            nextpartial = numpy.negative( nextpartial )
+    def _ensemblePartial( self, xdata, param ):
+        """
+        Workhorse for partial of an ensemble of parameter sets.
 
-        elif self._operation == self.MUL :
-            nextres = super( Model, self ).result( xdata, par )
-            partial = numpy.multiply( partial.transpose(), nextres ).transpose()
-            nextpartial = numpy.multiply( nextpartial.transpose(), result ).transpose()
+        Same as partial, with an extra leading axis for the sets.
 
-        elif self._operation == self.DIV :
-            nextres = super( Model, self ).result( xdata, par )
-            partial = numpy.divide( partial.transpose(), nextres ).transpose()
-            invres = - result / ( nextres * nextres )
-            nextpartial = numpy.multiply( nextpartial.transpose(), invres ).transpose()
+        """
+        plan = self.getPlan()
+        last = plan[-1][0]
+        nsets = len( param )
+        partial = numpy.zeros( ( nsets, Tools.length( xdata ), plan[-1][3] ),
+                               dtype=float )
+        res = None
+        for model, op, lo, hi in plan :
+            pars = param[:,lo:hi]
+            base = super( Model, model )
+            nextres = None
 
-        elif self._operation == self.PIP :
-            nextres = 'dummy'       ## not needed, but needs something
+            if op == self.PIP :
+                dfdx = numpy.asarray( [base.derivative( r, p )
+                            for r, p in zip( res, pars )] )
+                partial[:,:,:lo] *= dfdx[:,:,numpy.newaxis]
+                if hi > lo :
+                    partial[:,:,lo:hi] = numpy.asarray( [base.partial( r, p )
+                            for r, p in zip( res, pars )] )
+                if model is last :
+                    break
+                res = numpy.asarray( [base.result( r, p )
+                            for r, p in zip( res, pars )] )
+                continue
+
+            nextpartial = 0.0 if hi == lo else base.ensemblePartial( xdata, pars )
+
+            if op == self.SUB :
+                partial[:,:,lo:hi] = numpy.negative( nextpartial )
+
+            elif op == self.MUL :
+                nextres = base.ensembleResult( xdata, pars )
+                partial[:,:,:lo] *= nextres[:,:,numpy.newaxis]
+                partial[:,:,lo:hi] = nextpartial * res[:,:,numpy.newaxis]
+
+            elif op == self.DIV :
+                nextres = base.ensembleResult( xdata, pars )
+                partial[:,:,:lo] /= nextres[:,:,numpy.newaxis]
+                invres = - res / ( nextres * nextres )
+                partial[:,:,lo:hi] = nextpartial * invres[:,:,numpy.newaxis]
 
-            if useNum :
-                dfdx = super( Model, self ).numDerivative( result, par )
             else :
-                dfdx = super( Model, self ).derivative( result, par )
-            partial = numpy.multiply( partial.transpose(), dfdx ).transpose()
-
-        partial = ( nextpartial if partial is None
-                    else numpy.append( partial, nextpartial, axis=1 ) )
+                partial[:,:,lo:hi] = nextpartial
 
-        model = self._next
-        if model is None:
-            return partial
-        if nextres is None:
-            nextres = super( Model, self ).result( xdata, par )
+            if model is last :
+                break
+            if nextres is None :
+                nextres = base.ensembleResult( xdata, pars )
+            res = self.operate( op, res, nextres )
 
-        result = self.operate( result, param[at:], nextres )
-        #  append the partials of the _next model
-        at += np
-        return model._recursivePartial( xdata, param, at, result, partial,
-                    useNum=useNum )
+        return partial
 
     #  *****TOSTRING***********************************************************
     def __str__( self ):
@@ -1097,6 +1267,29 @@ class Model( FixedModel ):
         """ Return null.  """
         return None
 
+    def isLinear( self ):
+        """
+        Return True when the (compound) model is linear in its parameters.
+
+        That is when all models in the chain are linear, and they are added
+        or subtracted. Dynamic models are not considered linear here, as
+        their number of parameters changes.
+        """
+        if self.isDynamic() :
+            return False
+        for model, op, lo, hi in self.getPlan() :
+            if op not in [self.NOP, self.ADD, self.SUB] or not model.baseIsLinear() :
+                return False
+        return True
+
+    def baseIsLinear( self ):
+        """ Return whether the base model is linear in its parameters: False.  """
+        return False
+
+    def basePartialBand( self, xdata, param ):
+        """ Return the partials in banded form (see partialBand): None, not available.  """
+        return None
+
     #  ***** PYTHON INTERFACES ****************************************************
     def __getitem__( self, i ):
         """
@@ -1381,6 +1574,10 @@ class Brackets( Model ):
 
         return Brackets( self.model.copy(), copy=self )
 
+    def baseIsLinear( self ):
+        """ Return whether the model inside the brackets is linear.  """
+        return self.model.isLinear()
+
 
     #  *****RESULT**************************************************************
     def baseResult( self, xdata, param ):
@@ -1414,6 +1611,37 @@ class Brackets( Model ):
         """
         return self.model.partial( xdata, param )
 
+    #  *****ENSEMBLE************************************************************
+    def baseEnsembleResult( self, xdata, params ):
+        """
+        Returns the results for an ensemble of parameter sets.
+
+        Parameters
+        ----------
+        xdata : array_like
+            values at which to calculate the result
+        params : array_like (nsets,npars)
+            values for the parameters, one set per row.
+
+        """
+        return self.model.result( xdata, params )
+
+    def baseEnsemblePartial( self, xdata, params, parlist=None ):
+        """
+        Returns the partials for an ensemble of parameter sets.
+
+        Parameters
+        ----------
+        xdata : array_like
+            values at which to calculate the partials
+        params : array_like (nsets,npars)
+            values for the parameters, one set per row.
+        parlist : array_like
+            Not in use
+
+        """
+        return self.model.partial( xdata, params )
+
     #  *****DERIVATIVE***********************************************************
     def baseDerivative( self, xdata, param ):
         """
@@ -123,16 +123,19 @@ class MonteCarlo( object ):
         """
         if xdata is None :
             xdata = self.xdata
-        ninp = Tools.length( xdata )
-        sm1 = numpy.zeros( ninp )
-        sm2 = numpy.zeros( ninp )
-
-        for k in range( self.mcycles ) :
-            model = self.randomVariant( xdata )
-            sm1 += model
-            sm2 += numpy.square( model )
-        sm1 /= self.mcycles
-        sm2 /= self.mcycles
+        nfit = self.model.npchain if self.index is None else len( self.index )
+        err = self._random.standard_normal( ( self.mcycles, nfit ) )
+        err = numpy.inner( self._eigenvalues * err, self._eigenvectors )
+        pars = numpy.tile( self.model.parameters, ( self.mcycles, 1 ) )
+        if self.index is None :
+            pars += err
+        else :
+            pars[:,self.index] += err
+
+        ## all variants of the model in one go
+        models = self.model.result( xdata, pars )
+        sm1 = numpy.mean( models, axis=0 )
+        sm2 = numpy.mean( numpy.square( models ), axis=0 )
         return numpy.sqrt( sm2  - sm1 * sm1 )
 
     def randomVariant( self, xdata ):
@@ -1,15 +1,14 @@
 from __future__ import print_function
 
 import numpy as numpy
-from astropy import units
 import math
 from . import Tools
 from .Tools import setAttribute as setatt
 from .Formatter import formatter as fmt
 from . import Plotter
 import sys
+import heapq
 import warnings
-import matplotlib.pyplot as plt
 
 from .Explorer import Explorer
 from .Model import Model
@@ -17,6 +16,7 @@ from .Walker import Walker
 from .WalkerList import WalkerList
 from .Sample import Sample
 from .SampleList import SampleList
+from .StopStart import StopStart
 
 from .Problem import Problem
 from .ClassicProblem import ClassicProblem
@@ -37,6 +37,8 @@ from .ChordEngine import ChordEngine
 from .GibbsEngine import GibbsEngine
 from .GalileanEngine import GalileanEngine
 from .StepEngine import StepEngine
+from .EllipsoidEngine import EllipsoidEngine
+from .EngineScheduler import EngineScheduler
 ## for Dynamic Models import the classes
 from .BirthEngine import BirthEngine
 from .DeathEngine import DeathEngine
@@ -170,8 +172,20 @@ class NestedSampler( object ):
         speed of exploration
     maxsize : None or int
         maximum size of the resulting sample list (None : no limit)
+    threads : bool (False)
+        use threads to explore the discarded walkers
+    processes : int (0)
+        number of processes in the pool to explore the discarded walkers
+    asynchronous : bool (False)
+        keep discard walkers in exploration; replace the worst one as soon as one is done
     end : float (2.0)
         stopping criterion
+    marginalize : None or list of int
+        indices of the linear parameters that are marginalized analytically
+    adaptive : bool (False)
+        select the engines adaptively, according to their performance
+    scheduler : None or EngineScheduler
+        the adaptive engine selection of the last run (see adaptive)
     verbose : int
         level of blabbering
 
@@ -183,7 +197,7 @@ class NestedSampler( object ):
         Engine that move the walkers around within the given constraint: logL > lowLogL
     initialEngine : Engine
         Engine that distributes the walkers over the available space
-    restart : StopStart (TBW)
+    restart : StopStart
         write intermediate results to (optionally) start from.
 
 
@@ -198,7 +212,8 @@ class NestedSampler( object ):
     def __init__( self, xdata=None, model=None, ydata=None, weights=None,
                 problem=None, distribution=None, limits=None, keep=None, ensemble=100,
                 discard=1, seed=80409, rate=1.0, engines=None, maxsize=None,
-                threads=False, verbose=1 ) :
+                threads=False, processes=0, asynchronous=False, restart=None,
+                marginalize=False, adaptive=False, verbose=1 ) :
         """
         Create a new class, providing inputs and model.
 
@@ -284,6 +299,43 @@ class NestedSampler( object ):
             maximum size of the resulting sample list (None : no limit)
         threads : bool (False)
             Use Threads to distribute the diffusion of discarded samples over the available cores.
+        processes : int (0)
+            Use a pool of processes to distribute the diffusion of discarded samples
+            over the available cores. Only useful when discard > 1.
+            0 : no pool is used.
+        asynchronous : bool (False)
+            False : each iteration the discard worst walkers are explored together;
+                    the next iteration waits until all of them are done.
+            True  : steady state. Each iteration only the worst walker is replaced,
+                    while discard walkers are kept in exploration (with threads or
+                    a pool of processes). As soon as one of them is done, the next
+                    worst walker is dispatched.
+                    The worst walker is chosen among the ensemble - k walkers that
+                    are not in exploration, so the prior volume shrinks by
+                    exp( -1 / ( ensemble - k ) ) each iteration.
+                    A walker that is done below the present low likelihood, is
+                    replaced by a copy of another one and explored anew.
+                    Not together with restart.
+        restart : None or str or StopStart
+            None : no checkpoints are written
+            str  : base name of the checkpoint files. A StopStart is made with it.
+            StopStart : to write checkpoints and restart from them.
+        marginalize : bool or list of int
+            False : all parameters are sampled.
+            True  : the linear parameters of a mixed model (see
+                    NonLinearModel.setMixedModel) are marginalized.
+            list  : indices of the parameters to be marginalized. The model
+                    needs to be linear in them.
+            Marginalized parameters are integrated out of the likelihood
+            analytically; the walkers only move the others. In the samples
+            they are drawn from their conditional Gaussian posterior.
+            Only for a ClassicProblem with a GaussErrorDistribution.
+        adaptive : bool (False)
+            False : all engines are executed in random order.
+            True  : the engines are selected with weights according to their
+                    successful moves per second (see EngineScheduler). Engines that
+                    do not pay off are seldom used. The weights are in the report.
+                    As timing is involved, the results are not exactly reproducible.
         verbose : int (1)
             0 : silent
             1 : basic information
@@ -313,12 +365,18 @@ class NestedSampler( object ):
         object.__setattr__( self, "verbose", verbose )
 #        self.verbose = verbose
         self.rate = rate
-        self.restart = None                     ## TBD
+        self.restart = StopStart( restart ) if isinstance( restart, str ) else restart
+        if asynchronous and restart is not None :
+            raise ValueError( "Checkpoints are not available for asynchronous sampling" )
 
         self.minimumIterations = 100
         self.end = 2.0
         self.maxtrials = 5
         self.threads = threads
+        self.processes = processes
+        self.asynchronous = asynchronous
+        self.adaptive = adaptive
+        self.scheduler = None
 
         self.iteration = 0
 
@@ -333,9 +391,10 @@ class NestedSampler( object ):
 #        print( self.distribution.hyperpar[0].getLimits() )
 
         self.setEngines( engines )
+        self.setMarginalize( marginalize )
 
         ## Initialize the sample list
-        self.samples = SampleList( model, 0, ndata=self.problem.ndata )
+        self.samples = SampleList( model, 0, ndata=self.problem.ndata, columnar=True )
 
     def makeFitlist( self, keep=None ) :
         """
@@ -376,6 +435,9 @@ class NestedSampler( object ):
                     fitl += [fitlist[k]]                    # list of pars to be fitted
             fitlist = fitl
 
+        if self.marginalize is not None :                   # integrated out
+            fitlist = [k for k in fitlist if k not in self.marginalize]
+
         return ( fitlist, allpars )
 
 
@@ -409,6 +471,7 @@ class NestedSampler( object ):
 
         for eng in self.engines :
             eng.walkers = self.walkers
+            eng.priorTable = None               ## priors might have changed
 
         self.distribution.ncalls = 0                      #  reset number of calls
 
@@ -441,99 +504,149 @@ class NestedSampler( object ):
             print( "" )
             if self.threads :
                 print( "Using threads." )
+            if self.processes > 0 :
+                print( "Using a pool of %d processes." % self.processes )
+            if self.asynchronous :
+                print( "Exploring %d walkers asynchronously." % self.discard )
 
         if self.verbose > 1 :
             print( "Iteration   logZ        H     LowL     npar    parameters" )
 
 
-        explorer = Explorer( self, threads=self.threads )
-
-        self.logZ = -sys.float_info.max
-        self.info = 0
+        self.scheduler = EngineScheduler( len( self.engines ) ) if self.adaptive else None
+        explorer = Explorer( self, threads=self.threads, processes=self.processes )
+        try :
+            self.logZ = -sys.float_info.max
+            self.info = 0
 
-        logWidth = math.log( 1.0 - math.exp( (-1.0 * self.discard ) / self.ensemble) )
+            ## number of walkers replaced per iteration
+            ndis = 1 if self.asynchronous else self.discard
+            logWidth = math.log( 1.0 - math.exp( (-1.0 * ndis ) / self.ensemble) )
+            ## asynchronous : log of the remaining prior volume
+            logX = 0.0
 
 #        for w in self.walkers :
 #            print( w.id, w.allpars, w.logL )
 
-        if self.optionalRestart() :
-            logWidth -= self.iteration * ( 1.0 * self.discard ) / self.ensemble
+            if self.optionalRestart() :
+                logWidth = self.restart.logWidth
 
-        self.engines[0].calculateUnitRange()
+            ## the covariance of the walkers is only needed by preconditioned engines
+            basis = any( eng.precondition for eng in self.engines )
+            self.engines[0].calculateUnitRange( basis=basis )
 
-        for eng in self.engines :
-            eng.unitRange = self.engines[0].unitRange
-            eng.unitMin   = self.engines[0].unitMin
+            for eng in self.engines :
+                eng.unitRange = self.engines[0].unitRange
+                eng.unitMin   = self.engines[0].unitMin
+                eng.unitBasis = self.engines[0].unitBasis
 #            print( eng, "  ",  eng.unitRange )
 
-        while self.iteration < self.getMaxIter( ):
+            self.worstHeap = None
+            self.lastWorst = []
 
-            #  find worst walker(s) in ensemble
-            worst = self.findWorst()
-            worstLogW = logWidth + self.walkers[worst[-1]].logL
+            ## asynchronous : the walkers in exploration
+            busy = []
 
-            # Keep posterior samples
-            self.storeSamples( worst, worstLogW - math.log( self.discard ) )
+            while self.iteration < self.getMaxIter( ):
 
-            # Update Evidence Z and Information H
-            logZnew = numpy.logaddexp( self.logZ, worstLogW )
+                if self.asynchronous :
+                    ## wait for one of the walkers when all are in exploration
+                    done = [self.collectWalker( explorer, busy )] if len( busy ) >= self.discard else []
+                    self.lastWorst += done
 
-            self.info = ( math.exp( worstLogW - logZnew ) * self.lowLhood +
-                    math.exp( self.logZ - logZnew ) * ( self.info + self.logZ ) - logZnew )
-            if math.isnan( self.info ) :
-                self.info = 0.0
-            self.logZ = logZnew
+                    #  find worst walker among the live ones, not in exploration
+                    worst = self.findWorst( ndis=1, busy=busy )
+                    nlive = self.ensemble - len( busy )
+                    logWidth = logX + math.log( 1.0 - math.exp( -1.0 / nlive ) )
+                else :
+                    #  find worst walker(s) in ensemble
+                    worst = self.findWorst()
+                worstLogW = logWidth + self.walkers[worst[-1]].logL
+
+                # Keep posterior samples
+                self.storeSamples( worst, worstLogW - math.log( ndis ) )
 
-            if self.verbose >= 3 or ( self.verbose >= 1 and
-                                      self.iteration % 100 == 0 ):
-                if self.verbose == 1 :
+                # Update Evidence Z and Information H
+                logZnew = numpy.logaddexp( self.logZ, worstLogW )
+
+                self.info = ( math.exp( worstLogW - logZnew ) * self.lowLhood +
+                        math.exp( self.logZ - logZnew ) * ( self.info + self.logZ ) - logZnew )
+                if math.isnan( self.info ) :
+                    self.info = 0.0
+                self.logZ = logZnew
+
+                if self.verbose >= 3 or ( self.verbose >= 1 and
+                                          self.iteration % 100 == 0 ):
+                    if self.verbose == 1 :
 #                    if self.iteration == 0 or ( self.iteration % 5000 ) > 0 :
-                    if ( self.iteration / 100 ) % 50 == 49 :
-                        nwln = "\n"
+                        if ( self.iteration / 100 ) % 50 == 49 :
+                            nwln = "\n"
+                        else :
+                            nwln = ""
+                        print( ">", end=nwln, flush=True )
                     else :
-                        nwln = ""
-                    print( ">", end=nwln, flush=True )
-                else :
-                    kw = worst[0]
-                    pl = self.walkers[kw].allpars[self.walkers[kw].fitIndex]
-                    np = len( pl )
+                        kw = worst[0]
+                        pl = self.walkers[kw].allpars[self.walkers[kw].fitIndex]
+                        np = len( pl )
 #                   scale = self.getScale( self.walker[kw] )
-                    print( "%8d %8.1f %8.1f %8.1f %6d "%( self.iteration, self.logZ,
-                        self.info, self.lowLhood, np ), fmt( pl ) )
+                        print( "%8d %8.1f %8.1f %8.1f %6d "%( self.iteration, self.logZ,
+                            self.info, self.lowLhood, np ), fmt( pl ) )
 
-                self.plotResult( self.walkers[worst[0]], self.iteration, plot=iterplot )
+                    self.plotResult( self.walkers[worst[0]], self.iteration, plot=iterplot )
 
-            self.samples.weed( self.maxsize )                # remove overflow in samplelist
+                self.samples.weed( self.maxsize )                # remove overflow in samplelist
 
-            self.copyWalker( worst )
+                if self.asynchronous :
+                    ## threads update the best walker while they run: it is no parent then
+                    self.copyWalker( worst, busy=busy + ( [self.ensemble] if self.threads else [] ) )
 
-            # Explore the copied walker(s)
-            explorer.explore( worst, self.lowLhood )
+                    # Explore the copied walker in the background
+                    explorer.dispatch( worst[0], self.lowLhood )
+                    busy += worst
+                    changed = done + worst
 
-            # Shrink the interval
-            logWidth -= ( 1.0 * self.discard ) / self.ensemble
-            self.iteration += 1
+                    # Shrink the prior volume
+                    logX -= 1.0 / nlive
+                else :
+                    self.copyWalker( worst )
 
-            self.optionalSave( )
+                    # Explore the copied walker(s)
+                    explorer.explore( worst, self.lowLhood )
+                    changed = worst
 
-            self.engines[0].calculateUnitRange()
-            for eng in self.engines :
-                eng.unitRange = self.engines[0].unitRange
-                eng.unitMin   = self.engines[0].unitMin
+                    # Shrink the interval
+                    logWidth -= ( 1.0 * ndis ) / self.ensemble
+                self.iteration += 1
+
+                self.optionalSave( logWidth )
+
+                ## only the explored walkers and the best one have changed
+                self.engines[0].calculateUnitRange( changed=changed + [self.ensemble], basis=basis )
+                for eng in self.engines :
+                    eng.unitRange = self.engines[0].unitRange
+                    eng.unitMin   = self.engines[0].unitMin
+                    eng.unitBasis = self.engines[0].unitBasis
 #                    print( eng, "  ",  eng.unitRange )
 
-        else :
-            if self.verbose > 0 :
-                if self.verbose == 1 :
-                    print( "\nIteration   logZ        H     LowL     npar    parameters" )
-                kw = worst[0]
-                pl = self.walkers[kw].allpars[self.walkers[kw].fitIndex]
-                np = len( pl )
-                print( "%8d %8.1f %8.1f %8.1f %6d "%( self.iteration, self.logZ,
-                        self.info, self.lowLhood, np ), fmt( pl ) )
+            else :
+                if self.verbose > 0 :
+                    if self.verbose == 1 :
+                        print( "\nIteration   logZ        H     LowL     npar    parameters" )
+                    kw = worst[0]
+                    pl = self.walkers[kw].allpars[self.walkers[kw].fitIndex]
+                    np = len( pl )
+                    print( "%8d %8.1f %8.1f %8.1f %6d "%( self.iteration, self.logZ,
+                            self.info, self.lowLhood, np ), fmt( pl ) )
 
 
-        # End of Sampling
+            # End of Sampling
+            while len( busy ) > 0 :
+                self.collectWalker( explorer, busy )
+            if self.asynchronous :
+                logWidth = logX + math.log( 1.0 - math.exp( -1.0 / self.ensemble ) )
+        finally :
+            ## also stop the threads or processes when sampling fails
+            explorer.close()
         self.addEnsembleToSamples( logWidth )
 
         # Calculate weighted average and stdevs for the parameters;
@@ -555,7 +668,41 @@ class NestedSampler( object ):
         return self.evidence
 
     def getMaxIter( self ) :
-        return max( self.minimumIterations, self.end * self.ensemble * self.info / self.discard )
+        ndis = 1 if self.asynchronous else self.discard
+        return max( self.minimumIterations, self.end * self.getLiveWalkers() * self.info / ndis )
+
+    def getLiveWalkers( self ) :
+        """
+        Return the number of live walkers, from which the worst ones are chosen.
+
+        In asynchronous mode, discard - 1 walkers are in exploration at that moment.
+        """
+        return self.ensemble - self.discard + 1 if self.asynchronous else self.ensemble
+
+    def collectWalker( self, explorer, busy ) :
+        """
+        Wait until a walker in exploration is done, and return its index.
+
+        A walker that is done below the present low likelihood, is replaced
+        by a copy of another walker and explored anew. So the low likelihood
+        only goes up.
+
+        Parameters
+        ----------
+        explorer : Explorer
+            that explores the walkers
+        busy : list of int
+            walkers in exploration; the returned one is removed.
+        """
+        while True :
+            kw = explorer.collect()
+            busy.remove( kw )
+            if self.walkers[kw].logL >= self.lowLhood :
+                return kw
+
+            self.copyWalker( [kw], busy=busy + ( [self.ensemble] if self.threads else [] ) )
+            explorer.dispatch( kw, self.lowLhood )
+            busy += [kw]
 
 #   det getScale( self, walker ) :
 #       np = walker.model.npchain
@@ -563,55 +710,124 @@ class NestedSampler( object ):
 
 #  ===================================================================================
     def optionalRestart( self ):
-
+        """
+        Restore the sampler from the last checkpoint, when present.
+        Return True when restored.
+        """
         if self.restart is not None and self.restart.wantRestore( ):
-            self.walkers, self.samples = self.restart.restore( self.walkers, self.samples )
-            self.logZ = self.walkers.logZ
-            self.info = self.walkers.info
-            self.iteration = self.walkers.iteration
+            self.restart.restoreState( self )
             return True
         return False
 
-    def optionalSave( self ):
-        if self.restart is not None and self.restart.wantSave( ) and self.iteration % 100 == 0:
-            self.walkers.logZ = self.logZ
-            self.walkers.info = self.info
-            self.walkers.iteration = self.iteration
-            self.restart.save( self.walkers, self.samples )
+    def optionalSave( self, logWidth ):
+        """
+        Write a checkpoint, when it is time to do so.
+
+        Parameters
+        ----------
+        logWidth : float
+            width of the prior shell at this iteration
+        """
+        if self.restart is not None and self.restart.wantSave( self.iteration ):
+            self.restart.saveState( self, logWidth )
 
     def storeSamples( self, worst, worstLogW ):
         for kw in worst :
-            smpl = self.walkers[kw].toSample( worstLogW )
+            smpl = self.toSample( self.walkers[kw], worstLogW )
             self.samples.add( smpl )
 
-    def findWorst( self ):
+    def toSample( self, walker, logW ) :
+        """
+        Return the walker as a Sample.
+
+        Marginalized linear parameters are drawn from their Gaussian
+        posterior, conditional on the other parameters of the walker.
+
+        Parameters
+        ----------
+        walker : Walker
+            to be converted
+        logW : float
+            log of the weight of the sample
+
+        """
+        smpl = walker.toSample( logW )
+        if self.marginalize is None :
+            return smpl
+
+        solution = self.problem.solveLinear( walker.allpars )
+        if solution is None :
+            return smpl
+        ( param, chimin, chol ) = solution
+        scale = walker.allpars[self.problem.npars]
+        dev = self.rng.standard_normal( len( self.marginalize ) )
+        param = param[:self.problem.model.npars].copy()
+        param[self.marginalize] += scale * numpy.linalg.solve( chol.transpose(), dev )
+        smpl.parameters = param
+        return smpl
+
+    def findWorst( self, ndis=None, busy=[] ):
         """
         Find discard bad points in ensemble. In order worse to better.
         lowLhood is the "best" in the bad points.
 
+        The logLs of the walkers are kept in a heap of ( logL, index ).
+        The walkers found in the previous call, have been replaced since;
+        they are pushed anew. Entries that do not match the present logL of
+        the walker are refreshed when they come up. Entries of busy walkers
+        are dropped; they need to be pushed anew (via lastWorst) when done.
+
+        Parameters
+        ----------
+        ndis : None or int
+            number of points to find. None : discard
+        busy : list of int
+            walkers in exploration, to be skipped
+
         """
+        if ndis is None :
+            ndis = self.discard
+
+        heap = self.worstHeap
+        if heap is None :
+            heap = [( self.walkers[i].logL, i ) for i in range( self.ensemble )]
+            heapq.heapify( heap )
+            self.worstHeap = heap
+        else :
+            for i in self.lastWorst :
+                heapq.heappush( heap, ( self.walkers[i].logL, i ) )
+
         worst = []
-        for k in range( self.discard ) :
-            self.lowLhood = sys.float_info.max
-            for i in range( self.ensemble ):
-                if self.walkers[i].logL < self.lowLhood :
-                    if i in worst :
-                        continue
-                    bad = i
-                    self.lowLhood = self.walkers[i].logL
-            worst += [bad]
+        while len( worst ) < ndis :
+            ( logl, i ) = heapq.heappop( heap )
+            if i in worst or i in busy :
+                continue
+            if logl != self.walkers[i].logL :
+                heapq.heappush( heap, ( self.walkers[i].logL, i ) )
+                continue
+            worst += [i]
+
+        self.lowLhood = self.walkers[worst[-1]].logL
+        self.lastWorst = worst
         return worst
 
-    def copyWalker( self, worst ):
+    def copyWalker( self, worst, busy=[] ):
         """
         Kill worst walker( s ) in favour of one of the others
 
+        Parameters
+        ----------
+        worst : list of int
+            walkers to be replaced
+        busy : list of int
+            walkers that cannot be copied
+
         """
-        sworst = sorted( worst )
+        sworst = sorted( worst + busy )
 #        print( worst, sworst )
-        for k in range( self.discard ):
-            kcp = self.rng.randint( 0, self.ensemble + 1 - self.discard )
-            for kk in range( self.discard ):
+        for k in range( len( worst ) ):
+            kcp = self.rng.randint( 0, self.ensemble + 1 - len( sworst ) )
+            for kk in range( len( sworst ) ):
                 if kcp >= sworst[kk] :
                     kcp += 1
             self.walkers.copy( kcp, worst[k] )
@@ -621,20 +837,11 @@ class NestedSampler( object ):
         """
         Add the ensemble walkers to the samples
         """
-        done = [False] * self.ensemble
-
-        for nest in range( self.ensemble ):
-            # skip walkers already done
-            worst = 0
-            while done[worst] : worst += 1
+        logl = numpy.asarray( [self.walkers[i].logL for i in range( self.ensemble )] )
 
-            #  find worst walker in ensemble not yet handled
-            self.lowLhood = self.walkers[worst].logL
-            for i in range( worst+1, self.ensemble ) :
-                logl = self.walkers[i].logL
-                if logl < self.lowLhood and not done[i]:
-                    worst = i
-                    self.lowLhood = logl
+        #  handle the walkers in order of increasing logL
+        for worst in numpy.argsort( logl, kind="stable" ) :
+            self.lowLhood = logl[worst]
 
             worstLogW = logWidth + self.lowLhood
 #            self.walkers[worst].logW = worstLogW
@@ -646,12 +853,10 @@ class NestedSampler( object ):
             self.logZ = logZnew
 
             # Keep posterior sample
-            smpl = self.walkers[worst].toSample( worstLogW )
+            smpl = self.toSample( self.walkers[worst], worstLogW )
             self.samples.add( smpl )
 #            self.samples.add( self.walkers, worst )
 
-            done[worst] = True
-
 
     #  *********INTERNALS***************************************************
     def __setattr__( self, name, value ) :
@@ -671,7 +876,8 @@ class NestedSampler( object ):
         if name == "evidence" :
             return self.logZ / math.log( 10.0 )
         if name == "logZprecision" :
-            return math.sqrt( self.info * self.discard / self.ensemble )
+            ndis = 1 if self.asynchronous else self.discard
+            return math.sqrt( self.info * ndis / self.getLiveWalkers() )
         if name == "precision" :
             return self.logZprecision / math.log( 10.0 )
         if name == "information" :
@@ -695,6 +901,70 @@ class NestedSampler( object ):
 
     #  *********DISTRIBUTIONS***************************************************
 
+    def setMarginalize( self, marginalize ) :
+        """
+        Set the linear parameters to be marginalized.
+
+        Parameters
+        ----------
+        marginalize : bool or list of int
+            False : none
+            True  : the linear parameters of a mixed model
+            list  : indices of the (linear) parameters
+
+        Raises
+        ------
+        ValueError  when marginalization is not possible
+
+        """
+        if marginalize is False or marginalize is None :
+            self.marginalize = None
+            self.problem.linear = None
+            return
+
+        model = self.problem.model
+        if marginalize is True :
+            lin = self.linearIndex( model )
+        else :
+            lin = sorted( marginalize )
+
+        if not isinstance( self.problem, ClassicProblem ) :
+            raise ValueError( "Marginalization only for ClassicProblems" )
+        if not isinstance( self.distribution, GaussErrorDistribution ) :
+            raise ValueError( "Marginalization only for GaussErrorDistribution" )
+        if model.isDynamic() :
+            raise ValueError( "Marginalization not for Dynamic models" )
+        if lin is None or len( lin ) == 0 :
+            raise ValueError( "No linear parameters to marginalize" )
+
+        self.marginalize = lin
+        self.problem.linear = lin
+
+    def linearIndex( self, model ) :
+        """
+        Return the indices of the linear parameters of all (mixed) models
+        in the chain, or None when there are none.
+
+        Parameters
+        ----------
+        model : Model
+            the (compound) model
+
+        Raises
+        ------
+        ValueError  when a mixed model is not added to or subtracted from the chain
+
+        """
+        lin = []
+        for mdl, op, lo, hi in model.getPlan() :
+            index = mdl.getLinearIndex() if hasattr( mdl, "getLinearIndex" ) else None
+            if index is None :
+                continue
+            if op not in [model.NOP, model.ADD, model.SUB] :
+                raise ValueError( "Marginalization only for mixed models that are added or subtracted" )
+            lin += [lo + k for k in index]
+        return lin if len( lin ) > 0 else None
+
     def setProblem( self, name, model=None, xdata=None, ydata=None, weights=None ) :
         """
         Set the problem for this run.
@@ -811,6 +1081,7 @@ class NestedSampler( object ):
         enginedict = {
             "galilean" : GalileanEngine,
             "chord" :    ChordEngine,
+            "ellipsoid" : EllipsoidEngine,
             "birth" : 	 BirthEngine,
             "death" : 	 DeathEngine,
             "gibbs" : 	 GibbsEngine,
@@ -876,6 +1147,7 @@ class NestedSampler( object ):
             # decorate with proper information
             self.initialEngine.members = self.walkers
             self.initialEngine.errdis = self.distribution
+            self.initialEngine.priorTable = None
 
         else :
             try :
@@ -889,8 +1161,7 @@ class NestedSampler( object ):
 
 
         # Calculate logL for all walkers.
-        for walker in self.walkers :
-            self.initialEngine.execute( walker, -math.inf )
+        self.initialEngine.executeEnsemble( self.walkers, -math.inf )
 
         # Find best in ensemble and copy it into the last, extra position.
         lbest = self.walkers[0].logL
@@ -904,6 +1175,7 @@ class NestedSampler( object ):
     def plotData( self, plot=False ):
         if not plot :
             return
+        import matplotlib.pyplot as plt
         plt.figure( 'iterplot' )
         plt.plot( self.problem.xdata, self.problem.ydata, 'k.' )
         plt.show( block=False )
@@ -912,6 +1184,7 @@ class NestedSampler( object ):
         if not plot :
             return
 
+        import matplotlib.pyplot as plt
         plt.figure( 'iterplot' )
         if self.line is not None :
             ax = plt.gca()
@@ -935,11 +1208,13 @@ class NestedSampler( object ):
     def report( self ):
 
 #        print( "Rate        %f" % self.rate )
-        print( "Engines              success     reject     failed       best      calls" )
+        print( "Engines              success     reject     failed       best      calls   accept  trials/move" )
 
         for engine in self.engines :
             print( "%-16.16s " % engine, end="" )
             engine.printReport()
+        if self.scheduler is not None :
+            self.scheduler.printReport( self.engines )
         print( "Calls to LogL     %10d" % self.distribution.ncalls, end="" )
         if self.distribution.nparts > 0 :
             print( "   to dLogL %10d" % self.distribution.nparts )
@@ -101,6 +101,10 @@ class NonLinearModel( Model ):
         """ Returns true when linear indices have been set  """
         return len( self._linear ) > 0
 
+    def getLinearIndex( self ):
+        """ Returns the (sorted) index of the linear parameters, or None.  """
+        return sorted( self._linear ) if self.isMixed() else None
+
     def getNonLinearIndex( self ):
         """ Returns the index of the non-linear parameters.  """
 
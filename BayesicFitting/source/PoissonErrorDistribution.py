@@ -100,6 +100,18 @@ class PoissonErrorDistribution( ErrorDistribution ):
         return self.getGaussianScale( problem, allpars=allpars )
 
     #  *********LIKELIHOODS***************************************************
+    @staticmethod
+    def logFactorialData( problem ) :
+        """
+        Return log( ydata! ). It only depends on the data; it is kept by the problem.
+
+        Parameters
+        ----------
+        problem : Problem
+            to be solved
+        """
+        return logFactorial( problem.ydata )
+
     def logLikelihood_alt( self, problem, allpars ):
         """
         Return the log( likelihood ) for a Poisson distribution.
@@ -118,7 +130,7 @@ class PoissonErrorDistribution( ErrorDistribution ):
         if numpy.any(  mock <= 0.0 ) :
             return -math.inf
 
-        lfdata = logFactorial( problem.ydata )
+        lfdata = problem.getDataTerm( "logFactorial", self.logFactorialData )
 
         logl = numpy.sum( problem.ydata * numpy.log( mock ) - mock - lfdata )
 
@@ -145,7 +157,7 @@ class PoissonErrorDistribution( ErrorDistribution ):
         """
         if mockdata is None :
             mockdata = problem.result( allpars )
-        lfdata = logFactorial( problem.ydata )
+        lfdata = problem.getDataTerm( "logFactorial", self.logFactorialData )
 
         with warnings.catch_warnings():
             warnings.simplefilter( "ignore", category=RuntimeWarning )
@@ -159,6 +171,34 @@ class PoissonErrorDistribution( ErrorDistribution ):
 
         return lld
 
+    def ensembleLogL( self, problem, allpars ) :
+        """
+        Return the log( likelihood ) for each of an ensemble of parameter sets.
+
+        Parameters
+        ----------
+        problem : Problem
+            to be solved
+        allpars : array_like
+            parameters of the problem, shape ( nsets, npars )
+
+        Returns
+        -------
+        array of nsets log( likelihood )s
+        """
+        allpars = numpy.atleast_2d( allpars )
+        self.ncalls += len( allpars )
+
+        mock = problem.ensembleResult( allpars )
+        lfdata = problem.getDataTerm( "logFactorial", self.logFactorialData )
+
+        with warnings.catch_warnings():
+            warnings.simplefilter( "ignore", category=RuntimeWarning )
+            lld = problem.ydata * numpy.log( mock ) - mock - lfdata
+
+        lld = numpy.where( numpy.isfinite( lld ), lld, -math.inf )
+        return numpy.sum( lld, axis=1 )
+
     def partialLogL_alt( self, problem, allpars, fitIndex ):
         """
         Return the partial derivative of log( likelihood ) to the parameters.
@@ -184,6 +224,27 @@ class PoissonErrorDistribution( ErrorDistribution ):
 
         return dL
 
+    def logLdataAndPartial( self, problem, allpars, mockdata=None ) :
+        """
+        Return the log( likelihood ) for each residual and its derivatives
+        to the mock data and to the hyperparameters.
+
+        Parameters
+        ----------
+        problem : Problem
+            to be solved
+        allpars : array_like
+            list of all parameters in the problem
+        mockdata : array_like
+            as calculated by the model
+
+        """
+        if mockdata is None :
+            mockdata = problem.result( allpars )
+        lld = self.logLdata( problem, allpars, mockdata=mockdata )
+
+        return ( lld, problem.ydata / mockdata - 1, [] )
+
     def nextPartialData( self, problem, allpars, fitIndex, mockdata=None ):
         """
         Return the partial derivative of log( likelihood ) to the parameters.
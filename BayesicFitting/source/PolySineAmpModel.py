@@ -116,8 +116,10 @@ class PolySineAmpModel( LinearModel ):
     def __setattr__( self, name, value ) :
         if name == "frequency" :
             setatt( self, name, value, type=float )
+            self.clearDesign()
         elif name == "degree" :
             setatt( self, name, value, type=int )
+            self.clearDesign()
         elif name == "pm" :
             raise AttributeError( "Attribute pm can not be set" )
         else :
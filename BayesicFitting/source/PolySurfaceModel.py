@@ -103,6 +103,7 @@ class PolySurfaceModel( LinearModel ):
         """
         if name == 'degree' :
             setatt( self, name, value, type=int )
+            self.clearDesign()
         else :
             super( PolySurfaceModel, self ).__setattr__( name, value )
 
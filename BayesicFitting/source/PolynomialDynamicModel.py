@@ -1,5 +1,4 @@
 import numpy as numpy
-from astropy import units
 import math
 from . import Tools
 from .Tools import setAttribute as setatt
@@ -156,6 +155,7 @@ class PolynomialDynamicModel( PolynomialModel, Dynamic ):
 
     def changeNComp( self, dn ) :
         setatt( self, "degree", self.degree + dn )
+        self.clearDesign()
 
     def __setattr__( self, name, value ) :
         if self.setDynamicAttribute( name, value ) :
@@ -96,6 +96,7 @@ class PolynomialModel( LinearModel ):
         """
         if name == 'degree' :
             setatt( self, name, value, type=int )
+            self.clearDesign()
         else :
             super( PolynomialModel, self ).__setattr__( name, value )
 
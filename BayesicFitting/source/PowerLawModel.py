@@ -1,5 +1,4 @@
 import numpy as numpy
-from astropy import units
 import math
 from . import Tools
 from .NonLinearModel import NonLinearModel
@@ -123,9 +122,9 @@ class PowerLawModel( NonLinearModel ):
             list of indices active parameters (or None for all)
 
         """
-        partial = numpy.ndarray( ( Tools.length( xdata ), self.npbase ) )
         p0 = params[0]
         xs = xdata - params[1]
+        partial = numpy.ndarray( numpy.shape( xs ) + ( self.npbase, ) )
         p2 = params[2]
 
         parts = { 0 : ( lambda: numpy.power( xs, p2 ) ),
@@ -136,11 +135,41 @@ class PowerLawModel( NonLinearModel ):
             parlist = range( self.npmax )
 
         for k,kp in enumerate( parlist ) :
-            partial[:,k] = parts[kp]()
+            partial[...,k] = parts[kp]()
 
         return partial
 
 
+    def baseEnsembleResult( self, xdata, params ):
+        """
+        Returns the results of the model function for an ensemble of parameters.
+
+        Parameters
+        ----------
+        xdata : array_like
+            values at which to calculate the result
+        params : array_like (nsets,npars)
+            values for the parameters, one set per row.
+
+        """
+        return self.baseResult( xdata, params.T[:,:,numpy.newaxis] )
+
+    def baseEnsemblePartial( self, xdata, params, parlist=None ):
+        """
+        Returns the partials for an ensemble of parameters.
+
+        Parameters
+        ----------
+        xdata : array_like
+            values at which to calculate the partials
+        params : array_like (nsets,npars)
+            values for the parameters, one set per row.
+        parlist : array_like
+            list of indices active parameters (or None for all)
+
+        """
+        return self.basePartial( xdata, params.T[:,:,numpy.newaxis], parlist=parlist )
+
     def baseDerivative( self, xdata, params ):
         """
         Returns the derivative (df/dx) at the input (xdata) value.
@@ -171,6 +200,7 @@ class PowerLawModel( NonLinearModel ):
             parameter number.
 
         """
+        from astropy import units
         if k == 0:
             return self.yUnit
         if k == 1:
@@ -97,6 +97,7 @@ class PowerModel( LinearModel ):
     def __setattr__( self, name, value ) :
         if name == "exponent" :
             setatt( self, name, value, type=float )
+            self.clearDesign()
         else :
             super( PowerModel, self ).__setattr__( name, value )
 
@@ -0,0 +1,303 @@
+import numpy as numpy
+import math
+from scipy import special
+
+from .UniformPrior import UniformPrior
+from .CircularUniformPrior import CircularUniformPrior
+from .JeffreysPrior import JeffreysPrior
+from .ExponentialPrior import ExponentialPrior
+from .LaplacePrior import LaplacePrior
+from .GaussPrior import GaussPrior
+from .CauchyPrior import CauchyPrior
+
+__author__ = "Do Kester"
+__year__ = 2018
+__license__ = "GPL3"
+__version__ = "0.9"
+__maintainer__ = "Do"
+__status__ = "Development"
+
+#  * This file is part of the BayesicFitting package.
+#  *
+#  * BayesicFitting is free software: you can redistribute it and/or modify
+#  * it under the terms of the GNU Lesser General Public License as
+#  * published by the Free Software Foundation, either version 3 of
+#  * the License, or ( at your option ) any later version.
+#  *
+#  * BayesicFitting is distributed in the hope that it will be useful,
+#  * but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  * MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+#  * GNU Lesser General Public License for more details.
+#  *
+#  * The GPL3 license can be found at <http://www.gnu.org/licenses/>.
+#  *
+#  *    2018 Do Kester
+
+class PriorTable( object ):
+    """
+    PriorTable compiles the priors of all parameters into a flat table.
+
+    The conversions between domain and unit values of (a selection of) the
+    parameters are then calculated with a few numpy expressions, instead of
+    one call per parameter.
+    The standard priors (Uniform, CircularUniform, Jeffreys, Exponential,
+    Laplace, Gauss and Cauchy) are converted in closed form. Other priors
+    (and ExponentialPriors with a zeroFraction) are called one by one.
+    A parameter without prior (e.g. a fixed hyperparameter) converts to 0.
+
+    The table is a snapshot: when priors or their limits change,
+    a new table should be made.
+
+    Attributes
+    ----------
+    priors : list of Prior
+        the priors, one for each parameter
+    kind : array of int
+        kind of prior (see the class constants)
+    lowLimit : array of float
+        low limits (Uniform) or log of it (Jeffreys)
+    highLimit : array of float
+        high limits (Uniform)
+    range : array of float
+        range of the limits (Uniform) or of the log limits (Jeffreys)
+    center : array of float
+        center of the prior
+    scale : array of float
+        scale of the prior
+    offset : array of float
+        offset added to the domain values
+    present : list of int
+        the kinds present in the table
+
+    Examples
+    --------
+    >>> priors = [UniformPrior( limits=[-10,10] ), ExponentialPrior( scale=2 )]
+    >>> table = PriorTable( priors )
+    >>> print( table.unit2Domain( [0.25, 0.5] ) )
+    [-5.          1.38629436]
+    >>> print( table.domain2Unit( [[-5.0, 1.0], [5.0, 2.0]] ) )
+    [[0.25       0.39346934]
+     [0.75       0.63212056]]
+
+    Author       Do Kester
+
+    """
+    OTHER = 0
+    NONE = 1
+    UNIFORM = 2
+    CIRCULAR = 3
+    JEFFREYS = 4
+    EXPONENTIAL = 5
+    LAPLACE = 6
+    GAUSS = 7
+    CAUCHY = 8
+
+    def __init__( self, priors, offset=None ):
+        """
+        Constructor.
+
+        Parameters
+        ----------
+        priors : list of (Prior or None)
+            the priors of the parameters
+        offset : None or array_like
+            offsets added to the domain values (None is all zero)
+
+        """
+        np = len( priors )
+        self.priors = list( priors )
+        self.kind = numpy.zeros( np, dtype=int )
+        self.lowLimit = numpy.zeros( np, dtype=float )
+        self.highLimit = numpy.ones( np, dtype=float )
+        self.range = numpy.ones( np, dtype=float )
+        self.center = numpy.zeros( np, dtype=float )
+        self.scale = numpy.ones( np, dtype=float )
+        self.offset = ( numpy.zeros( np, dtype=float ) if offset is None else
+                        numpy.asarray( offset, dtype=float ) )
+
+        for k, prior in enumerate( self.priors ) :
+            self.kind[k] = self.compile( k, prior )
+        self.present = list( numpy.unique( self.kind ) )
+
+    def compile( self, k, prior ) :
+        """
+        Store the attributes of the prior at k; return its kind.
+
+        Parameters
+        ----------
+        k : int
+            index of the parameter
+        prior : Prior or None
+            the prior of the parameter
+
+        """
+        if prior is None :
+            return self.NONE
+
+        cls = type( prior )
+        if cls in [UniformPrior, CircularUniformPrior] :
+            if math.isinf( prior._range ) :
+                return self.OTHER                   ## let it complain
+            self.lowLimit[k] = prior.lowLimit
+            self.highLimit[k] = prior.highLimit
+            self.range[k] = prior._range
+            return self.UNIFORM if cls is UniformPrior else self.CIRCULAR
+
+        if cls is JeffreysPrior :
+            if math.isinf( prior._norm ) :
+                return self.OTHER                   ## let it complain
+            self.lowLimit[k] = prior._logLo
+            self.range[k] = prior._norm
+            return self.JEFFREYS
+
+        if cls is ExponentialPrior :
+            if prior.zeroFraction > 0 or prior._uval != 0 :
+                return self.OTHER                   ## random component
+            self.scale[k] = prior.scale
+            return self.EXPONENTIAL
+
+        if cls in [LaplacePrior, GaussPrior, CauchyPrior] :
+            self.center[k] = prior.center
+            self.scale[k] = prior.scale
+            return ( self.LAPLACE if cls is LaplacePrior else
+                     self.GAUSS if cls is GaussPrior else self.CAUCHY )
+
+        return self.OTHER
+
+    def __len__( self ) :
+        return len( self.priors )
+
+    def unit2Domain( self, uval, kpar=None ) :
+        """
+        Return domain values for the selected parameters.
+
+        Parameters
+        ----------
+        uval : array_like
+            unit values of the selected parameters: shape ( nsel, )
+            or ( nsets, nsel ) for a block of parameter sets
+        kpar : None or array_like of int
+            indices of the selected parameters (negative from the end)
+            None : all
+
+        """
+        uval = numpy.asarray( uval, dtype=float )
+        kpar = self.makeIndex( kpar )
+        kind = self.kind[kpar]
+        col = ( self.lowLimit[kpar], self.range[kpar], self.center[kpar],
+                self.scale[kpar] )
+
+        dval = numpy.zeros( numpy.shape( uval ), dtype=float )
+        with numpy.errstate( divide='ignore', invalid='ignore', over='ignore' ) :
+            for kd in self.present :
+                if len( self.present ) == 1 :
+                    dval = self.kindUnit2Domain( kd, uval, *col ) + dval
+                else :
+                    dval = numpy.where( kind == kd,
+                                        self.kindUnit2Domain( kd, uval, *col ), dval )
+
+        self.others( dval, uval, kind, kpar, "unit2Domain" )
+        return dval + self.offset[kpar]
+
+    def kindUnit2Domain( self, kd, u, low, rng, cen, scl ) :
+        """ Return unit2Domain for all u as if they are of kind kd. """
+        if kd == self.UNIFORM :
+            return u * rng + low
+        if kd == self.CIRCULAR :
+            return ( ( 3 * u ) % 1.0 ) * rng + low
+        if kd == self.JEFFREYS :
+            return numpy.exp( u * rng + low )
+        if kd == self.EXPONENTIAL :
+            return -numpy.log( 1 - u ) * scl
+        if kd == self.LAPLACE :
+            return cen + numpy.where( u > 0.5, -numpy.log( 2 * ( 1 - u ) ),
+                                      numpy.log( 2 * u ) ) * scl
+        if kd == self.GAUSS :
+            return special.erfinv( 2 * u - 1 ) * scl + cen
+        if kd == self.CAUCHY :
+            return numpy.tan( ( u - 0.5 ) * math.pi ) * scl + cen
+        return 0.0
+
+    def domain2Unit( self, dval, kpar=None ) :
+        """
+        Return unit values for the selected parameters.
+
+        Parameters
+        ----------
+        dval : array_like
+            domain values of the selected parameters: shape ( nsel, )
+            or ( nsets, nsel ) for a block of parameter sets
+        kpar : None or array_like of int
+            indices of the selected parameters (negative from the end)
+            None : all
+
+        """
+        kpar = self.makeIndex( kpar )
+        dval = numpy.asarray( dval, dtype=float ) - self.offset[kpar]
+        kind = self.kind[kpar]
+        col = ( self.lowLimit[kpar], self.highLimit[kpar], self.range[kpar],
+                self.center[kpar], self.scale[kpar] )
+
+        uval = numpy.zeros( numpy.shape( dval ), dtype=float )
+        with numpy.errstate( divide='ignore', invalid='ignore', over='ignore' ) :
+            for kd in self.present :
+                if len( self.present ) == 1 :
+                    uval = self.kindDomain2Unit( kd, dval, *col ) + uval
+                else :
+                    uval = numpy.where( kind == kd,
+                                        self.kindDomain2Unit( kd, dval, *col ), uval )
+
+        self.others( uval, dval, kind, kpar, "domain2Unit" )
+        return uval
+
+    def kindDomain2Unit( self, kd, d, low, high, rng, cen, scl ) :
+        """ Return domain2Unit for all d as if they are of kind kd. """
+        if kd == self.UNIFORM or kd == self.CIRCULAR :
+            out = numpy.logical_or( d < low, d > high )
+            uni = numpy.where( out, 0.0, ( d - low ) / rng )
+            return uni if kd == self.UNIFORM else ( uni + 1 ) / 3.0
+        if kd == self.JEFFREYS :
+            return ( numpy.log( d ) - low ) / rng
+        if kd == self.EXPONENTIAL :
+            return 1 - numpy.exp( -d / scl )
+        d = d - cen
+        if kd == self.LAPLACE :
+            lap = 0.5 * numpy.exp( -numpy.abs( d ) / scl )
+            return numpy.where( d < 0, lap, 1 - lap )
+        if kd == self.GAUSS :
+            return 0.5 * ( special.erf( d / scl ) + 1 )
+        if kd == self.CAUCHY :
+            return numpy.arctan( d / scl ) / math.pi + 0.5
+        return 0.0
+
+    def makeIndex( self, kpar ) :
+        """ Return kpar as index array; None is all. """
+        if kpar is None :
+            return numpy.arange( len( self.priors ) )
+        return numpy.asarray( kpar, dtype=int )
+
+    def others( self, out, val, kind, kpar, method ) :
+        """
+        Fill in the values of the priors without closed form, one by one.
+
+        Parameters
+        ----------
+        out : array_like
+            to be filled
+        val : array_like
+            input values (without offset)
+        kind : array of int
+            kinds of the selected parameters
+        kpar : array of int
+            selected parameters
+        method : "unit2Domain" or "domain2Unit"
+            method of the prior to call
+
+        """
+        for i in numpy.flatnonzero( kind == self.OTHER ) :
+            func = getattr( self.priors[kpar[i]], method )
+            if numpy.ndim( out ) == 1 :
+                out[i] = func( val[i] )
+            else :
+                out[:,i] = [func( v ) for v in val[:,i]]
+
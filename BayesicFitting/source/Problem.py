@@ -2,6 +2,7 @@ import numpy as numpy
 import re
 
 from .Tools import setAttribute as setatt
+from .PriorTable import PriorTable
 
 #  * This file is part of the BayesicFitting package.
 #  *
@@ -49,6 +50,9 @@ class Problem( object ):
         weights associated with ydata
     npars : int
         number of parameters in the problem (might include nuisance parameters)
+    linear : None or array_like of int
+        indices of the linear parameters, which are marginalized analytically
+        in the likelihood (see solveLinear). None : none.
     partype : float | int
         type of the parameters
 
@@ -95,6 +99,9 @@ class Problem( object ):
             self.partype = copy.partype
 
         self.npars = self.model.npars
+        self._cache = []
+        self._dataterms = ( None, None, {} ) if copy is None else copy._dataterms
+        self.linear = None if copy is None else copy.linear
 
     def copy( self ):
         """
@@ -114,19 +121,43 @@ class Problem( object ):
             name of the attribute
         """
         if name == 'sumweight' :            # Return the sum over weight vector.
-            if self.hasWeights() :
-                self.sumweight = numpy.sum( self.weights )
-                return self.sumweight
-            else :
-                return self.ndata
-        elif name == 'ndata' :
-            self.ndata = len( self.ydata )        # number of data points/tuples
-            return self.ndata
+            return self.getDataTerm( name, lambda p :
+                        numpy.sum( p.weights ) if p.hasWeights() else p.ndata )
+        elif name == 'ndata' :              # number of data points/tuples
+            return self.getDataTerm( name, lambda p : len( p.ydata ) )
         else :
             raise AttributeError( "Unknown attribute " + name )
 
         return None
 
+    def getDataTerm( self, name, function ) :
+        """
+        Return a term that only depends on the data (ydata and weights).
+
+        The term is calculated as function( problem ) at the first request.
+        It is kept until ydata or weights are replaced by other arrays.
+        When they are changed in place, call clearDataTerms().
+
+        Parameters
+        ----------
+        name : str
+            name of the term
+        function : callable
+            to calculate the term from the problem
+
+        """
+        ( ydata, weights, terms ) = self._dataterms
+        if ydata is not self.ydata or weights is not self.weights :
+            terms = {}
+            self._dataterms = ( self.ydata, self.weights, terms )
+        if name not in terms :
+            terms[name] = function( self )
+        return terms[name]
+
+    def clearDataTerms( self ) :
+        """ Remove all terms kept by getDataTerm. """
+        self._dataterms = ( None, None, {} )
+
     def hasWeights( self ):
         """ Return whether it has weights.  """
         return self.weights is not None
@@ -147,6 +178,65 @@ class Problem( object ):
         """
         pass
 
+    def ensembleResult( self, params ):
+        """
+        Returns the results for an ensemble of parameter sets.
+
+        Here the result is calculated for each set in turn; problems that can do
+        better are invited to overwrite this method.
+
+        Parameters
+        ----------
+        params : array_like
+            values for the parameters, shape ( nsets, npars )
+
+        Returns
+        -------
+        array of shape ( nsets, ndata )
+        """
+        return numpy.asarray( [self.result( par ) for par in params] )
+
+    def updateResult( self, param, parval ):
+        """
+        Returns the result at param, updated from a previous one where the
+        parameters in parval had their old values.
+
+        In this (base)class there is no such update; it returns None.
+
+        Parameters
+        ----------
+        param : array_like
+            (new) values for the parameters.
+        parval : dict of {int : float}
+            index and old value of the changed parameters
+
+        """
+        return None
+
+    def quadraticForm( self ):
+        """
+        Return the weighted sum of squared residuals as a quadratic form
+        in the parameters, if available.
+
+        In this (base)class it is not available; it returns None.
+
+        """
+        return None
+
+    def solveLinear( self, param ):
+        """
+        Return the solution for the linear parameters (see attribute linear),
+        given the other parameters.
+
+        In this (base)class it is not available; it returns None.
+
+        Parameters
+        ----------
+        param : array_like
+            values for the parameters.
+
+        """
+        return None
 
     def residuals( self, param, mockdata=None ) :
         """
@@ -162,6 +252,21 @@ class Problem( object ):
         """
         return self.ydata - ( self.result( param ) if mockdata is None else mockdata )
 
+    def ensembleResiduals( self, params ) :
+        """
+        Returns the residuals for an ensemble of parameter sets.
+
+        Parameters
+        ----------
+        params : array_like
+            values for the parameters, shape ( nsets, npars )
+
+        Returns
+        -------
+        array of shape ( nsets, ndata )
+        """
+        return self.ydata - self.ensembleResult( params )
+
     def weightedResiduals( self, param, mockdata=None, extra=False ) :
         """
         Returns the (weighted) residuals, calculated at the xdata.
@@ -238,6 +343,24 @@ class Problem( object ):
         return self.model.unit2Domain( uval, kpar )
 
 
+    def makePriorTable( self, hyperpar=[] ) :
+        """
+        Return a PriorTable for the parameters of the problem, followed by
+        the hyperparameters.
+
+        Problems that overwrite domain2Unit and unit2Domain, should overwrite
+        this method too.
+
+        Parameters
+        ----------
+        hyperpar : list of HyperParameter
+            hyperparameters of the error distribution
+
+        """
+        priors = [self.model.getPrior( k ) for k in range( self.model.npars )]
+        priors += [hp.prior for hp in hyperpar]
+        return PriorTable( priors )
+
     #  *****TOSTRING***********************************************************
     def __str__( self ):
         """ Returns a string representation of the model.  """
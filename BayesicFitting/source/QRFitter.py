@@ -67,6 +67,10 @@ class QRFitter( BaseFitter ):
     >>>     print( k, param )
     >>>     print( " ", stdev )
 
+    # or all at once, with ys of shape ( nsets, 100 )
+    >>> params = fitter.fitBatch( ys )                          # same QR decomposition
+    >>> stdevs = fitter.getBatchStandardDeviations( )
+
     Category:    Mathematics/Fitting
 
     Attributes
@@ -176,6 +180,73 @@ class QRFitter( BaseFitter ):
 
         return params
 
+    def fitBatch( self, ydata, weights=None, keep=None ):
+        """
+        Return model parameters fitted to a batch of datasets, sharing the xdata.
+
+        When the weights are shared by all datasets, one QR decomposition is
+        used for all datasets; it is kept for later fits as in `fit()`.
+        Otherwise all decompositions are done in one stacked operation.
+
+        The chisq, stdevs and evidence of the datasets are available through
+        batchChisq, getBatchStandardDeviations() and getBatchLogZ().
+
+        Parameters
+        ----------
+        ydata : array_like of shape ( nsets, ndata )
+            the data vectors to be fitted, one per row
+        weights : None or array_like of shape ( ndata, ) or ( nsets, ndata )
+            weights pertaining to the data ( = 1.0 / sigma^2 ), shared by all
+            datasets or one set per dataset
+        keep : dict of {int:float}
+            dictionary of indices (int) to be kept at a fixed value (float)
+            The values will override those at initialization.
+            They are only used in this call of fit.
+
+        Returns
+        -------
+        params : ndarray of shape ( nsets, npchain )
+
+        Raises
+        ------
+            ValueError when ydata or weights contain a NaN
+
+        """
+        fi, ydata, weights = self.batchprolog( ydata, weights=weights, keep=keep )
+        design, ydatacopy, wgts = self.batchDesign( ydata, weights, index=fi )
+
+        if wgts is None or wgts.ndim == 1 :
+            if self.needsNewDecomposition or wgts is not None :
+                wdesign = design if wgts is None else design * numpy.sqrt( wgts )[:,numpy.newaxis]
+                q, r = numpy.linalg.qr( wdesign )
+                self.qrmat = numpy.dot( numpy.linalg.inv( r ), q.transpose() )
+                self.needsNewDecomposition = False
+
+            if wgts is not None :
+                ydatacopy = ydatacopy * numpy.sqrt( wgts )
+            params = numpy.inner( ydatacopy, self.qrmat )
+            # qrmat * qrmat^T is the inverse hessian
+            invhes = numpy.inner( self.qrmat, self.qrmat )
+            invdiag = invhes.diagonal()
+            logdet = -numpy.linalg.slogdet( invhes )[1]
+        else :
+            swgts = numpy.sqrt( wgts )
+            q, r = numpy.linalg.qr( design[numpy.newaxis,:,:] * swgts[:,:,numpy.newaxis] )
+            qty = numpy.einsum( "kni,kn->ki", q, ydatacopy * swgts )
+            params = numpy.linalg.solve( r, qty[:,:,numpy.newaxis] )[:,:,0]
+            rinv = numpy.linalg.inv( r )
+            invdiag = numpy.sum( numpy.square( rinv ), axis=2 )
+            logdet = 2 * numpy.sum( numpy.log( numpy.abs(
+                            numpy.diagonal( r, axis1=1, axis2=2 ) ) ), axis=1 )
+
+        pars = numpy.tile( self.model.parameters, ( len( ydata ), 1 ) )
+        pars[:,fi] = params
+
+        self.batchpostscript( ydata, pars, weights=weights, index=fi,
+                              invdiag=invdiag, logdet=logdet )
+
+        return pars
+
 #  *************************************************************************
     def __str__( self ):
         """ Return the name of the fitter. """
@@ -1,5 +1,4 @@
 import numpy as numpy
-from astropy import units
 import math
 from . import Tools
 from .Tools import setAttribute as setatt
@@ -241,6 +240,7 @@ class RadialVelocityModel( NonLinearModel ) :
             the kth parameter.
 
         """
+        from astropy import units
         if k == 0:
             return units.Unit( units.si.rad ) / self.xUnit
         return self.yUnit
@@ -66,9 +66,14 @@ class Sample( object ):
     allpars : array_like (read only)
         list of parameters, nuisance parameters and hyperparameters
 
+    A Sample can also be a view into a columnar `SampleList`. It then holds
+    nothing itself; all attributes are got from and set into the list.
+
     Author       Do Kester
 
     """
+    FIELDS = ["id", "parent", "model", "logL", "logW", "parameters",
+              "nuisance", "hyper", "fitIndex"]
 
     def __init__( self, id, parent, model, parameters=None, fitIndex=None, copy=None ):
         """
@@ -122,6 +127,9 @@ class Sample( object ):
         Return the value of one of `parameters`, `scale`,
 
         """
+        if "_owner" in self.__dict__ and name in self.FIELDS :
+            return self._owner.getField( self._row, name )
+
         if name == "weight" :
             return math.exp( self.logW )
         elif name == "allpars" :
@@ -142,6 +150,10 @@ class Sample( object ):
         """
         Set attributes.
         """
+        if "_owner" in self.__dict__ :
+            self._owner.setField( self._row, name, value )
+            return
+
         if name == "parameters" :
             object.__setattr__( self, name, value )
             return
@@ -1,6 +1,7 @@
 import numpy as numpy
-from astropy import units
 import math
+import copyreg
+import heapq
 from . import Tools
 from .Sample import Sample
 
@@ -50,6 +51,16 @@ class SampleList( list ):
     A large set of utility functions is provided to extract the information from the
     SampleList.
 
+    For static models the SampleList can be columnar. Then the ids, parents, logL,
+    logW, parameters, nuisance and hyper parameters of all samples are kept in
+    contiguous, growable arrays; model and fitIndex are shared. Indexing or
+    iterating the list produces Samples which are views into these arrays:
+    setting their attributes changes the list. A view refers to a position in
+    the list; after weeding it may point to another sample.
+    Weeding a columnar list takes the lowest weights from a heap and only marks
+    them as removed; the arrays are compacted when they need to grow or when
+    samples are accessed by position.
+
 
     Attributes
     ----------
@@ -93,12 +104,17 @@ class SampleList( list ):
 
     normalized : bool
         True when the weights are normalized to SUM( weights ) = 1
+    columnar : bool (read-only)
+        True when the samples are stored in arrays.
 
 
     Author       Do Kester
 
     """
-    def __init__( self, model, nsamples, parameters=None, fitIndex=None, ndata=1 ):
+    columnar = False
+
+    def __init__( self, model, nsamples, parameters=None, fitIndex=None, ndata=1,
+                  columnar=False ):
         """
         Default Constructor.
 
@@ -114,9 +130,28 @@ class SampleList( list ):
             indicating which parameters need fitting
         ndata : int
             length of the data vector; to be used in stdev calculations
+        columnar : bool
+            store the samples in arrays. Ignored for dynamic models.
 
         """
         super( SampleList, self ).__init__( )
+        self.columnar = columnar and not model.isDynamic()
+        if self.columnar :
+            self._model = model
+            self._fitIndex = ( fitIndex if fitIndex is not None
+                               else numpy.arange( model.npars ) )
+            self._nrows = 0
+            self._ndead = 0
+            self._alive = numpy.zeros( 0, dtype=bool )
+            self._heap = None
+            self._id = numpy.zeros( 0, dtype=int )
+            self._parent = numpy.zeros( 0, dtype=int )
+            self._logL = numpy.zeros( 0, dtype=float )
+            self._logW = numpy.zeros( 0, dtype=float )
+            self._parameters = numpy.zeros( ( 0, model.npars ), dtype=float )
+            self._nuisance = None
+            self._hyper = None
+
         self._count = 0
         self.iteration = 0
         self.logZ = 0.0
@@ -127,6 +162,23 @@ class SampleList( list ):
         self.ndata = ndata
 
     def addSamples( self, model, nSamples, parameters, fitIndex=None ):
+        if self.columnar :
+            if parameters is not None :
+                parameters = parameters[:model.npars]
+            self._grow( nSamples )
+            nr = self._nrows
+            self._id[nr:nr+nSamples] = numpy.arange( self._count, self._count + nSamples )
+            self._parent[nr:nr+nSamples] = -1
+            self._logL[nr:nr+nSamples] = 0.0
+            self._logW[nr:nr+nSamples] = 0.0
+            self._parameters[nr:nr+nSamples] = ( parameters if parameters is not None
+                                                 else model.parameters )
+            self._alive[nr:nr+nSamples] = True
+            self._nrows += nSamples
+            self._heap = None
+            self._count += nSamples
+            return
+
         for i in range( nSamples ) :
             if model.isDynamic() :
                 model = model.copy()
@@ -170,8 +222,7 @@ class SampleList( list ):
         elif name == "medianScale" :
             return self[self.medianIndex].hypars[0]
         elif name == "modusIndex" :
-            we = list( self.getLogWeightEvolution() )
-            self.modusIndex = we.index( max( we ) )
+            self.modusIndex = int( numpy.argmax( self._column( "logW" ) ) )
             return self.modusIndex
         elif name == "modusParameters" :
             return self[self.modusIndex].parameters
@@ -184,6 +235,377 @@ class SampleList( list ):
 
         return None
 
+
+    # ===== COLUMNAR STORAGE ===================================================
+    def __len__( self ) :
+        if not self.columnar :
+            return super( SampleList, self ).__len__( )
+        return self._nrows - self._ndead
+
+    def __iter__( self ) :
+        if not self.columnar :
+            return super( SampleList, self ).__iter__( )
+        self._compact( )
+        return ( self._view( k ) for k in range( self._nrows ) )
+
+    def __getitem__( self, k ) :
+        if not self.columnar :
+            return super( SampleList, self ).__getitem__( k )
+        self._compact( )
+        if isinstance( k, slice ) :
+            return [self._view( i ) for i in range( *k.indices( self._nrows ) )]
+        return self._view( self._index( k ) )
+
+    def __setitem__( self, k, sample ) :
+        if not self.columnar :
+            return super( SampleList, self ).__setitem__( k, sample )
+        self._compact( )
+        self._setRow( self._index( k ), sample )
+
+    def __delitem__( self, k ) :
+        if not self.columnar :
+            return super( SampleList, self ).__delitem__( k )
+        self._compact( )
+        alive = self._alive[:self._nrows]
+        ndead = numpy.sum( alive )
+        alive[k if isinstance( k, slice ) else self._index( k )] = False
+        self._ndead = int( ndead - numpy.sum( alive ) )
+        self._compact( )
+
+    def __reduce_ex__( self, protocol ) :
+        if not self.columnar :
+            return super( SampleList, self ).__reduce_ex__( protocol )
+        ## the arrays are all there is; no list items to store.
+        return ( copyreg.__newobj__, ( self.__class__, ), self.__dict__ )
+
+    def append( self, sample ) :
+        """
+        Append a copy of the sample to the list.
+
+        Parameters
+        ----------
+        sample : Sample
+            the sample to be appended
+        """
+        if not self.columnar :
+            return super( SampleList, self ).append( sample )
+        self._grow( 1 )
+        self._setRow( self._nrows, sample )
+        self._alive[self._nrows] = True
+        if self._heap is not None :
+            heapq.heappush( self._heap, ( self._logW[self._nrows], self._nrows ) )
+        self._nrows += 1
+
+    def extend( self, samples ) :
+        """
+        Append copies of the samples to the list.
+
+        Parameters
+        ----------
+        samples : iterable of Sample
+            the samples to be appended
+        """
+        if not self.columnar :
+            return super( SampleList, self ).extend( samples )
+        for sample in list( samples ) :
+            self.append( sample )
+
+    def __iadd__( self, samples ) :
+        self.extend( samples )
+        return self
+
+    def insert( self, k, sample ) :
+        """
+        Insert a copy of the sample before position k.
+
+        Parameters
+        ----------
+        k : int
+            position in the list
+        sample : Sample
+            the sample to be inserted
+        """
+        if not self.columnar :
+            return super( SampleList, self ).insert( k, sample )
+        self._compact( )
+        k = min( max( k + self._nrows if k < 0 else k, 0 ), self._nrows )
+        self._grow( 1 )
+        for col in self._columns( ) + [self._alive] :
+            col[k+1:self._nrows+1] = col[k:self._nrows].copy()
+        self._nrows += 1
+        self._alive[k] = True
+        self._setRow( k, sample )
+        self._heap = None
+
+    def pop( self, k=-1 ) :
+        """
+        Remove the sample at position k from the list and return it.
+
+        For columnar lists the returned Sample is a copy, not a view.
+
+        Parameters
+        ----------
+        k : int
+            position in the list
+        """
+        if not self.columnar :
+            return super( SampleList, self ).pop( k )
+        if len( self ) == 0 :
+            raise IndexError( "pop from empty list" )
+        sample = self[k].copy()
+        del self[k]
+        return sample
+
+    def clear( self ) :
+        """ Remove all samples from the list. """
+        if not self.columnar :
+            return super( SampleList, self ).clear( )
+        self._alive[:] = False
+        self._nrows = 0
+        self._ndead = 0
+        self._heap = None
+
+    def __contains__( self, sample ) :
+        if not self.columnar :
+            return super( SampleList, self ).__contains__( sample )
+        return len( self._find( sample ) ) > 0
+
+    def index( self, sample, start=0, stop=None ) :
+        """
+        Return the position of the sample in the list.
+
+        In columnar lists the samples are identified by their id.
+
+        Parameters
+        ----------
+        sample : Sample
+            to be found
+        start, stop : int
+            only look in this range of positions
+
+        Raises
+        ------
+        ValueError when the sample is not in the list
+        """
+        if not self.columnar :
+            if stop is None :
+                return super( SampleList, self ).index( sample, start )
+            return super( SampleList, self ).index( sample, start, stop )
+        rows = self._find( sample )
+        rng = range( *slice( start, stop ).indices( self._nrows ) )
+        for k in rows :
+            if k in rng :
+                return int( k )
+        raise ValueError( "Sample %s is not in list" % str( getattr( sample, "id", sample ) ) )
+
+    def count( self, sample ) :
+        """ Return the number of occurrences of the sample in the list. """
+        if not self.columnar :
+            return super( SampleList, self ).count( sample )
+        return len( self._find( sample ) )
+
+    def remove( self, sample ) :
+        """
+        Remove the (first occurrence of the) sample from the list.
+
+        Raises
+        ------
+        ValueError when the sample is not in the list
+        """
+        if not self.columnar :
+            return super( SampleList, self ).remove( sample )
+        del self[self.index( sample )]
+
+    def reverse( self ) :
+        """ Reverse the order of the samples in place. """
+        if not self.columnar :
+            return super( SampleList, self ).reverse( )
+        self._reorder( numpy.arange( len( self ) )[::-1] )
+
+    def sort( self, key=None, reverse=False ) :
+        """
+        Sort the samples in place.
+
+        Parameters
+        ----------
+        key : None or callable
+            function of a Sample to sort on. None : sort on logL
+        reverse : bool
+            sort in descending order
+        """
+        if not self.columnar :
+            if key is None :
+                key = lambda sample : sample.logL
+            return super( SampleList, self ).sort( key=key, reverse=reverse )
+        if key is None :
+            order = numpy.argsort( self._column( "logL" ), kind="stable" )
+            if reverse :
+                order = order[::-1]
+        else :
+            order = sorted( range( len( self ) ), key=lambda k : key( self._view( k ) ),
+                            reverse=reverse )
+        self._reorder( numpy.asarray( order, dtype=int ) )
+
+    def __reversed__( self ) :
+        if not self.columnar :
+            return super( SampleList, self ).__reversed__( )
+        self._compact( )
+        return ( self._view( k ) for k in range( self._nrows - 1, -1, -1 ) )
+
+    def getField( self, k, name ) :
+        """
+        Return the named attribute of the k-th sample of a columnar list.
+
+        Parameters
+        ----------
+        k : int
+            index of the sample
+        name : str
+            name of the attribute
+        """
+        if name == "id" or name == "parent" :
+            return int( getattr( self, "_" + name )[k] )
+        elif name == "logL" or name == "logW" :
+            return float( getattr( self, "_" + name )[k] )
+        elif name == "parameters" :
+            return self._parameters[k]
+        elif name == "nuisance" or name == "hyper" :
+            col = getattr( self, "_" + name )
+            if col is None :
+                raise AttributeError( "Unknown attribute " + name )
+            return col[k]
+        elif name == "model" :
+            return self._model
+        elif name == "fitIndex" :
+            return self._fitIndex
+        else :
+            raise AttributeError( "Unknown attribute " + name )
+
+    def setField( self, k, name, value ) :
+        """
+        Set the named attribute of the k-th sample of a columnar list.
+
+        Model and fitIndex are shared by all samples.
+
+        Parameters
+        ----------
+        k : int
+            index of the sample
+        name : str
+            name of the attribute
+        value : any
+            value of the attribute
+        """
+        if name in ["id", "parent", "logL", "logW", "parameters"] :
+            getattr( self, "_" + name )[k] = value
+            if name == "logW" and k < self._nrows :
+                self._heap = None
+        elif name == "nuisance" or name == "hyper" :
+            value = numpy.atleast_1d( value )
+            if getattr( self, "_" + name ) is None :
+                col = numpy.zeros( ( len( self._logL ), len( value ) ), dtype=float )
+                setattr( self, "_" + name, col )
+            getattr( self, "_" + name )[k] = value
+        elif name == "model" :
+            self._model = value
+        elif name == "fitIndex" :
+            self._fitIndex = value
+        else :
+            raise AttributeError( "Object has no attribute " + name )
+
+    def _index( self, k ) :
+        kk = k + self._nrows if k < 0 else k
+        if kk < 0 or kk >= self._nrows :
+            raise IndexError( "SampleList index out of range: %d" % k )
+        return kk
+
+    def _view( self, k ) :
+        ## a Sample without contents of its own; all attributes are in the list.
+        view = Sample.__new__( Sample )
+        object.__setattr__( view, "_owner", self )
+        object.__setattr__( view, "_row", k )
+        return view
+
+    def _setRow( self, k, sample ) :
+        for name in ["id", "parent", "logL", "logW", "parameters"] :
+            self.setField( k, name, getattr( sample, name ) )
+        for name in ["nuisance", "hyper"] :
+            if hasattr( sample, name ) :
+                self.setField( k, name, getattr( sample, name ) )
+
+    def _find( self, sample ) :
+        ## positions of the samples with the same id as sample
+        if not isinstance( sample, Sample ) :
+            return []
+        self._compact( )
+        return numpy.flatnonzero( self._id[:self._nrows] == sample.id )
+
+    def _reorder( self, order ) :
+        ## put the samples in the order given by the positions in order
+        self._compact( )
+        for col in self._columns( ) :
+            col[:self._nrows] = col[:self._nrows][order]
+        self._heap = None
+
+    def _columns( self ) :
+        cols = [self._id, self._parent, self._logL, self._logW, self._parameters,
+                self._nuisance, self._hyper]
+        return [c for c in cols if c is not None]
+
+    def _compact( self ) :
+        """
+        Remove the samples marked as weeded from the arrays.
+        """
+        if self._ndead == 0 :
+            return
+        keep = self._alive[:self._nrows]
+        nkeep = self._nrows - self._ndead
+        for col in self._columns( ) :
+            col[:nkeep] = col[:self._nrows][keep]
+        self._alive[:nkeep] = True
+        self._alive[nkeep:self._nrows] = False
+        self._nrows = nkeep
+        self._ndead = 0
+        self._heap = None
+
+    def _grow( self, n ) :
+        """
+        Make room for n more samples.
+
+        Weeded samples are removed first; when that leaves less than half of
+        the arrays free, the capacity is doubled.
+        """
+        need = self._nrows + n
+        size = len( self._logL )
+        if need <= size :
+            return
+        self._compact( )
+        need = self._nrows + n
+        if 2 * need <= size :
+            return
+        size = max( 2 * need, 64 )
+        for name in ["_id", "_parent", "_logL", "_logW", "_parameters",
+                     "_nuisance", "_hyper", "_alive"] :
+            col = getattr( self, name )
+            if col is None :
+                continue
+            new = numpy.zeros( ( size, ) + col.shape[1:], dtype=col.dtype )
+            new[:self._nrows] = col[:self._nrows]
+            setattr( self, name, new )
+
+    def _column( self, name ) :
+        """
+        Return the named attribute of all samples as an array.
+        For columnar lists it is a view on the storage.
+        """
+        if self.columnar :
+            self._compact( )
+            col = getattr( self, "_" + name )
+            if col is None :
+                raise AttributeError( "Unknown attribute " + name )
+            return col[:self._nrows]
+        return numpy.asarray( [getattr( sample, name ) for sample in self] )
+
     # ===========================================================================
     def sample( self, k, sample=None ) :
         """
@@ -216,6 +638,11 @@ class SampleList( list ):
 
         lswt = math.log( numpy.sum( numpy.exp( lwev ) ) )
 
+        if self.columnar :
+            self._logW[:self._nrows] -= ( lmax + lswt )
+            self._heap = None
+            return
+
         for sample in self :
             sample.logW -= ( lmax + lswt )
 
@@ -262,24 +689,107 @@ class SampleList( list ):
         Weed superfluous samples.
 
         If MaxSamples has been set, it is checked whether the size of the
-        SampleList exceeds the maximum. If so the Sample with the smallest
-        log( Weight ) is removed.
-        weed( ) is called recursively until the size has the required length.
+        SampleList exceeds the maximum. If so the Samples with the smallest
+        log( Weight ) are removed, all in one go, until the size has the
+        required length.
+
+        For columnar lists the samples are taken from a min-heap on logW,
+        which is kept up to date when samples are added.
 
         """
-        if maxsize is None or len( self ) <= maxsize :
+        nexcess = 0 if maxsize is None else len( self ) - maxsize
+        if nexcess <= 0 :
             return
 
-        minw = self[0].logW
-        mink = 0
-        for k in range( len( self ) ) :
-            if self[k].logW < minw :
-                mink = k
-                minw = self[k].logW
-        self.remove( self[mink] )
+        if not self.columnar :
+            lgw = self._column( "logW" )
+            weeds = numpy.argsort( lgw, kind="stable" )[:nexcess]
+            for k in sorted( weeds, reverse=True ) :
+                super( SampleList, self ).__delitem__( k )
+            return
+
+        if self._heap is None :
+            rows = numpy.flatnonzero( self._alive[:self._nrows] )
+            self._heap = list( zip( self._logW[rows], rows ) )
+            heapq.heapify( self._heap )
+
+        for k in range( nexcess ) :
+            lw, row = heapq.heappop( self._heap )
+            self._alive[row] = False
+        self._ndead += nexcess
+
+    def getIds( self ) :
+        """
+        Return the ids of all samples as an array.
+        """
+        return numpy.asarray( self._column( "id" ), dtype=int ).copy()
+
+    def getSegment( self, first ) :
+        """
+        Return the samples with an id of at least first.
+
+        As samples are only added at the end, it is the tail of the list.
+        For columnar lists it is a dict of arrays; otherwise a list of Samples.
+
+        Parameters
+        ----------
+        first : int
+            the lowest id to return
+        """
+        ids = self._column( "id" )
+        k = int( numpy.searchsorted( ids, first ) )
+        if not self.columnar :
+            return list( self[k:] )
 
-        #  continue until size <= max
-        self.weed( maxsize )
+        return {name : getattr( self, "_" + name )[k:self._nrows].copy()
+                for name in ["id", "parent", "logL", "logW", "parameters",
+                             "nuisance", "hyper"]
+                if getattr( self, "_" + name ) is not None}
+
+    def addSegment( self, segment ) :
+        """
+        Append the samples as returned by getSegment, keeping their ids.
+
+        Parameters
+        ----------
+        segment : dict of arrays or list of Sample
+            the samples to be appended
+        """
+        if not self.columnar :
+            for sample in segment :
+                self.append( sample )
+            return
+
+        n = len( segment["id"] )
+        self._grow( n )
+        rows = slice( self._nrows, self._nrows + n )
+        for name, col in segment.items() :
+            if getattr( self, "_" + name ) is None :
+                self.setField( self._nrows, name, col[0] )
+            getattr( self, "_" + name )[rows] = col
+        self._alive[rows] = True
+        self._heap = None
+        self._nrows += n
+        self.normalized = False
+
+    def retain( self, ids ) :
+        """
+        Keep only the samples with an id in ids.
+
+        Parameters
+        ----------
+        ids : array_like
+            ids of the samples to keep
+        """
+        keep = numpy.isin( self._column( "id" ), ids )
+        if not self.columnar :
+            for k in numpy.flatnonzero( ~keep )[::-1] :
+                super( SampleList, self ).__delitem__( k )
+            return
+
+        self._alive[:self._nrows] = keep
+        self._ndead = self._nrows - int( numpy.sum( keep ) )
+        self._compact( )
 
     def logPlus( self, x, y ):
         return numpy.logaddexp( x, y )
@@ -330,18 +840,8 @@ class SampleList( list ):
         """
         Return the super parameters
         """
-        nhp = len( self[0].hyper )
-
-        hypar = numpy.zeros( nhp, dtype=float )
-        hydev = numpy.zeros( nhp, dtype=float )
-        sw = 0.0
-        for sample in self :
-            wt = math.exp( sample.logW )
-            sw += wt
-            ws = wt * sample.hyper
-            hypar = hypar + ws
-            hydev = hydev + ws * sample.hyper
-        self.stdevHypars = numpy.sqrt( hydev - hypar * hypar )
+        ( hypar, hydev ) = self.averstd( "hyper" )
+        self.stdevHypars = hydev
         self.hypars = hypar
         return self.hypars
 
@@ -359,33 +859,19 @@ class SampleList( list ):
         name : str
             name of an attribute from Sample
         """
-        np = len( getattr( self[0], name ) )
+        vals = self._column( name )
+        wgts = numpy.exp( self._column( "logW" ) )
 
-        aver = numpy.zeros( np, dtype=float )
-        stdv = numpy.zeros( np, dtype=float )
-        sw = 0.0
-        for sample in self :
-            wt = math.exp( sample.logW )
-            sw += wt
-            ss = getattr( sample, name )
-            ws = wt * ss
-            aver = aver + ws
-            stdv = stdv + ws * ss
+        aver = numpy.dot( wgts, vals )
+        stdv = numpy.dot( wgts, vals * vals )
         stdv = numpy.sqrt( stdv - aver * aver )
 
         return ( aver, stdv )
 
     # ===== MEDIAN ===========================================================
     def getMedianIndex( self ) :
-        sum = 0.0
-        k = 0
-        for sample in self :
-            sum += math.exp( sample.logW )
-            if sum < 0.5 :
-                k += 1
-            else :
-                break
-        self.medianIndex = k
+        cumw = numpy.cumsum( numpy.exp( self._column( "logW" ) ) )
+        self.medianIndex = int( numpy.searchsorted( cumw, 0.5 ) )
         return self.medianIndex
 
      # ===== EVOLUTIONS ========================================================
@@ -412,28 +898,26 @@ class SampleList( list ):
             the parameter to be selected. Default: all
 
         """
-        pe = []
-        for sample in self :
-            pe += [sample.parameters]
+        pe = numpy.array( self._column( "parameters" ) )
         if kpar is None :
-            return numpy.asarray( pe )
+            return pe
         else :
-            return numpy.asarray( pe )[:,kpar]
+            return pe[:,kpar]
 
     def getNumberOfParametersEvolution( self ):
         """ Return the evolution of the number of parameters.  """
+        if self.columnar :
+            return numpy.full( self._nrows, self._model.npchain, dtype=int )
         pe = [sample.model.npchain for sample in self]
         return numpy.asarray( pe )
 
     def getScaleEvolution( self ):
         """ Return the evolution of the scale.  """
-        pe = [sample.hypars for sample in self]
-        return numpy.asarray( pe )
+        return numpy.array( self._column( "hyper" ) )
 
     def getLogLikelihoodEvolution( self ):
         """ Return the evolution of the log( Likelihood ).  """
-        pe = [sample.logL for sample in self]
-        return numpy.asarray( pe )
+        return numpy.array( self._column( "logL" ) )
 
     def getLogWeightEvolution( self ):
         """
@@ -443,8 +927,7 @@ class SampleList( list ):
         @see #getWeightEvolution( ).
 
         """
-        pe = [sample.logW for sample in self]
-        return numpy.asarray( pe )
+        return numpy.array( self._column( "logW" ) )
 
     def getWeightEvolution( self ):
         """
@@ -457,31 +940,19 @@ class SampleList( list ):
 
     def getParentEvolution( self ):
         """ Return the evolution of the parentage.  """
-        pe = []
-        for sample in self :
-            pe += [sample.parent]
-        return numpy.asarray( pe )
+        return numpy.array( self._column( "parent" ) )
 
     def getGeneration( self ):
         """ Return the generation number pertaining to the evolution.  """
-        pe = []
-        for sample in self :
-            pe += [sample.id]
-        return numpy.asarray( pe )
+        return numpy.array( self._column( "id" ) )
 
     def getLowLogL( self ):
         """
         Return the lowest value of logL in the samplelist, plus its index.
         """
-        low = self[0].logL
-        klo = 0
-        k = 0
-        for sample in self :
-            if sample.logL < low :
-                klo = k
-                low = sample.logL
-            k += 1
-        return ( low, klo )
+        logl = self._column( "logL" )
+        klo = int( numpy.argmin( logl ) )
+        return ( logl[klo], klo )
 
 
     # ===== AVERAGE RESULTS ===================================================
@@ -495,6 +966,16 @@ class SampleList( list ):
             the input
 
         """
+        if not self[0].model.isDynamic( ) :
+            ## all samples share the model: evaluate them in one go.
+            yfit = self[0].model.result( xdata, self.getParameterEvolution() )
+            yw = yfit * self.getWeightEvolution()[:,numpy.newaxis]
+            result = numpy.sum( yw, axis=0 )
+            error = numpy.sum( yw * yfit, axis=0 )
+            self.error = numpy.sqrt( error - result * result )
+            self.result = result
+            return self.result
+
         result = numpy.zeros_like( xdata, dtype=float )
         error = numpy.zeros_like( xdata, dtype=float )
         sumwgt = 0
@@ -1,5 +1,4 @@
 import numpy as numpy
-from astropy import units
 import math
 from . import Tools
 from .Tools import setAttribute as setatt
@@ -105,6 +104,7 @@ class SineAmpModel( LinearModel ):
     def __setattr__( self, name, value ) :
         if name == 'frequency' :
             setatt( self, name, value, type=float )
+            self.clearDesign()
         else :
             super( SineAmpModel, self ).__setattr__( name, value )
 
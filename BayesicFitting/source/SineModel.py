@@ -1,5 +1,4 @@
 import numpy as numpy
-from astropy import units
 import math
 from . import Tools
 from .Tools import setAttribute as setatt
@@ -161,14 +160,13 @@ class SineModel( NonLinearModel ):
             list of indices active parameters (or None for all)
 
         """
-        np = self.npbase if parlist is None else len( parlist )
-        partial = numpy.ndarray( ( Tools.length( xdata ), np ) )
-
         #  disregard count
         x = self.TWOPI * xdata
         xf = x * params[0]
         cxf = numpy.cos( xf )
         sxf = numpy.sin( xf )
+        np = self.npbase if parlist is None else len( parlist )
+        partial = numpy.ndarray( numpy.shape( xf ) + ( np, ) )
 
         parts = { 0 : ( lambda: x * params[2] * cxf - x * params[1] * sxf ),
                   1 : ( lambda: cxf ),
@@ -178,10 +176,40 @@ class SineModel( NonLinearModel ):
             parlist = range( self.npmax )
 
         for k,kp in enumerate( parlist ) :
-            partial[:,k] = parts[kp]()
+            partial[...,k] = parts[kp]()
 
         return partial
 
+    def baseEnsembleResult( self, xdata, params ):
+        """
+        Returns the results of the model function for an ensemble of parameters.
+
+        Parameters
+        ----------
+        xdata : array_like
+            values at which to calculate the result
+        params : array_like (nsets,npars)
+            values for the parameters, one set per row.
+
+        """
+        return self.baseResult( xdata, params.T[:,:,numpy.newaxis] )
+
+    def baseEnsemblePartial( self, xdata, params, parlist=None ):
+        """
+        Returns the partials for an ensemble of parameters.
+
+        Parameters
+        ----------
+        xdata : array_like
+            values at which to calculate the partials
+        params : array_like (nsets,npars)
+            values for the parameters, one set per row.
+        parlist : array_like
+            list of indices active parameters (or None for all)
+
+        """
+        return self.basePartial( xdata, params.T[:,:,numpy.newaxis], parlist=parlist )
+
     def baseDerivative( self, xdata, params ):
         """
         Returns the derivative of f to x (df/dx) at the input values.
@@ -215,6 +243,7 @@ class SineModel( NonLinearModel ):
             the kth parameter.
 
         """
+        from astropy import units
         if k == 0:
             return units.Unit( units.si.rad ) / self.xUnit
         return self.yUnit
@@ -252,13 +281,12 @@ class SineModel( NonLinearModel ):
             list of indices active parameters (or None for all)
 
         """
-        np = self.npbase if parlist is None else len( parlist )
-        partial = numpy.ndarray( ( Tools.length( xdata ), np ) )
-
         #  disregard count
         x = self.TWOPI * xdata
         xf = x * params[1] + params[2]
         cxf = params[0] * numpy.cos( xf )
+        np = self.npbase if parlist is None else len( parlist )
+        partial = numpy.ndarray( numpy.shape( xf ) + ( np, ) )
 
         parts = { 0 : ( lambda: numpy.sin( xf ) ),
                   1 : ( lambda: cxf * x ),
@@ -268,7 +296,7 @@ class SineModel( NonLinearModel ):
             parlist = range( self.npmax )
 
         for k,kp in enumerate( parlist ) :
-            partial[:,k] = parts[kp]()
+            partial[...,k] = parts[kp]()
 
         return partial
 
@@ -305,6 +333,7 @@ class SineModel( NonLinearModel ):
             the kth parameter.
 
         """
+        from astropy import units
         if k == 0:
             return self.yUnit
         if k == 1:
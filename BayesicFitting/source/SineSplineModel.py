@@ -131,10 +131,13 @@ class SineSplineModel( LinearModel ):
     def __setattr__( self, name, value ) :
         if name == "frequency" :
             setatt( self, name, value, type=float )
+            self.clearDesign()
         elif name == "knots" :
             setatt( self, name, value, type=float, islist=True )
+            self.clearDesign()
         elif name == "order" :
             setatt( self, name, value, type=int )
+            self.clearDesign()
         elif name == "cm" or name == "sm" :
             raise AttributeError( "Attributes cm or sm can not be set" )
         else :
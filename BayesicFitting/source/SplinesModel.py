@@ -163,8 +163,10 @@ class SplinesModel( LinearModel ):
         """
         if name == "knots" :
             setatt( self, name, value, type=float, islist=True )
+            self.clearDesign()
         elif name == "order" :
             setatt( self, name, value, type=int )
+            self.clearDesign()
         else :
             super( SplinesModel, self ).__setattr__( name, value )
 
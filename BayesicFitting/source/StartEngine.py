@@ -1,5 +1,4 @@
 import numpy as numpy
-from astropy import units
 import math
 from . import Tools
 from .Formatter import formatter as fmt
@@ -107,4 +106,53 @@ class StartEngine( Engine ):
 
         return len( fitIndex )
 
+    def executeEnsemble( self, walkers, lowLhood ):
+        """
+        Execute the engine for all walkers, with a random selection of the parameters.
+
+        The log likelihoods are calculated for all walkers at once, in one call
+        to ensembleLogL. Walkers of dynamic models, which differ in size,
+        are executed one at a time.
+
+        Parameters
+        ----------
+        walkers : WalkerList
+            walkers to diffuse
+        lowLhood : float
+            lower limit in logLikelihood
+
+        Returns
+        -------
+        int : the number of successfull moves
+
+        """
+        problem = walkers[0].problem
+        if problem.model.isDynamic() :
+            return super( ).executeEnsemble( walkers, lowLhood )
+
+        fitIndex = walkers[0].fitIndex
+        pars = numpy.asarray( [walker.allpars for walker in walkers], dtype=float )
+        logL = numpy.zeros( len( walkers ), dtype=float )
+        todo = numpy.arange( len( walkers ) )
+
+        ktry = 0
+        while True :
+            uval = self.rng.rand( len( todo ), len( fitIndex ) )
+            pars[numpy.ix_( todo, fitIndex )] = self.unit2Domain( problem, uval, kpar=fitIndex )
+            logL[todo] = self.errdis.ensembleLogL( problem, pars[todo] )
+
+            ## try again for those that are not valid
+            todo = todo[numpy.logical_not( numpy.isfinite( logL[todo] ) )]
+            if len( todo ) == 0 :
+                break
+            elif ktry > ( self.maxtrials + len( walkers ) ) :
+                raise RuntimeError( "Cannot find valid starting solutions" )
+            else :
+                ktry += 1
+
+        for walker, par, L in zip( walkers, pars, logL ) :
+            self.setWalker( walker, walker.problem, par, L, fitIndex=fitIndex )
+
+        return len( walkers ) * len( fitIndex )
+
 
@@ -38,11 +38,26 @@ class StepEngine( Engine ):
     The StepEngine tries to move a selection of the parameters
     in a random order.
 
+    With precondition, the steps are taken in the frame whitened by the
+    covariance of the walkers (unitBasis), so they follow the correlations
+    between the parameters.
+
+    Attributes
+    ----------
+    stepsize : float
+        half width of the steps in the whitened frame, in standard deviations
+
+    Attributes from Engine
+    ----------------------
+    walkers, errdis, maxtrials, rng, verbose, report, unitRange, unitMin,
+    unitBasis, precondition
+
     Author       Do Kester.
 
     """
     #  *********CONSTRUCTORS***************************************************
-    def __init__( self, walkers, errdis, copy=None, seed=4213, verbose=0 ):
+    def __init__( self, walkers, errdis, copy=None, seed=4213, precondition=False,
+                  verbose=0 ):
         """
         Constructor.
 
@@ -56,9 +71,16 @@ class StepEngine( Engine ):
             to be copied
         seed : int
             for rng
+        precondition : bool
+            take the steps in the frame whitened by the covariance of the walkers
 
         """
         super( ).__init__( walkers, errdis, copy=copy, seed=seed, verbose=verbose )
+        if copy is None :
+            self.precondition = precondition
+            self.stepsize = 2.0
+        else :
+            self.stepsize = copy.stepsize
 
     def copy( self ):
         """ Return copy of this.  """
@@ -99,26 +121,39 @@ class StepEngine( Engine ):
         param = walker.allpars
         usav = self.domain2Unit( problem, param[fitIndex], kpar=fitIndex )
 
+        basis = self.unitBasis if self.precondition else None
+        if basis is not None and len( basis ) != np :
+            basis = None
+
         sz = 1.0
         ptry = param.copy()
         kk = 0
         while True :
             kk += 1
 
-            step = ( 2 * self.rng.rand( np ) - 1 ) * urange
-            while True :
+            if basis is not None :
+                step = self.stepsize * numpy.dot( basis, 2 * self.rng.rand( np ) - 1 )
+                ## when outside the unit box, take a random part of the step inside
+                with numpy.errstate( divide='ignore', invalid='ignore' ) :
+                    room = numpy.min( numpy.where( step < 0, usav, 1 - usav ) / numpy.abs( step ) )
+                if room < 1 :
+                    step *= room * self.rng.rand()
                 utry = usav + step
-                q0 = numpy.where( utry < 0 )[0]
-                nq0 = len( q0 )
-                q1 = numpy.where( utry > 1 )[0]
-                nq1 = len( q1 )
-
-                if nq0 > 0 :
-                    step[q0] = ( 2 * self.rng.rand( nq0 ) - 1 ) * urange[q0]
-                elif nq1 > 0 :
-                    step[q1] = ( 2 * self.rng.rand( nq1 ) - 1 ) * urange[q1]
-                else :
-                    break
+            else :
+                step = ( 2 * self.rng.rand( np ) - 1 ) * urange
+                while True :
+                    utry = usav + step
+                    q0 = numpy.where( utry < 0 )[0]
+                    nq0 = len( q0 )
+                    q1 = numpy.where( utry > 1 )[0]
+                    nq1 = len( q1 )
+
+                    if nq0 > 0 :
+                        step[q0] = ( 2 * self.rng.rand( nq0 ) - 1 ) * urange[q0]
+                    elif nq1 > 0 :
+                        step[q1] = ( 2 * self.rng.rand( nq1 ) - 1 ) * urange[q1]
+                    else :
+                        break
 
             ptry[fitIndex] = self.unit2Domain( problem, utry, kpar=fitIndex  )
 
@@ -0,0 +1,239 @@
+import numpy as numpy
+import os
+import pickle
+import random
+
+__author__ = "Do Kester"
+__year__ = 2018
+__license__ = "GPL3"
+__version__ = "0.9"
+__maintainer__ = "Do"
+__status__ = "Development"
+
+#  *
+#  * This file is part of the BayesicFitting package.
+#  *
+#  * BayesicFitting is free software: you can redistribute it and/or modify
+#  * it under the terms of the GNU Lesser General Public License as
+#  * published by the Free Software Foundation, either version 3 of
+#  * the License, or ( at your option ) any later version.
+#  *
+#  * BayesicFitting is distributed in the hope that it will be useful,
+#  * but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  * MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+#  * GNU Lesser General Public License for more details.
+#  *
+#  * The GPL3 license can be found at <http://www.gnu.org/licenses/>.
+#  *
+#  *    2018 Do Kester
+
+class StopStart( object ):
+    """
+    Checkpoint and restart facility for the NestedSampler.
+
+    Every so many iterations the state of the NestedSampler is written to
+    disk, such that a run that was stopped can be started again from the last
+    checkpoint. The restarted run continues exactly as the original would
+    have done: the random generators and the engine statistics and states are
+    part of the state. That includes the state of the module random, used in
+    some priors.
+
+    Two files are written:
+
+    <filename>.state : the walkers, the evidence, the information, the
+        iteration count, the width of the prior shell, the states of all
+        random generators, the engine statistics and states and those of the
+        EngineScheduler (if present). It is written to a temporary file first,
+        which replaces the old one in one atomic step.
+    <filename>.samples : the samples, appended in segments. Each checkpoint
+        only adds the samples that were stored after the previous one.
+        The state file records which part of it is valid, so that a write
+        that was interrupted is ignored.
+
+    Samples that are weeded (see `SampleList.weed`) after they are written,
+    are removed again when the samples are restored.
+
+    The files are kept after the run has finished. Remove them (or set
+    restore=False) to start afresh.
+
+    Examples
+    --------
+    >>> ns = NestedSampler( xdata, model, ydata, restart="myrun" )
+    >>> evid = ns.sample()              # stopped somewhere halfway
+    >>> ns = NestedSampler( xdata, model, ydata, restart="myrun" )
+    >>> evid = ns.sample()              # continues from the last checkpoint
+
+    Attributes
+    ----------
+    filename : str
+        base name of the files.
+    restore : bool
+        restore from the files, when present.
+    save : bool
+        save the state into the files.
+    cadence : int
+        number of iterations between checkpoints
+    logWidth : float
+        width of the prior shell, as restored.
+    nwritten : int
+        number of samples stored at the last checkpoint.
+        Samples with a higher id are not yet written.
+
+    Author       Do Kester
+
+    """
+    def __init__( self, filename="NestedSampler", restore=True, save=True, cadence=100 ):
+        """
+        Constructor.
+
+        Parameters
+        ----------
+        filename : str
+            base name of the files.
+        restore : bool
+            restore from the files, when present.
+        save : bool
+            save the state into the files.
+        cadence : int
+            number of iterations between checkpoints
+        """
+        self.filename = filename
+        self.restore = restore
+        self.save = save
+        self.cadence = cadence
+        self.logWidth = None
+        self.nwritten = 0
+
+    def wantRestore( self ) :
+        """
+        Return True when restoring is requested and a state file is present.
+        """
+        return self.restore and os.path.exists( self.filename + ".state" )
+
+    def wantSave( self, iteration ) :
+        """
+        Return True when a checkpoint is to be written at this iteration.
+
+        Parameters
+        ----------
+        iteration : int
+            the iteration of the NestedSampler
+        """
+        return self.save and iteration % self.cadence == 0
+
+    def saveState( self, ns, logWidth ) :
+        """
+        Write a checkpoint of the NestedSampler.
+
+        Parameters
+        ----------
+        ns : NestedSampler
+            the sampler to save
+        logWidth : float
+            width of the prior shell at this iteration
+        """
+        samples = ns.samples
+        mode = "ab" if self.nwritten > 0 else "wb"
+        with open( self.filename + ".samples", mode ) as fp :
+            if samples._count > self.nwritten :
+                pickle.dump( samples.getSegment( self.nwritten ), fp,
+                             protocol=pickle.HIGHEST_PROTOCOL )
+            fp.flush()
+            os.fsync( fp.fileno() )
+            nbytes = fp.tell()
+        self.nwritten = samples._count
+
+        state = {
+            "npars" : ns.problem.npars,
+            "ensemble" : ns.ensemble,
+            "iteration" : ns.iteration,
+            "logZ" : ns.logZ,
+            "info" : ns.info,
+            "logWidth" : logWidth,
+            "rng" : ns.rng.get_state(),
+            "random" : random.getstate(),
+            "engines" : [( eng.rng.get_state(), list( eng.report ), getattr( eng, "bound", None ) )
+                         for eng in ns.engines],
+            "scheduler" : None if ns.scheduler is None else vars( ns.scheduler ),
+            "ncalls" : ( ns.distribution.ncalls, ns.distribution.nparts ),
+            "nbytes" : nbytes,
+            "nsamples" : samples._count,
+            "alive" : samples.getIds(),
+            "nwalkers" : ns.walkers._count
+        }
+        if ns.problem.model.isDynamic() :
+            state["walkers"] = list( ns.walkers )
+        else :
+            state["walkers"] = {
+                "id" : numpy.asarray( [w.id for w in ns.walkers] ),
+                "parent" : numpy.asarray( [w.parent for w in ns.walkers] ),
+                "logL" : numpy.asarray( [w.logL for w in ns.walkers] ),
+                "allpars" : numpy.asarray( [w.allpars for w in ns.walkers] ) }
+
+        tmpname = self.filename + ".state.tmp"
+        with open( tmpname, "wb" ) as fp :
+            pickle.dump( state, fp, protocol=pickle.HIGHEST_PROTOCOL )
+            fp.flush()
+            os.fsync( fp.fileno() )
+        os.replace( tmpname, self.filename + ".state" )
+
+    def restoreState( self, ns ) :
+        """
+        Restore the NestedSampler from the last checkpoint.
+
+        The walkers and samples are restored in place, into the (initialized)
+        lists of the sampler. The width of the prior shell is kept in logWidth.
+
+        Parameters
+        ----------
+        ns : NestedSampler
+            the sampler to restore
+
+        Raises
+        ------
+        ValueError when the checkpoint does not fit the sampler
+        """
+        with open( self.filename + ".state", "rb" ) as fp :
+            state = pickle.load( fp )
+
+        if state["npars"] != ns.problem.npars or state["ensemble"] != ns.ensemble :
+            raise ValueError( "Checkpoint in %s does not fit this NestedSampler" %
+                              self.filename )
+
+        ns.iteration = state["iteration"]
+        ns.logZ = state["logZ"]
+        ns.info = state["info"]
+        self.logWidth = state["logWidth"]
+
+        ns.rng.set_state( state["rng"] )
+        random.setstate( state["random"] )
+        for eng, ( rngstate, report, bound ) in zip( ns.engines, state["engines"] ) :
+            eng.rng.set_state( rngstate )
+            eng.report = report
+            if bound is not None :
+                eng.bound[:] = bound            ## in place; it is shared with copies
+        if state["scheduler"] is not None :
+            vars( ns.scheduler ).update( state["scheduler"] )
+        ns.distribution.ncalls, ns.distribution.nparts = state["ncalls"]
+
+        walkers = state["walkers"]
+        if isinstance( walkers, list ) :
+            ns.walkers[:] = walkers
+        else :
+            for k, walker in enumerate( ns.walkers ) :
+                walker.id = int( walkers["id"][k] )
+                walker.parent = int( walkers["parent"][k] )
+                walker.logL = float( walkers["logL"][k] )
+                walker.allpars = walkers["allpars"][k].copy()
+        ns.walkers._count = state["nwalkers"]
+
+        ## Drop what was appended after the checkpoint, possibly half written.
+        with open( self.filename + ".samples", "r+b" ) as fp :
+            fp.truncate( state["nbytes"] )
+            while fp.tell() < state["nbytes"] :
+                ns.samples.addSegment( pickle.load( fp ) )
+        ns.samples.retain( state["alive"] )
+        ns.samples._count = state["nsamples"]
+        self.nwritten = state["nsamples"]
+
+
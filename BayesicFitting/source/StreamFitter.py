@@ -0,0 +1,308 @@
+import numpy as numpy
+
+from .BaseFitter import BaseFitter
+
+__author__ = "Do Kester"
+__year__ = 2018
+__license__ = "GPL3"
+__version__ = "0.9"
+__maintainer__ = "Do"
+__status__ = "Development"
+
+#  * This file is part of the BayesicFitting package.
+#  *
+#  * BayesicFitting is free software: you can redistribute it and/or modify
+#  * it under the terms of the GNU Lesser General Public License as
+#  * published by the Free Software Foundation, either version 3 of
+#  * the License, or ( at your option ) any later version.
+#  *
+#  * BayesicFitting is distributed in the hope that it will be useful,
+#  * but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  * MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+#  * GNU Lesser General Public License for more details.
+#  *
+#  * The GPL3 license can be found at <http://www.gnu.org/licenses/>.
+#  *
+#  *    2018        Do Kester
+
+class StreamFitter( BaseFitter ):
+    """
+    Fitter for linear models, on data that arrive in chunks.
+
+    The data do not need to be in memory at the same time. Each chunk of
+    (xdata, ydata, weights) is appended to the triangular factor R of
+    the QR decomposition of the weighted design matrix, extended with the
+    weighted data, which is then decomposed anew (a tall-skinny QR).
+    .. math::
+        Q * R = [ sqrt( w ) * D | sqrt( w ) * y ]
+        H = R_D^T * R_D
+        chisq = R[-1,-1]^2
+
+    In contrast to the sums of the normal equations, R does not lose
+    precision to data with a large offset.
+
+    Accumulations from separate processes (or separate parts of the data)
+    can be merged by decomposing their stacked R factors.
+
+    The results are the same as those of `Fitter`: parameters, chisq, scale,
+    covariance, stdevs and evidence. As there is no xdata kept, yfit and
+    monteCarloError() are not available.
+
+    Examples
+    --------
+    # assume the data are in (memory-mapped) .npy files
+    >>> poly = PolynomialModel( 1 )
+    >>> fitter = StreamFitter( poly )
+    >>> param = fitter.fit( StreamFitter.chunks( "x.npy", "y.npy", size=100000 ) )
+    >>> stdev = fitter.stdevs
+    >>> chisq = fitter.chisq
+    # or chunk by chunk, in 2 processes
+    >>> ftr1 = StreamFitter( poly )
+    >>> ftr1.accumulate( x1, y1 )
+    >>> ftr2 = StreamFitter( poly )
+    >>> ftr2.accumulate( x2, y2 )
+    >>> param = ftr1.merge( ftr2 ).fit()
+
+    Attributes
+    ----------
+    rmatrix : ndarray
+        upper triangular factor R of [ sqrt( w ) * D | sqrt( w ) * y ],
+        accumulated over the fitted parameters and the data
+    sumwgt : float
+        accumulated sum of the weights
+    nxdata : int
+        number of data points accumulated
+
+    Attributes from BaseFitter
+    --------------------------
+    model, keep, fitIndex, npfit, fixedScale, chisq
+
+    Limitations
+    -----------
+    1. The model needs to be linear in its parameters.
+    2. Parameters to be kept fixed, need to be known before the accumulation.
+
+    Category:    Mathematics/Fitting
+
+    """
+
+    def __init__( self, model, keep=None, fixedScale=None ):
+        """
+        Create a new StreamFitter, providing the model.
+
+        Parameters
+        ----------
+        model : Model
+            the model function to be fitted
+        keep : dict of {int:float}
+            dictionary of indices (int) to be kept at a fixed value (float)
+            The values of keep will be used by the Fitter as long as the Fitter exists.
+        fixedScale : None or float
+            None : the noise scale is not fixed
+            float: value of the fixed noise scale
+
+        Raises
+        ------
+        ValueError when model is not the head if the compound model chain.
+
+        """
+        if model != model._head:
+            raise ValueError( "Model is not the head of a compound model chain" )
+
+        self.model = model
+        self.xdata = None
+        self.imageAssistant = None
+        self.ndim = model.ndim
+        self.keep = keep
+        self.fitIndex = self.keepFixed( keep )
+        self.fixedScale = fixedScale
+        self.reset()
+
+    def reset( self ) :
+        """
+        Remove all accumulated data.
+        """
+        np = self.model.npchain if self.fitIndex is None else len( self.fitIndex )
+        self.rmatrix = numpy.zeros( ( 0, np + 1 ), dtype=float )
+        self.sumwgt = 0.0
+        self.nxdata = 0
+
+    def accumulate( self, xdata, ydata, weights=None ) :
+        """
+        Add a chunk of data to the accumulations.
+
+        Parameters
+        ----------
+        xdata : array_like
+            independent input values of the chunk
+        ydata : array_like
+            the data of the chunk
+        weights : None or array_like
+            weights pertaining to the data ( = 1.0 / sigma^2 )
+
+        Raises
+        ------
+            ValueError when xdata, ydata or weights contain a NaN
+
+        """
+        xdata = numpy.asarray( xdata, dtype=float )
+        ydata = numpy.asarray( ydata, dtype=float )
+        if numpy.any( numpy.isnan( xdata ) ) :
+            raise ValueError( "NaNs in xdata array" )
+        self.checkNan( ydata, weights=weights )
+
+        design = self.model.partial( xdata, self.model.parameters )
+        if self.fitIndex is not None :
+            # subtract influence of fixed parameters on the data
+            fxpar = numpy.copy( self.model.parameters )
+            fxpar[self.fitIndex] = 0.0
+            ydata = ydata - self.model.result( xdata, fxpar )
+            design = design[:,self.fitIndex]
+
+        block = numpy.column_stack( ( design, ydata ) )
+        if weights is None :
+            self.sumwgt += len( ydata )
+        else :
+            weights = numpy.asarray( weights, dtype=float )
+            block *= numpy.sqrt( weights )[:,numpy.newaxis]
+            self.sumwgt += numpy.sum( weights )
+
+        self.rmatrix = self.decompose( self.rmatrix, block )
+        self.nxdata += len( ydata )
+
+    @staticmethod
+    def decompose( *blocks ) :
+        """
+        Return the triangular factor R of the QR decomposition of the stacked blocks.
+
+        Parameters
+        ----------
+        blocks : ndarray
+            matrices with the same number of columns
+        """
+        return numpy.linalg.qr( numpy.vstack( blocks ), mode='r' )
+
+    def merge( self, other ) :
+        """
+        Add the accumulations of another StreamFitter to this one.
+        Return this one.
+
+        Parameters
+        ----------
+        other : StreamFitter
+            with accumulations of the same model and the same kept parameters
+
+        Raises
+        ------
+        ValueError when the accumulations do not match
+
+        """
+        if self.rmatrix.shape[1] != other.rmatrix.shape[1] or not numpy.array_equal(
+                numpy.asarray( self.fitIndex ), numpy.asarray( other.fitIndex ) ) :
+            raise ValueError( "Cannot merge accumulations of different fits" )
+
+        self.rmatrix = self.decompose( self.rmatrix, other.rmatrix )
+        self.sumwgt += other.sumwgt
+        self.nxdata += other.nxdata
+        return self
+
+    @staticmethod
+    def chunks( xdata, ydata, weights=None, size=100000 ) :
+        """
+        Return a generator over chunks of ( xdata, ydata, weights ).
+
+        Files are opened as memory-mapped arrays, so only one chunk at a time
+        is read into memory.
+
+        Parameters
+        ----------
+        xdata : array_like or str
+            independent input values or name of a .npy file containing them
+        ydata : array_like or str
+            data or name of a .npy file containing them
+        weights : None or array_like or str
+            weights or name of a .npy file containing them
+        size : int
+            number of data points in a chunk
+
+        """
+        def load( data ) :
+            return numpy.load( data, mmap_mode='r' ) if isinstance( data, str ) else data
+
+        xdata = load( xdata )
+        ydata = load( ydata )
+        weights = None if weights is None else load( weights )
+
+        for k in range( 0, len( ydata ), size ) :
+            chunk = slice( k, k + size )
+            yield ( xdata[chunk], ydata[chunk],
+                    None if weights is None else weights[chunk] )
+
+    def fit( self, chunks=None, plot=False ):
+        """
+        Return model parameters fitted to the accumulated data.
+
+        Parameters
+        ----------
+        chunks : None or iterable of ( xdata, ydata ) or ( xdata, ydata, weights )
+            chunks of data to be accumulated before the fit.
+            None : fit the data accumulated sofar
+        plot : bool
+            not available; for compatibility with Fitter
+
+        """
+        if chunks is not None :
+            for chunk in chunks :
+                self.accumulate( *chunk )
+
+        rmat = self.squareR()
+        self.npfit = np = rmat.shape[1] - 1
+        # chisq = sum( w * ( y - D * p )^2 ) = R[np,np]^2
+        self.chisq = rmat[np,np] ** 2
+        if self.npfit == 0 :
+            params = numpy.asarray( 0 )
+            return params
+
+        # solve R_D * p = R_y; R_D is upper triangular
+        params = numpy.linalg.solve( rmat[:np,:np], rmat[:np,np] )
+
+        if self.chisq <= 0 :
+            raise ValueError( str( self ) + ": chisq <= 0" )
+
+        params = self.insertParameters( params, index=self.fitIndex )
+        self.model.parameters = params
+
+        return params
+
+    def getHessian( self, params=None, weights=None, index=None ):
+        """
+        Return the accumulated hessian matrix.
+
+        Parameters
+        ----------
+        params, weights, index :
+            not used; for compatibility with BaseFitter
+
+        """
+        rmat = self.squareR()[:-1,:-1]
+        return numpy.dot( rmat.transpose(), rmat )
+
+    def squareR( self ) :
+        """
+        Return the accumulated R, padded with zeros to a square matrix.
+        """
+        rmat = self.rmatrix
+        nc = rmat.shape[1]
+        if rmat.shape[0] < nc :
+            rmat = numpy.vstack( ( rmat, numpy.zeros( ( nc - rmat.shape[0], nc ) ) ) )
+        return rmat
+
+    def __getattr__( self, name ) :
+        if name == 'yfit' :
+            raise AttributeError( str( self ) + ": yfit is not available." )
+        return super( StreamFitter, self ).__getattr__( name )
+
+    def __str__( self ):
+        """ Return the name of the fitter. """
+        return "StreamFitter"
+
@@ -140,10 +140,13 @@ class SurfaceSplinesModel( LinearModel ):
         """
         if name == 'knots' :
             setatt( self, name, value, type=list )
+            self.clearDesign()
         elif name == 'order' :
             setatt( self, name, value, type=int, islist=True )
+            self.clearDesign()
         elif name == 'models' :
             setatt( self, name, value, type=Model, islist=True )
+            self.clearDesign()
         else :
             super( SurfaceSplinesModel, self ).__setattr__( name, value )
 
@@ -193,6 +193,26 @@ class UniformErrorDistribution( ScaledErrorDistribution ):
             dL[-1] = -problem.sumweight / allpars[-1]
         return dL
 
+    def logLdataAndPartial( self, problem, allpars, mockdata=None ) :
+        """
+        Return the log( likelihood ) for each residual and its derivatives
+        to the mock data and to the hyperparameters.
+
+        Parameters
+        ----------
+        problem : Problem
+            to be solved
+        allpars : array_like
+            list of all parameters in the problem
+        mockdata : array_like
+            as calculated by the model
+
+        """
+        lld = self.logLdata( problem, allpars, mockdata=mockdata )
+        wgt = numpy.ones_like( lld ) if problem.weights is None else problem.weights
+
+        return ( lld, numpy.zeros_like( lld ), [- wgt / allpars[-1]] )
+
     def nextPartialData( self, problem, allpars, fitIndex, mockdata=None ) :
         """
         Return the partial derivative of elements of the log( likelihood )
@@ -266,6 +266,78 @@ class Bspline():
         return lambda x: sum( ci*Bi(x) for ci,Bi in terms )
 
 
+    def collband(self, tau, deriv_order=0):
+        """
+        Compute the collocation matrix in banded form.
+
+        At each site only `order` + 1 basis functions are nonzero. They are
+        found for all sites at once by a search for the knot span of each site,
+        followed by the de Boor recurrence on arrays. Derivatives follow from
+        the lower order basis functions.
+
+        Parameters:
+        tau:
+            Python list or rank-1 array, collocation sites
+        deriv_order:
+            int, >=0, order of derivative for which to compute the collocation matrix.
+
+        Returns:
+        (B, first):
+            B is a rank-2 array of shape (len(tau), order+1) and first a rank-1
+            array of ints such that
+                B[i,k] = D**deriv_order B_j(tau[i])   with j = first[i] + k
+            Sites outside the knot vector have all B[i,:] = 0.
+
+        """
+        t = self.knot_vector
+        p = self.p
+        nbasis = len(t) - p - 1
+
+        tau = np.atleast_1d(np.asarray(tau, dtype=float))
+        if tau.ndim > 1:
+            raise ValueError("tau must be a list or a rank-1 array")
+
+        # knot span: t[span] <= tau < t[span+1]
+        span = np.searchsorted(t, tau, side='right') - 1
+        span = np.clip(span, p, nbasis - 1)
+        inside = np.logical_and(t[p] <= tau, tau < t[nbasis])
+        if self.last:
+            inside = np.logical_or(inside, tau == t[nbasis])
+
+        # basis functions of degree (p - deriv_order)
+        q = max(p - deriv_order, 0)
+        B = np.zeros((len(tau), p + 1), dtype=float)
+        B[:,0] = 1.0
+        for j in range(1, q + 1):
+            saved = np.zeros(len(tau), dtype=float)
+            for r in range(j):
+                left = tau - t[span + 1 + r - j]
+                right = t[span + 1 + r] - tau
+                temp = B[:,r] / (right + left)
+                B[:,r] = saved + right * temp
+                saved = left * temp
+            B[:,j] = saved
+
+        # raise the degree with the derivative recurrence
+        if deriv_order > p:
+            B[:] = 0.0
+        for d in range(q + 1, min(p, q + deriv_order) + 1):
+            prev = B[:,:d].copy()
+            B[:,:d+1] = 0.0
+            for k in range(d + 1):
+                j = span - d + k
+                with np.errstate(divide='ignore', invalid='ignore'):
+                    if k > 0:
+                        den = t[j + d] - t[j]
+                        B[:,k] += np.where(den != 0.0, d * prev[:,k-1] / den, 0.0)
+                    if k < d:
+                        den = t[j + d + 1] - t[j + 1]
+                        B[:,k] -= np.where(den != 0.0, d * prev[:,k] / den, 0.0)
+
+        # line up: the last p+1 entries belong to functions span-p .. span
+        B = np.where(inside[:,np.newaxis], B[:,:p+1], 0.0)
+        return (B, span - p)
+
     def collmat(self, tau, deriv_order=0):
         """
         Compute collocation matrix.
@@ -294,18 +366,14 @@ class Bspline():
 
         Similarly for derivatives (if the supplied `deriv_order`> 0).
 
-        """
-        # get number of basis functions and output dtype
-        dummy = self.__call__(0.)
-        nbasis = dummy.shape[0]
+        The matrix is filled from the banded form, see `collband`.
 
-        tau = np.atleast_1d(tau)
-        if tau.ndim > 1:
-            raise ValueError("tau must be a list or a rank-1 array")
+        """
+        nbasis = len(self.knot_vector) - self.p - 1
+        B, first = self.collband(tau, deriv_order=deriv_order)
 
-        A = np.empty( (tau.shape[0], nbasis), dtype=dummy.dtype )
-        f = self.diff(order=deriv_order)
-        for i,taui in enumerate(tau):
-            A[i,:] = f(taui)
+        A = np.zeros( (B.shape[0], nbasis), dtype=float )
+        rows = np.arange(B.shape[0])[:,np.newaxis]
+        A[rows, first[:,np.newaxis] + np.arange(self.p + 1)] = B
 
         return np.squeeze(A)
@@ -438,6 +438,58 @@ class TestCompoundModel( unittest.TestCase ):
 
         numpy.testing.assert_array_equal( m.result( x ), mc.result( x ) )
 
+    def testEnsemble( self ):
+        print( "  Test ensemble of parameter sets" )
+        x = numpy.linspace( 0.5, 3.0, 11 )
+        numpy.random.seed( 2345 )
+
+        m1 = GaussModel( )
+        m1.subtractModel( LorentzModel( ) )
+        m1.multiplyModel( SineModel( ) )
+        m1.divideModel( ExpModel( ) )
+
+        m2 = PolynomialModel( 1 )
+        m2 |= PowerLawModel( )
+        m2 += KernelModel( )
+        m2 *= ( GaussModel( fixed={0:1.0} ) + PolynomialModel( 0 ) )
+
+        for m in [m1, m2] :
+            print( m )
+            pars = numpy.random.rand( 6, m.npchain ) + 0.5
+
+            res = m.result( x, pars )
+            part = m.partial( x, pars.copy() )
+            self.assertTrue( res.shape == ( 6, 11 ) )
+            self.assertTrue( part.shape == ( 6, 11, m.npchain ) )
+
+            for k, p in enumerate( pars ) :
+                numpy.testing.assert_array_almost_equal( res[k], m.result( x, p ), 10 )
+                numpy.testing.assert_array_almost_equal( part[k], m.partial( x, p ), 10 )
+
+    def testPlan( self ):
+        print( "  Test evaluation plan" )
+        x = numpy.linspace( 0.5, 3.0, 11 )
+
+        m = GaussModel( )
+        m *= SineModel( )
+        plan = m.getPlan()
+        self.assertTrue( plan is m.getPlan() )
+        self.assertTrue( [( op, lo, hi ) for mdl, op, lo, hi in plan] ==
+                         [( Model.NOP, 0, 3 ), ( Model.MUL, 3, 6 )] )
+
+        m += PolynomialDynamicModel( 1 )
+        self.assertTrue( len( m.getPlan() ) == 3 )
+        self.assertTrue( m.getPlan()[-1][2:] == ( 6, 8 ) )
+
+        dyn = m._next._next
+        dyn.grow( pat=6 )
+        self.assertTrue( m.getPlan()[-1][2:] == ( 6, 9 ) )
+        p = numpy.linspace( 0.5, 1.5, m.npchain )
+        self.assertTrue( m.result( x, p ).shape == ( 11, ) )
+        self.assertTrue( m.partial( x, p ).shape == ( 11, 9 ) )
+        numpy.testing.assert_array_almost_equal( m.partial( x, p ),
+                        m.numPartial( x, p ), 5 )
+
     def suite( cls ):
         return unittest.TestCase.suite( CompoundModelTest.__class__ )
 
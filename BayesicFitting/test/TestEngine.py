@@ -93,6 +93,41 @@ class TestEngine( unittest.TestCase ):
         self.enginetest( copeng )
 
 
+    def testUnitRange( self ):
+        print( "\n   Engine Test 2: incremental unit range\n" )
+        m, xdata, data = self.initEngine()
+        errdis = GaussErrorDistribution( )
+        errdis.setLimits( [0.1, 10.0] )
+        problem = ClassicProblem( m, xdata, data )
+
+        fi = [0,1,2,-1]
+        allpars = numpy.append( m.parameters, 1.0 )
+        wl = WalkerList( problem, 21, allpars, fi )
+        engine = Engine( wl, errdis )
+        for w in wl :
+            w.allpars = engine.unit2Domain( problem, engine.rng.rand( 4 ), kpar=fi )
+        engine.calculateUnitRange( basis=True )
+
+        for k in range( 100 ) :
+            ## change some walkers; often the ones that hold an extreme
+            changed = list( engine.rng.choice( 21, 3, replace=False ) )
+            if k % 2 == 0 :
+                changed[0] = engine.cloud[1][engine.rng.randint( 4 )]
+            for i in changed :
+                wl[i].allpars = engine.unit2Domain( problem, engine.rng.rand( 4 ), kpar=fi )
+            engine.calculateUnitRange( changed=changed, basis=True )
+
+            fresh = Engine( wl, errdis )
+            fresh.calculateUnitRange()
+            assertAAE( engine.unitRange, fresh.unitRange, 12 )
+            assertAAE( engine.unitMin, fresh.unitMin, 12 )
+
+            ## basis is the Cholesky factor of the covariance in unit space
+            upars = [engine.domain2Unit( problem, w.allpars[fi], kpar=fi ) for w in wl]
+            cov = numpy.cov( numpy.transpose( upars ), bias=True )
+            assertAAE( numpy.dot( engine.unitBasis, engine.unitBasis.T ), cov, 12 )
+            self.assertTrue( fresh.unitBasis is None )
+
     def enginetest( self, engine ) :
         walkers = engine.walkers
         for w in walkers :
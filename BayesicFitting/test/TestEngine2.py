@@ -109,6 +109,32 @@ class TestEngine2( unittest.TestCase ):
         print( "\n   Chord Engine Test\n" )
         self.stdenginetest( ChordEngine, iter=100, nsamp=10, plot=plot )
 
+    def plotEllipsoidEngine( self ):
+        self.testEllipsoidEngine( plot=True )
+
+    def testEllipsoidEngine( self, plot=False ):
+        print( "\n   Ellipsoid Engine Test\n" )
+        self.stdenginetest( EllipsoidEngine, iter=100, nsamp=10, plot=plot )
+
+        ## 2 separate clusters of points are enclosed by (at least) 2 ellipsoids
+        m, xdata, data = self.initEngine()
+        problem = ClassicProblem( m, xdata=xdata, ydata=data )
+        wl = WalkerList( problem, 10, numpy.append( m.parameters, [0.5] ), [0,1] )
+        engine = EllipsoidEngine( wl, GaussErrorDistribution( scale=0.5 ) )
+        rng = numpy.random.RandomState( 3 )
+        upars = numpy.append( 0.2 + 0.02 * rng.randn( 100, 2 ),
+                              0.7 + 0.05 * rng.randn( 100, 2 ), axis=0 )
+        ells = engine.makeEllipsoids( upars )
+        print( "ellipsoids ", len( ells ) )
+        self.assertTrue( len( ells ) >= 2 )
+        logvol = numpy.logaddexp.reduce( [ell[2] for ell in ells] )
+        self.assertTrue( logvol < engine.enclose( upars )[2] - math.log( 4 ) )
+        for u in upars :
+            self.assertTrue( any( [engine.isInside( ell, u ) for ell in ells] ) )
+        for k in range( 100 ) :
+            u = engine.drawPoint( ells, [0,1] )
+            self.assertTrue( min( abs( u - 0.2 ) ) < 0.2 or min( abs( u - 0.7 ) ) < 0.4 )
+
     def stdenginetest( self, myengine, nsamp=4, iter=100, plot=False ) :
         m, xdata, data = self.initEngine()
         problem = ClassicProblem( m, xdata=xdata, ydata=data )
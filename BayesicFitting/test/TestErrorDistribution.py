@@ -907,6 +907,132 @@ class TestErrorDistribution( unittest.TestCase ):
                 param[1] += 1
             print( "" )
 
+    def testEnsembleLogL( self ):
+        print( "====testEnsembleLogL=================" )
+        model = PolynomialModel( 1 )
+        numpy.random.seed( 3456 )
+        pars = numpy.random.rand( 7, 2 ) + [0.5, 9.0]
+
+        for wgt in [None, self.wgt] :
+            problem = ClassicProblem( model=model, xdata=self.x, ydata=self.data,
+                                      weights=wgt )
+            hyp = numpy.random.rand( 7, 1 ) + 0.5
+            for errdis in [GaussErrorDistribution(), LaplaceErrorDistribution(),
+                           CauchyErrorDistribution()] :
+                self.checkEnsemble( errdis, problem, numpy.append( pars, hyp, axis=1 ) )
+            errdis = UniformErrorDistribution()
+            self.checkEnsemble( errdis, problem, numpy.append( pars, 10 * hyp, axis=1 ) )
+
+            hyp = numpy.random.rand( 7, 2 ) + [0.5, 1.0]
+            errdis = ExponentialErrorDistribution()
+            self.checkEnsemble( errdis, problem, numpy.append( pars, hyp, axis=1 ) )
+
+        problem = ClassicProblem( model=model, xdata=self.x, ydata=numpy.abs( self.data ) )
+        self.checkEnsemble( PoissonErrorDistribution(), problem, pars + [5.0, -5.0] )
+
+    def checkEnsemble( self, errdis, problem, allpars ) :
+        errdis.ncalls = 0
+        logL = errdis.ensembleLogL( problem, allpars )
+        self.assertTrue( errdis.ncalls == len( allpars ) )
+        single = [errdis.logLikelihood( problem, ap ) for ap in allpars]
+        print( errdis, fmt( logL ) )
+        assertAAE( logL, single, 8 )
+
+    def testUpdateLogL( self ):
+        print( "====testUpdateLogL===================" )
+        x = numpy.linspace( 0, 10, 201, dtype=float )
+        numpy.random.seed( 4567 )
+        y = numpy.random.randn( 201 )
+
+        gm = GaussModel()
+        m1 = gm + PolynomialModel( 1 )
+        m1 -= KernelModel()
+        m1 += FreeShapeModel( 5, xlo=-1, xhi=11 )
+        m2 = PolynomialModel( 1 ) + gm * SineModel()
+        m3 = GaussModel() + GaussModel()
+
+        cases = [( model, errdis ) for model in [m1, m2, m3]
+                 for errdis in [GaussErrorDistribution(), LaplaceErrorDistribution()]]
+        for model, errdis in cases :
+            problem = ClassicProblem( model=model, xdata=x, ydata=y )
+            np = model.npchain
+            allpars = numpy.append( numpy.random.rand( np ) + 0.5, 1.0 )
+            allpars[1] = 5.0
+            ## the scale is also at -1 (as in GibbsEngine); with a cold cache now and then
+            for k in range( 3 * np + 3 ) :
+                c = k % ( np + 2 ) - 1
+                save = allpars[c]
+                allpars[c] += numpy.random.rand() - 0.5
+                if k % 2 == 0 :
+                    problem._cache = []
+                logL = errdis.updateLogL( problem, allpars, parval={c : save} )
+                full = errdis.logLikelihood( problem, allpars )
+                assertAAE( logL, full, 8 )
+                if k % 3 == 0 :
+                    allpars[c] = save
+
+
+    def testLogLikelihoodAndGradient( self ):
+        print( "====testLogLikelihoodAndGradient=====" )
+        x = numpy.linspace( 0, 5, 31, dtype=float )
+        numpy.random.seed( 3456 )
+        model = GaussModel() + PolynomialModel( 1 )
+        pars = [3.0, 2.0, 1.0, 1.0, 0.2]
+        ym = model.result( x, pars )
+        y = ym + 0.3 * numpy.random.randn( 31 )
+        yp = numpy.random.poisson( ym )
+
+        errdis = [GaussErrorDistribution(), LaplaceErrorDistribution(),
+                  CauchyErrorDistribution(), UniformErrorDistribution(),
+                  ExponentialErrorDistribution(), PoissonErrorDistribution(),
+                  MixedErrorDistribution( GaussErrorDistribution(),
+                                          CauchyErrorDistribution() )]
+        hypars = [[0.5], [0.5], [0.5], [5.0], [0.5, 1.5], [], [0.5, 0.8, 0.3]]
+
+        for ed, hp in zip( errdis, hypars ) :
+            print( ed )
+            for wgt in [None, numpy.linspace( 0.5, 1.5, 31 )] :
+                problem = ClassicProblem( model=model, xdata=x, weights=wgt,
+                                          ydata=( y if len( hp ) else yp ) )
+                allpars = numpy.append( [2.9, 2.1, 1.1, 0.9, 0.25], hp )
+                fitIndex = list( range( 5 ) ) + list( range( -len( hp ), 0 ) )
+
+                ( logL, dL ) = ed.logLikelihoodAndGradient( problem, allpars, fitIndex )
+                assertAAE( logL, ed.logLikelihood( problem, allpars ), 10 )
+                assertAAE( dL, ed.partialLogL( problem, allpars, fitIndex ), 10 )
+
+                ## gradient only: no call to logL counted
+                ncalls = ed.ncalls
+                assertAAE( dL, ed.gradientLogL( problem, allpars, fitIndex ), 10 )
+                self.assertTrue( ed.ncalls == ncalls )
+
+    def testQuadraticForm( self ):
+        print( "====testQuadraticForm================" )
+        x = numpy.linspace( 0, 10, 201, dtype=float )
+        numpy.random.seed( 5678 )
+        y = numpy.random.randn( 201 )
+        wgt = numpy.random.rand( 201 ) + 0.5
+
+        m1 = PolynomialModel( 2, fixed={1:0.3} ) - SplinesModel( knots=[0,3,7,10] )
+        m2 = PolynomialModel( 1 ) * GaussModel()
+        self.assertTrue( m1.isLinear() )
+        self.assertFalse( m2.isLinear() )
+
+        for w in [None, wgt] :
+            problem = ClassicProblem( model=m1, xdata=x, ydata=y, weights=w )
+            self.assertTrue( problem.quadraticForm() is not None )
+            self.assertTrue( problem.quadraticForm() is problem.copy().quadraticForm() )
+
+            errdis = GaussErrorDistribution()
+            allpars = numpy.random.rand( 5, m1.npchain + 1 ) + 0.5
+            ensL = errdis.ensembleLogL( problem, allpars )
+            for ap, eL in zip( allpars, ensL ) :
+                logL = numpy.sum( errdis.logLdata( problem, ap ) )
+                assertAAE( errdis.logLikelihood( problem, ap ), logL, 8 )
+                assertAAE( eL, logL, 8 )
+
+        problem = ClassicProblem( model=m2, xdata=x, ydata=y )
+        self.assertTrue( problem.quadraticForm() is None )
 
     @classmethod
     def suite( cls ):
@@ -166,6 +166,87 @@ class TestFitter( unittest.TestCase ):
 
 #        assertAAE( std, ast )
 
+
+    def testBatch( self ):
+        """
+        test batch fit of many datasets
+
+        1. Compare with fits of the individual datasets
+
+        2. Per-dataset weights and kept parameters
+
+        """
+        print( "\n   Fitter Test Batch  \n" )
+        numpy.random.seed( 3456 )
+        yy = self.aa + self.bb * self.x
+        ydata = yy + self.ss * numpy.random.randn( 6, 11 )
+        wgts = numpy.random.rand( 6, 11 ) + 0.5
+
+        model = PolynomialModel( 1 )
+        model.setLimits( -10, 10 )
+        fitter = Fitter( self.x, model )
+        pars = fitter.fitBatch( ydata )
+        stdv = fitter.getBatchStandardDeviations()
+        logz = fitter.getBatchLogZ( noiseLimits=[0.01,10] )
+        print( "   par  ", pars[0], " stdv  ", stdv[0], logz[0] )
+        self.assertTrue( pars.shape == ( 6, 2 ) )
+
+        for k in range( 6 ) :
+            alt = Fitter( self.x, PolynomialModel( 1 ) )
+            alt.model.setLimits( -10, 10 )
+            assertAAE( pars[k], alt.fit( ydata[k] ) )
+            self.assertTrue( self.eq( fitter.batchChisq[k], alt.chisq ) )
+            assertAAE( stdv[k], alt.stdevs )
+            self.assertTrue( self.eq( logz[k], alt.getLogZ( noiseLimits=[0.01,10] ) ) )
+
+        pars = fitter.fitBatch( ydata, weights=wgts, keep={0:5.0} )
+        print( "   par  ", pars[0], " stdv  ", fitter.getBatchStandardDeviations()[0] )
+        self.assertTrue( numpy.all( pars[:,0] == 5.0 ) )
+        self.assertTrue( numpy.all( fitter.getBatchStandardDeviations()[:,0] == 0 ) )
+        for k in range( 6 ) :
+            alt = Fitter( self.x, PolynomialModel( 1 ) )
+            assertAAE( pars[k], alt.fit( ydata[k], weights=wgts[k], keep={0:5.0} ) )
+            self.assertTrue( self.eq( fitter.batchChisq[k], alt.chisq ) )
+
+    def testBand( self ):
+        """
+        test fit of a model with banded partials (BSplinesModel)
+
+        Compare with the solution of the full normal equations.
+
+        """
+        print( "\n   Fitter Test Band  \n" )
+        numpy.random.seed( 3456 )
+        x = numpy.linspace( 0, 10, 1001 )
+        y = numpy.sin( x ) + 0.1 * numpy.random.randn( 1001 )
+        w = numpy.random.rand( 1001 ) + 0.5
+
+        model = BSplinesModel( nrknots=41, min=0, max=10 )
+        values, first = model.partialBand( x )
+        self.assertTrue( values.shape == ( 1001, 4 ) )
+        design = model.partial( x, model.parameters )
+        for k in range( 4 ) :
+            assertAAE( values[:,k], design[numpy.arange( 1001 ), first + k] )
+
+        fitter = Fitter( x, model )
+        for wgt in [None, w] :
+            dw = design if wgt is None else design * wgt[:,numpy.newaxis]
+            yw = y if wgt is None else y * wgt
+            hes = numpy.dot( dw.transpose(), design )
+            assertAAE( fitter.getHessian( weights=wgt ), hes )
+            assertAAE( fitter.getVector( yw ), numpy.dot( yw, design ) )
+
+            par = fitter.fit( y, weights=wgt )
+            assertAAE( par, numpy.linalg.solve( hes, numpy.dot( yw, design ) ) )
+            ## stdevs are taken from the unweighted hessian
+            cov = numpy.linalg.inv( numpy.dot( design.transpose(), design ) )
+            assertAAE( fitter.stdevs, fitter.scale * numpy.sqrt( numpy.diag( cov ) ) )
+
+        ## no band when parameters are kept fixed
+        self.assertTrue( fitter.getBand( index=[0,1,2] ) is None )
+        par = fitter.fit( y, keep={0:0.0} )
+        self.assertTrue( par[0] == 0.0 )
+
 if __name__ == '__main__':
     unittest.main( )
 
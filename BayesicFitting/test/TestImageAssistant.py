@@ -6,6 +6,8 @@ from numpy.testing import assert_array_almost_equal as assertAAE
 from astropy import units
 import matplotlib.pyplot as plt
 import warnings
+import os
+import tempfile
 
 from BayesicFitting import PolySurfaceModel
 from BayesicFitting import ImageAssistant
@@ -107,6 +109,35 @@ class TestImageAssistant( unittest.TestCase ):
         print( ymap1 )
         assertAAE( ymap1, ymap + 1 )
 
+    def testImageAssistantPositions( self ):
+
+        print( "====ImageAssistant positions ===================" )
+        ymap = numpy.arange( 24, dtype=float ).reshape( 2, 3, 4 )
+        for order in ['C', 'F'] :
+            ia = ImageAssistant( order=order )
+            xdata = ia.getIndices( ymap )
+            pos = ia.getPositions( ymap )
+            assertAAE( pos, xdata + 0.5 )
+            assertAAE( ia.getPositions( ymap, center=False ), xdata )
+
+            ## the positions are the grid spanned by the axes
+            axes = ia.getAxes( ymap )
+            for k in range( 3 ) :
+                assertAAE( numpy.unique( pos[:,k] ), axes[k] )
+            kx = 0 if order == 'C' else 2
+            assertAAE( axes[kx], [0.5, 1.5] )
+
+        ## the other order on request
+        ia = ImageAssistant()
+        assertAAE( ia.getIndices( ymap, order='F' ), ia.getIndices( ymap )[:,::-1] )
+
+        with tempfile.TemporaryDirectory() as tmpdir :
+            filename = os.path.join( tmpdir, "pos.npy" )
+            pos = ia.getPositions( ymap, filename=filename )
+            self.assertTrue( isinstance( pos, numpy.memmap ) )
+            del pos
+            assertAAE( numpy.load( filename ), ia.getPositions( ymap ) )
+
     @classmethod
     def suite( cls ):
         return unittest.TestCase.suite( TestImageAssistant.__class__ )
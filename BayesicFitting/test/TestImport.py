@@ -0,0 +1,93 @@
+# run with : python3 -m unittest TestImport
+
+import unittest
+import os
+import sys
+import subprocess
+
+__author__ = "Do Kester"
+__year__ = 2018
+__license__ = "GPL3"
+__version__ = "0.9"
+__maintainer__ = "Do"
+__status__ = "Development"
+
+#  * This file is part of the BayesicFitting package.
+#  *
+#  * BayesicFitting is free software: you can redistribute it and/or modify
+#  * it under the terms of the GNU Lesser General Public License as
+#  * published by the Free Software Foundation, either version 3 of
+#  * the License, or ( at your option ) any later version.
+#  *
+#  * BayesicFitting is distributed in the hope that it will be useful,
+#  * but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  * MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+#  * GNU Lesser General Public License for more details.
+#  *
+#  * The GPL3 license can be found at <http://www.gnu.org/licenses/>.
+#  *
+#  *  2018 Do Kester
+
+## Run in a fresh interpreter; reports the package modules and the heavy modules loaded.
+SCRIPT = """
+import sys
+import BayesicFitting
+%s
+source = [m.split( "." )[-1] for m in sys.modules if m.startswith( "BayesicFitting.source." )]
+heavy = [m for m in ["matplotlib", "astropy"] if m in sys.modules]
+print( ",".join( source ), ",".join( heavy ) )
+"""
+
+class TestImport( unittest.TestCase ) :
+    """
+    Test harness for the (lazy) import of the package.
+
+    It checks which modules end up in sys.modules, to guard against
+    falling back to importing everything at once.
+
+    Author       Do Kester
+
+    """
+    def loadedModules( self, names ) :
+        env = dict( os.environ )
+        path = os.path.dirname( os.path.dirname( os.path.dirname( os.path.abspath( __file__ ) ) ) )
+        env["PYTHONPATH"] = path + os.pathsep + env.get( "PYTHONPATH", "" )
+        imp = "from BayesicFitting import %s" % names if names else ""
+        out = subprocess.check_output( [sys.executable, "-c", SCRIPT % imp], env=env )
+        words = out.decode().split( " " )
+        source = [w for w in words[0].strip().split( "," ) if w]
+        heavy = [w for w in words[1].strip().split( "," ) if w]
+        print( "%-40s %3d modules " % ( names, len( source ) ), heavy )
+        return source, heavy
+
+    def test1( self ):
+        print( "===== import test1: package ===================" )
+        source, heavy = self.loadedModules( "" )
+        self.assertTrue( len( source ) == 0 )
+        self.assertTrue( len( heavy ) == 0 )
+
+        source, heavy = self.loadedModules( "Tools" )
+        self.assertTrue( source == ["Tools"] )
+        self.assertTrue( len( heavy ) == 0 )
+
+    def test2( self ):
+        print( "===== import test2: sampler and fitters ===============" )
+        source, heavy = self.loadedModules( "NestedSampler, Fitter, GaussModel, SineModel" )
+        for name in ["NestedSampler", "Fitter", "GaussModel", "SineModel"] :
+            self.assertTrue( name in source )
+        ## modules that are not needed, stay out
+        for name in ["AmoebaFitter", "QRFitter", "StreamFitter", "BSplinesModel",
+                     "RobustShell", "LevenbergMarquardtFitter"] :
+            self.assertFalse( name in source )
+        self.assertTrue( len( heavy ) == 0 )
+
+    def test3( self ):
+        print( "===== import test3: plotting ===============" )
+        source, heavy = self.loadedModules( "plotFit" )
+        self.assertTrue( "Plotter" in source )
+        self.assertTrue( len( heavy ) == 0 )
+
+
+if __name__ == '__main__':
+    unittest.main( )
+
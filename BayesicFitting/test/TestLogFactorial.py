@@ -68,6 +68,13 @@ class TestLogFactorial( unittest.TestCase ):
         print( lf2[k] )
         assertAAE( lf1, lf2 )
 
+        ## any shape; beyond the table from the log-gamma function
+        data = numpy.asarray( [[0, 99], [100, 1000]] )
+        lf = logFactorial( data )
+        self.assertTrue( lf.shape == ( 2, 2 ) )
+        assertAAE( lf[1], [logFactorial( 100 ), math.lgamma( 1001 )] )
+        self.assertTrue( logFactorial( 1000 ) == lf[1,1] )
+
 
     @classmethod
     def suite( cls ):
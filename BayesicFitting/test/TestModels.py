@@ -5,6 +5,7 @@ import numpy as numpy
 from astropy import units
 import matplotlib.pyplot as plt
 import warnings
+from numpy.testing import assert_array_almost_equal as assertAAE
 
 from StdTests import stdModeltest
 
@@ -317,6 +318,49 @@ class TestModels( unittest.TestCase ):
         p = numpy.asarray( [1,-2,3,-2], dtype=float )
         stdModeltest( m, p, plot=plot )
 
+    def testDesignCache( self ):
+        x  = numpy.asarray( [-1.0, -0.8, -0.6, -0.4, -0.2, 0.0, 0.2, 0.4, 0.6, 0.8, 1.0] )
+        print( "******DESIGN CACHE********************" )
+        m = PolynomialModel( 2 )
+        p = numpy.asarray( [1,-2,3], dtype=float )
+        r = m.result( x, p )
+        d = m.partial( x, p )
+        self.assertTrue( d is m.design( x, p ) )
+        self.assertFalse( d.flags.writeable )
+        self.assertTrue( len( m._designs ) == 1 )
+
+        ## new xdata (even equal ones) get their own design
+        x2 = x.copy()
+        assertAAE( m.result( x2, p ), r )
+        self.assertTrue( len( m._designs ) == 2 )
+        for k in range( 2 * m.NCACHE ) :
+            m.result( x + k, p )
+        self.assertTrue( len( m._designs ) == m.NCACHE )
+
+        ## xdata changed in place, is recognized
+        x3 = numpy.linspace( 0, 1, 5 )
+        m = PolynomialModel( 1 )
+        assertAAE( m.result( x3, [0, 1] ), x3 )
+        x3 += 10
+        assertAAE( m.result( x3, [0, 1] ), numpy.linspace( 10, 11, 5 ) )
+
+        ## changing an attribute invalidates the cache
+        m = SineAmpModel( 1.0 )
+        p = numpy.asarray( [1.0, 0.5] )
+        r1 = m.result( x, p )
+        m.frequency = 2.0
+        r2 = m.result( x, p )
+        assertAAE( r2, SineAmpModel( 2.0 ).result( x, p ) )
+        self.assertFalse( numpy.allclose( r1, r2 ) )
+
+        ## as does growing a dynamic model
+        m = PolynomialDynamicModel( 1 )
+        m.result( x, [1.0, 2.0] )
+        m.grow()
+        assertAAE( m.result( x, [1.0, 2.0, 3.0] ), 1 + 2 * x + 3 * x * x )
+        m.shrink()
+        assertAAE( m.result( x, [1.0, 2.0] ), 1 + 2 * x )
+
     def testFixedPolynomialModel( self, plot=False ):
         x  = numpy.asarray( [-1.0, -0.8, -0.6, -0.4, -0.2, 0.0, 0.2, 0.4, 0.6, 0.8, 1.0] )
         print( "******POLYNOMIAL FIXED****************" )
@@ -5,6 +5,9 @@ import unittest
 import numpy as numpy
 from astropy import units
 import math
+import os
+import tempfile
+import pickle
 from numpy.testing import assert_array_almost_equal as assertAAE
 from FitPlot import plotFit
 
@@ -37,6 +40,16 @@ __status__ = "Development"
 #  *
 #  *  2006 Do Kester
 
+class EnsembleEngine( GalileanEngine ):
+    """ GalileanEngine that needs all walkers of the ensemble to be present. """
+    def copy( self ):
+        return EnsembleEngine( self.walkers, self.errdis, copy=self )
+
+    def execute( self, walker, lowLhood ):
+        if any( w is None for w in self.walkers ) :
+            raise ValueError( "Walkers missing from the ensemble" )
+        return super( ).execute( walker, lowLhood )
+
 class TestNestedSampler( unittest.TestCase ):
     """
     Test harness for Fitter class.
@@ -167,6 +180,350 @@ class TestNestedSampler( unittest.TestCase ):
         self.dofit( ns, pp, plot=plot )
 
 
+    def test4( self, plot=False ):
+        print( "=========== Nested Sampler test 4: processes ============" )
+
+        pp, y0, x, y, w = self.makeData( n=1 )
+
+        gm = GaussModel( )
+        gm.setLimits( [-10,-10,  0], [ 10, 10, 10] )
+
+        ns = NestedSampler( x, gm, y, w, discard=4, processes=2 )
+        self.dofit( ns, pp, plot=plot )
+
+        ## same seed gives same results
+        gm = GaussModel( )
+        gm.setLimits( [-10,-10,  0], [ 10, 10, 10] )
+        ns2 = NestedSampler( x, gm, y, w, discard=4, processes=2, verbose=0 )
+        self.assertEqual( ns.evidence, ns2.sample() )
+        assertAAE( ns.parameters, ns2.parameters )
+
+
+    def test5( self ):
+        print( "=========== Nested Sampler test 5: findWorst ============" )
+
+        pp, y0, x, y, w = self.makeData( n=1 )
+
+        gm = GaussModel( )
+        gm.setLimits( [-10,-10,  0], [ 10, 10, 10] )
+
+        ns = NestedSampler( x, gm, y, w, discard=3, verbose=0 )
+        fitIndex, allpars = ns.makeFitlist()
+        ns.initWalkers( allpars, fitIndex )
+
+        rng = numpy.random.RandomState( 5 )
+        for k in range( 50 ) :
+            worst = ns.findWorst()
+            logl = [ns.walkers[i].logL for i in range( ns.ensemble )]
+            self.assertTrue( worst == sorted( range( ns.ensemble ), key=lambda i: logl[i] )[:3] )
+            self.assertTrue( ns.lowLhood == logl[worst[-1]] )
+            ## replace the worst ones and change another one
+            for i in worst :
+                ns.walkers[i].logL = ns.lowLhood + rng.rand()
+            ns.walkers[rng.randint( ns.ensemble )].logL += rng.rand()
+
+    def test6( self ):
+        print( "=========== Nested Sampler test 6: restart ==============" )
+
+        pp, y0, x, y, w = self.makeData( n=1 )
+        lolim = [-10,-10,  0]
+        hilim = [ 10, 10, 10]
+
+        gm = GaussModel( )
+        gm.setLimits( lolim, hilim )
+        ns = NestedSampler( x, gm, y, w, maxsize=500, verbose=0 )
+        evid = ns.sample()
+
+        with tempfile.TemporaryDirectory() as tmpdir :
+            filename = os.path.join( tmpdir, "ns6" )
+
+            ## checkpoints do not disturb the run
+            gm = GaussModel( )
+            gm.setLimits( lolim, hilim )
+            ns1 = NestedSampler( x, gm, y, w, maxsize=500, verbose=0,
+                                 restart=StopStart( filename, cadence=50 ) )
+            self.assertEqual( evid, ns1.sample() )
+            self.assertTrue( os.path.exists( filename + ".state" ) )
+
+            ## restart from the last checkpoint ends up at the same place
+            gm = GaussModel( )
+            gm.setLimits( lolim, hilim )
+            ns2 = NestedSampler( x, gm, y, w, maxsize=500, verbose=0, restart=filename )
+            self.assertEqual( evid, ns2.sample() )
+            self.assertTrue( ns2.restart.logWidth is not None )
+            self.assertEqual( ns.iteration, ns2.iteration )
+            self.assertTrue( numpy.all( ns.parameters == ns2.parameters ) )
+            self.assertTrue( numpy.all( ns.samples.getIds() == ns2.samples.getIds() ) )
+            self.assertEqual( ns.engines[0].report, ns2.engines[0].report )
+
+    def test7( self ):
+        print( "=========== Nested Sampler test 7: marginalize ==========" )
+
+        pp, y0, x, y, w = self.makeData( n=1 )
+        lolim = [-10,-10,  0]
+        hilim = [ 10, 10, 10]
+
+        gm = GaussModel( )
+        gm.setLimits( lolim, hilim )
+        ns = NestedSampler( x, gm, y, w, maxsize=500, limits=[0.01,10], verbose=0 )
+        evid = ns.sample()
+
+        gm = GaussModel( )
+        gm.setLimits( lolim, hilim )
+        gm.setMixedModel( [0] )
+        ns1 = NestedSampler( x, gm, y, w, maxsize=500, limits=[0.01,10], verbose=0,
+                             marginalize=True )
+        self.assertEqual( [0], ns1.marginalize )
+        self.assertEqual( [1,2,-1], ns1.makeFitlist()[0] )
+
+        ## marginal likelihood is the integral over the linear parameter
+        allpars = numpy.asarray( [0.0, 0.7, 0.4, 0.1] )
+        logL = ns1.distribution.logLikelihood( ns1.problem, allpars )
+        prob = ClassicProblem( gm, x, y, w )
+        amp = numpy.linspace( 7, 9, 2001 )
+        logLa = [ns1.distribution.logLikelihood( prob, [a, 0.7, 0.4, 0.1] ) for a in amp]
+        lmax = numpy.max( logLa )
+        logI = lmax + math.log( numpy.trapz( numpy.exp( logLa - lmax ), amp ) / 20 )
+        self.assertAlmostEqual( logL, logI, 6 )
+
+        self.dofit( ns1, pp )
+        self.assertTrue( abs( evid - ns1.evidence ) < 3 * ( ns.precision + ns1.precision ) )
+
+        gm1 = GaussModel( )                     ## not mixed
+        gm1.setLimits( lolim, hilim )
+        with self.assertRaises( ValueError ) :
+            NestedSampler( x, gm1, y, w, marginalize=True, verbose=0 )
+        with self.assertRaises( ValueError ) :
+            NestedSampler( x, gm, y, w, distribution="laplace", marginalize=True, verbose=0 )
+
+        ## linear parameters over the whole chain
+        g1 = GaussModel( )
+        g1.setMixedModel( [0] )
+        g2 = GaussModel( )
+        g2.setMixedModel( [0] )
+        ns2 = NestedSampler( x, g1 + g2, y, w, marginalize=True, verbose=0 )
+        self.assertEqual( [0,3], ns2.marginalize )
+
+        g1 = GaussModel( )
+        g2 = GaussModel( )
+        g2.setMixedModel( [0] )
+        with self.assertRaises( ValueError ) :
+            NestedSampler( x, g1 * g2, y, w, marginalize=True, verbose=0 )
+
+        ## drawing a sample leaves the cached solution alone
+        walker = ns1.walkers[0]
+        param = ns1.problem.solveLinear( walker.allpars )[0].copy()
+        ns1.toSample( walker, 0.0 )
+        self.assertTrue( numpy.all( param == ns1.problem.solveLinear( walker.allpars )[0] ) )
+
+    def test8( self ):
+        print( "=========== Nested Sampler test 8: precondition =========" )
+
+        numpy.random.seed( 3 )
+        x = numpy.linspace( 0, 10, 101 )
+        y = 1 + 0.5 * x - 0.05 * x * x + 0.1 * numpy.random.randn( 101 )
+
+        evid = []
+        calls = []
+        for precondition in [False, True] :
+            pm = PolynomialModel( 2 )
+            pm.setLimits( -10, 10 )
+            ns = NestedSampler( x, pm, y, engines=["chord"], verbose=0,
+                                distribution=GaussErrorDistribution( scale=0.1 ) )
+            ns.engines[0].precondition = precondition
+            evid += [ns.sample()]
+            calls += [ns.distribution.ncalls]
+            ns.report()
+
+        print( "evidence ", evid, "  calls ", calls )
+        ## polynomial coefficients are strongly correlated: fewer calls needed
+        self.assertTrue( abs( evid[0] - evid[1] ) < 4 * ns.precision )
+        self.assertTrue( calls[1] < calls[0] )
+
+    def test9( self ):
+        print( "=========== Nested Sampler test 9: ellipsoids ===========" )
+
+        numpy.random.seed( 5 )
+        x = numpy.linspace( 0, 10, 201 )
+        y = numpy.sin( 2 * math.pi * 0.4 * x ) + 0.3 * numpy.random.randn( 201 )
+
+        evid = []
+        calls = []
+        for engines in [None, ["ellipsoid"]] :
+            sm = SineModel( )
+            sm.setLimits( [0.01,-5,-5], [2,5,5] )
+            ns = NestedSampler( x, sm, y, engines=engines, verbose=0,
+                                distribution=GaussErrorDistribution( scale=0.3 ) )
+            evid += [ns.sample()]
+            calls += [ns.distribution.ncalls]
+            ns.report()
+
+        print( "evidence ", evid, "  calls ", calls )
+        self.assertTrue( abs( evid[0] - evid[1] ) < 4 * ns.precision )
+        self.assertTrue( calls[1] < calls[0] / 4 )
+
+    def test10( self ):
+        print( "=========== Nested Sampler test 10: adaptive engines ===========" )
+
+        numpy.random.seed( 5 )
+        x = numpy.linspace( 0, 10, 201 )
+        y = numpy.sin( 2 * math.pi * 0.4 * x ) + 0.3 * numpy.random.randn( 201 )
+
+        evid = []
+        for adaptive in [False, True] :
+            sm = SineModel( )
+            sm.setLimits( [0.01,-5,-5], [2,5,5] )
+            ns = NestedSampler( x, sm, y, engines=["galilean", "chord", "gibbs"],
+                                adaptive=adaptive, verbose=0,
+                                distribution=GaussErrorDistribution( scale=0.3 ) )
+            evid += [ns.sample()]
+            ns.report()
+
+        print( "evidence ", evid )
+        self.assertTrue( abs( evid[0] - evid[1] ) < 4 * ns.precision )
+
+        weights = ns.scheduler.weights
+        print( "weights  ", weights )
+        self.assertAlmostEqual( numpy.sum( weights ), 1.0 )
+        self.assertTrue( numpy.all( weights >= ns.scheduler.floor / 3 - 1e-12 ) )
+        self.assertTrue( numpy.all( ns.scheduler.nexec >= ns.scheduler.minexec ) )
+
+    def test11( self ):
+        print( "=========== Nested Sampler test 11: asynchronous ===========" )
+
+        numpy.random.seed( 5 )
+        x = numpy.linspace( 0, 10, 201 )
+        y = numpy.sin( 2 * math.pi * 0.4 * x ) + 0.3 * numpy.random.randn( 201 )
+
+        evid = []
+        for kwargs in [{}, {"asynchronous" : True},
+                       {"asynchronous" : True, "discard" : 4},
+                       {"asynchronous" : True, "discard" : 4, "processes" : 2}] :
+            sm = SineModel( )
+            sm.setLimits( [0.01,-5,-5], [2,5,5] )
+            ns = NestedSampler( x, sm, y, verbose=0,
+                                distribution=GaussErrorDistribution( scale=0.3 ), **kwargs )
+            evid += [ns.sample()]
+            print( kwargs, evid[-1], ns.precision, ns.iteration )
+
+            ## the low likelihood of the discarded walkers only goes up
+            logL = ns.samples.getLogLikelihoodEvolution()[:ns.iteration]
+            self.assertTrue( numpy.all( logL[1:] >= logL[:-1] ) )
+
+        ## one walker in exploration is the same as the synchronous sampler
+        self.assertAlmostEqual( evid[0], evid[1], 10 )
+        for ev in evid[2:] :
+            self.assertTrue( abs( evid[0] - ev ) < 4 * ns.precision )
+
+        with self.assertRaises( ValueError ) :
+            NestedSampler( x, sm, y, asynchronous=True, restart="ns11", verbose=0 )
+
+    def test12( self ):
+        print( "=========== Nested Sampler test 12: ensemble in pool ===========" )
+
+        numpy.random.seed( 5 )
+        x = numpy.linspace( 0, 10, 201 )
+        y = numpy.sin( 2 * math.pi * 0.4 * x ) + 0.3 * numpy.random.randn( 201 )
+
+        evid = []
+        for processes in [0, 2] :
+            sm = SineModel( )
+            sm.setLimits( [0.01,-5,-5], [2,5,5] )
+            ns = NestedSampler( x, sm, y, discard=2, processes=processes, verbose=0,
+                                engines=[EnsembleEngine( None, None ), "chord"],
+                                distribution=GaussErrorDistribution( scale=0.3 ) )
+            evid += [ns.sample()]
+
+        print( "evidence ", evid )
+        self.assertTrue( abs( evid[0] - evid[1] ) < 4 * ns.precision )
+
+    def test13( self ):
+        print( "=========== Nested Sampler test 13: ellipsoids ===========" )
+
+        numpy.random.seed( 5 )
+        x = numpy.linspace( 0, 10, 201 )
+        y = numpy.sin( 2 * math.pi * 0.4 * x ) + 0.3 * numpy.random.randn( 201 )
+
+        def sampler( processes=0, restart=None ) :
+            sm = SineModel( )
+            sm.setLimits( [0.01,-5,-5], [2,5,5] )
+            return NestedSampler( x, sm, y, processes=processes, verbose=0,
+                                  engines=["ellipsoid", "chord"], restart=restart,
+                                  distribution=GaussErrorDistribution( scale=0.3 ) )
+
+        ## the ellipsoids are fitted in the main process and sent to the workers
+        evid = []
+        for processes in [0, 2] :
+            ns = sampler( processes=processes )
+            evid += [ns.sample()]
+            self.assertTrue( ns.engines[0].bound[0] is not None )
+            self.assertTrue( ns.engines[0].report[0] > 0 )
+
+        print( "evidence ", evid )
+        self.assertTrue( abs( evid[0] - evid[1] ) < 4 * ns.precision )
+
+        ## the ellipsoids are part of the checkpoint
+        with tempfile.TemporaryDirectory() as tmpdir :
+            filename = os.path.join( tmpdir, "ns13" )
+            ns1 = sampler( restart=StopStart( filename, cadence=47 ) )
+            self.assertEqual( evid[0], ns1.sample() )
+
+            ns2 = sampler( restart=filename )
+            self.assertEqual( evid[0], ns2.sample() )
+            self.assertEqual( ns1.engines[0].report, ns2.engines[0].report )
+
+    def testScheduler( self ):
+        print( "=========== Nested Sampler test: EngineScheduler ===========" )
+        sched = EngineScheduler( 2, floor=0.2, decay=1.0, minexec=2 )
+        sched.update( 0, 4, 10, 1.0 )
+        sched.update( 1, 1, 10, 1.0 )
+        assertAAE( sched.weights, [0.5, 0.5] )
+
+        sched.merge( [( 0, 4, 10, 1.0 ), ( 1, 1, 10, 1.0 )] )
+        assertAAE( sched.movesPerCall(), [0.4, 0.1] )
+        assertAAE( sched.weights, [0.1 + 0.8 * 0.8, 0.1 + 0.8 * 0.2] )
+
+        rng = numpy.random.RandomState( 3 )
+        sel = numpy.concatenate( [sched.select( rng ) for k in range( 1000 )] )
+        self.assertTrue( abs( numpy.mean( sel == 0 ) - sched.weights[0] ) < 0.05 )
+
+        numpy.random.seed( 5 )
+        x = numpy.linspace( 0, 10, 201 )
+        y = numpy.sin( 2 * math.pi * 0.4 * x ) + 0.3 * numpy.random.randn( 201 )
+
+        def sampler( threads=False, restart=None ) :
+            sm = SineModel( )
+            sm.setLimits( [0.01,-5,-5], [2,5,5] )
+            return NestedSampler( x, sm, y, threads=threads, discard=2, adaptive=True,
+                                  restart=restart, verbose=0,
+                                  distribution=GaussErrorDistribution( scale=0.3 ) )
+
+        ## in threads, each engine is charged with its own calls only
+        ns = sampler( threads=True )
+        ns.sample()
+        ns.scheduler = EngineScheduler( len( ns.engines ), decay=1.0 )
+        explorer = Explorer( ns, threads=True )
+        ncalls = ns.distribution.ncalls + ns.distribution.nparts
+        for k in range( 20 ) :
+            explorer.explore( list( range( 8 ) ), ns.lowLhood )
+        ncalls = ns.distribution.ncalls + ns.distribution.nparts - ncalls
+        print( "calls  ", numpy.sum( ns.scheduler.calls ), ncalls )
+        self.assertTrue( numpy.sum( ns.scheduler.calls ) <= ncalls )
+
+        ## the scheduler is part of the checkpoint
+        with tempfile.TemporaryDirectory() as tmpdir :
+            filename = os.path.join( tmpdir, "nss" )
+            ns1 = sampler( restart=StopStart( filename, cadence=50 ) )
+            ns1.sample()
+            with open( filename + ".state", "rb" ) as fp :
+                state = pickle.load( fp )
+            nexec = state["scheduler"]["nexec"]
+            self.assertTrue( numpy.all( nexec > 0 ) )
+
+            ns2 = sampler( restart=filename )
+            ns2.sample()
+            self.assertTrue( numpy.all( ns2.scheduler.nexec >= nexec ) )
+
     def dofit( self, ns, pp, plot=False ) :
         logE = ns.sample( plot=plot )
 
@@ -8,6 +8,8 @@ import math
 from BayesicFitting import Prior, UniformPrior, JeffreysPrior, ExponentialPrior
 from BayesicFitting import LaplacePrior, CauchyPrior, GaussPrior
 from BayesicFitting import CircularUniformPrior
+from BayesicFitting import PriorTable
+from numpy.testing import assert_array_almost_equal as assertAAE
 
 
 __author__ = "Do Kester"
@@ -505,6 +507,38 @@ class TestPrior( unittest.TestCase ) :
         self.assertAlmostEqual( prior.partialDomain2Unit(9 ), prior.numPartialDomain2Unit( 9 ), 4 )
         self.assertAlmostEqual( prior.partialDomain2Unit(1 ), prior.numPartialDomain2Unit( 1 ), 4 )
 
+    def testPriorTable( self ):
+        print( "===== Prior Table Tests ===========================\n" )
+
+        priors = [UniformPrior( limits=[-10,10] ), CircularUniformPrior( limits=[0,6] ),
+                  JeffreysPrior( limits=[0.1,100] ), ExponentialPrior( scale=2 ),
+                  LaplacePrior( center=1, scale=2 ), GaussPrior( center=-1, scale=3 ),
+                  CauchyPrior( center=2, scale=0.5 ), None]
+        table = PriorTable( priors )
+        print( table.kind )
+        self.assertTrue( len( table ) == 8 )
+        self.assertTrue( table.kind[-1] == PriorTable.NONE )
+
+        uval = numpy.linspace( 0.05, 0.95, 24 ).reshape( 3, 8 )
+        dval = table.unit2Domain( uval )
+        self.assertTrue( dval.shape == ( 3, 8 ) )
+        for k, prior in enumerate( priors ) :
+            if prior is None :
+                assertAAE( dval[:,k], 0.0 )
+                continue
+            dv = [prior.unit2Domain( u ) for u in uval[:,k]]
+            assertAAE( dval[:,k], dv, 10 )
+            uv = [prior.domain2Unit( d ) for d in dv]
+            assertAAE( table.domain2Unit( dval )[:,k], uv, 10 )
+
+        kpar = [0, 3, -2]
+        dv = table.unit2Domain( uval[0,kpar], kpar=kpar )
+        assertAAE( dv, [priors[k].unit2Domain( uval[0,k] ) for k in kpar] )
+
+        table = PriorTable( priors[:2], offset=[5, 0] )
+        assertAAE( table.unit2Domain( [0.5, 0.5] ), [5.0, 3.0] )
+        assertAAE( table.domain2Unit( [5.0, 3.0] ), [0.5, 0.5] )
+
     @classmethod
     def suite( cls ):
         return ConfiguredTestCase.suite( PriorTest.__class__ )
@@ -430,6 +430,33 @@ class TestProblem( unittest.TestCase ):
         print( aa.reshape( -1, 2 ) )
 
 
+    def test6( self ) :
+        print( "====test6 data terms======================================" )
+        x = numpy.arange( 5, dtype=float )
+        y = numpy.array( [3,0,150,9,2], dtype=float )
+        w = numpy.array( [1,2,1,2,1], dtype=float )
+
+        problem = ClassicProblem( PolynomialModel( 1 ), x, y )
+        self.assertTrue( problem.ndata == 5 and problem.sumweight == 5 )
+
+        lf = problem.getDataTerm( "logFactorial", PoissonErrorDistribution.logFactorialData )
+        assertAAE( lf, logFactorial( y ) )
+        self.assertTrue( lf is problem.getDataTerm( "logFactorial", None ) )
+
+        ## replacing the weights or the data invalidates the terms
+        problem.weights = w
+        self.assertTrue( problem.sumweight == 7 )
+        problem.ydata = y[:4]
+        self.assertTrue( problem.ndata == 4 and problem.sumweight == 7 )
+        lf4 = problem.getDataTerm( "logFactorial", PoissonErrorDistribution.logFactorialData )
+        self.assertTrue( len( lf4 ) == 4 )
+
+        ## changes in place need an explicit clear
+        problem.weights[0] = 3
+        self.assertTrue( problem.sumweight == 7 )
+        problem.clearDataTerms()
+        self.assertTrue( problem.sumweight == 9 )
+
     @classmethod
     def suite( cls ):
         return unittest.TestCase.suite( ErrorDistributionTest.__class__ )
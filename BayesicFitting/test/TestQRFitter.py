@@ -147,6 +147,47 @@ class TestQRFitter( unittest.TestCase ):
         print( "error = ", error1 )
 
 
+    def testBatch( self ):
+        """
+        test batch fit of many datasets
+
+        1. Compare with fits of the individual datasets
+
+        2. Per-dataset weights and kept parameters
+
+        """
+        print( "\n   QRFitter Test Batch  \n" )
+        numpy.random.seed( 3456 )
+        yy = self.aa + self.bb * self.x
+        ydata = yy + self.ss * numpy.random.randn( 6, 11 )
+        wgts = numpy.random.rand( 6, 11 ) + 0.5
+
+        model = PolynomialModel( 1 )
+        model.setLimits( -10, 10 )
+        fitter = QRFitter( self.x, model )
+        pars = fitter.fitBatch( ydata )
+        stdv = fitter.getBatchStandardDeviations()
+        logz = fitter.getBatchLogZ( noiseLimits=[0.01,10] )
+        print( "   par  ", pars[0], " stdv  ", stdv[0], logz[0] )
+        self.assertTrue( pars.shape == ( 6, 2 ) )
+
+        for k in range( 6 ) :
+            alt = QRFitter( self.x, PolynomialModel( 1 ) )
+            alt.model.setLimits( -10, 10 )
+            assertAAE( pars[k], alt.fit( ydata[k] ) )
+            self.assertTrue( self.eq( fitter.batchChisq[k], alt.chisq ) )
+            assertAAE( stdv[k], alt.stdevs )
+            self.assertTrue( self.eq( logz[k], alt.getLogZ( noiseLimits=[0.01,10] ) ) )
+
+        pars = fitter.fitBatch( ydata, weights=wgts, keep={0:5.0} )
+        print( "   par  ", pars[0], " stdv  ", fitter.getBatchStandardDeviations()[0] )
+        self.assertTrue( numpy.all( pars[:,0] == 5.0 ) )
+        self.assertTrue( numpy.all( fitter.getBatchStandardDeviations()[:,0] == 0 ) )
+        for k in range( 6 ) :
+            alt = QRFitter( self.x, PolynomialModel( 1 ) )
+            assertAAE( pars[k], alt.fit( ydata[k], weights=wgts[k], keep={0:5.0} ) )
+            self.assertTrue( self.eq( fitter.batchChisq[k], alt.chisq ) )
+
 if __name__ == '__main__':
     unittest.main( )
 
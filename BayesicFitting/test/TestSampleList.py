@@ -6,6 +6,7 @@ import sys
 from numpy.testing import assert_array_almost_equal as assertAAE
 from astropy import units
 import math
+import pickle
 
 from BayesicFitting import *
 from BayesicFitting import formatter as fmt
@@ -54,7 +55,107 @@ class TestSampleList( unittest.TestCase ):
 
 
     #  **************************************************************
-    def testSampleList( self ):
+    def testColumnarSampleList( self ):
+        self.testSampleList( columnar=True )
+
+        gm = GaussModel( )
+        sl = SampleList( gm, 0, columnar=True )
+        for k in range( 100 ) :
+            s = Sample( k, -1, gm, parameters=numpy.asarray( [1.0, 0.0, k+1.0] ) )
+            s.hyper = [0.1 * k]
+            s.logL = -k
+            s.logW = -0.1 * k
+            sl.add( s )
+        self.assertTrue( len( sl ) == 100 )
+        self.assertTrue( len( sl[10:20] ) == 10 )
+        self.assertTrue( sl[-1].id == 99 )
+        self.assertTrue( sl[37].parent == 37 )
+        self.assertTrue( sl[37].hypars[0] == 3.7 )
+
+        sl[5].logL = 3.0
+        self.assertTrue( sl.getLogLikelihoodEvolution()[5] == 3.0 )
+        del sl[5]
+        self.assertTrue( len( sl ) == 99 )
+        self.assertTrue( sl[5].parameters[2] == 7.0 )
+
+        sl.weed( maxsize=50 )
+        self.assertTrue( len( sl ) == 50 )
+        self.assertTrue( sl[49].id == 50 )
+
+        sl2 = pickle.loads( pickle.dumps( sl ) )
+        self.assertTrue( sl2.columnar )
+        self.assertTrue( len( sl2 ) == 50 )
+        assertAAE( sl2.getParameterEvolution(), sl.getParameterEvolution() )
+        assertAAE( sl2.parameters, sl.parameters )
+
+    def testListMethods( self ):
+        print( "=========  SampleList list methods  =======================" )
+        gm = GaussModel( )
+        lists = [SampleList( gm, 0 ), SampleList( gm, 0, columnar=True )]
+        for sl in lists :
+            for k in range( 10 ) :
+                s = Sample( k, -1, gm, parameters=numpy.asarray( [1.0, 0.0, k+1.0] ) )
+                s.logL = -( k % 4 )
+                sl.add( s )
+
+            self.assertTrue( sl[0] in sl )
+            self.assertTrue( sl.index( sl[3] ) == 3 )
+            self.assertTrue( sl.count( sl[3] ) == 1 )
+            self.assertTrue( [s.id for s in reversed( sl )] == list( range( 9, -1, -1 ) ) )
+
+            s = sl.pop()
+            self.assertTrue( s.id == 9 and len( sl ) == 9 )
+            self.assertFalse( s in sl )
+            with self.assertRaises( ValueError ) :
+                sl.index( s )
+            sl.insert( 2, s )
+            self.assertTrue( sl[2].id == 9 and sl[3].id == 2 and len( sl ) == 10 )
+            sl.remove( sl[2] )
+            self.assertTrue( sl[2].id == 2 and len( sl ) == 9 )
+
+            sl.sort( )
+            self.assertTrue( numpy.all( numpy.diff( sl.getLogLikelihoodEvolution() ) >= 0 ) )
+            sl.reverse( )
+            sl.extend( [s] )
+            self.assertTrue( sl[-1].parameters[2] == 10.0 )
+
+        self.assertTrue( [s.id for s in lists[0]] == [s.id for s in lists[1]] )
+        assertAAE( lists[0].getParameterEvolution(), lists[1].getParameterEvolution() )
+
+        lists[1].clear()
+        self.assertTrue( len( lists[1] ) == 0 )
+        with self.assertRaises( IndexError ) :
+            lists[1].pop()
+
+    def testWeed( self ):
+        print( "=========  SampleList weed  =======================" )
+        gm = GaussModel( )
+        numpy.random.seed( 1234 )
+        sl1 = SampleList( gm, 0 )
+        sl2 = SampleList( gm, 0, columnar=True )
+        for k in range( 2000 ) :
+            s = Sample( k, -1, gm, parameters=numpy.random.rand( 3 ) )
+            s.logL = 0.01 * k
+            s.logW = numpy.round( numpy.random.randn( ), 1 )
+            sl1.add( s.copy() )
+            sl2.add( s )
+            if k % 7 == 0 :
+                sl1.weed( 300 )
+                sl2.weed( 300 )
+                self.assertTrue( len( sl1 ) == len( sl2 ) )
+            if k == 1000 :
+                sl1[0].logW = 5.0
+                sl2[0].logW = 5.0
+
+        sl1.weed( 100 )
+        sl2.weed( 100 )
+        self.assertTrue( len( sl2 ) == 100 )
+        assertAAE( sl1.getGeneration(), sl2.getGeneration() )
+        assertAAE( sl1.getLogWeightEvolution(), sl2.getLogWeightEvolution() )
+        assertAAE( sl1.getParameterEvolution(), sl2.getParameterEvolution() )
+        self.assertTrue( sl2[0].id == 0 )
+
+    def testSampleList( self, columnar=False ):
         print( "=========  SampleListTest  =======================" )
         gm = GaussModel( )
         gm += PolynomialModel( 0 )
@@ -63,7 +164,8 @@ class TestSampleList( unittest.TestCase ):
 #        errdis = GaussErrorDistribution( )
 
         lnZ = 1.234
-        sl0 = SampleList( gm, self.len )
+        sl0 = SampleList( gm, self.len, columnar=columnar )
+        self.assertTrue( sl0.columnar == columnar )
         k = 0
         for s in sl0 :
             self.assertTrue( s.id == k )
@@ -82,7 +184,7 @@ class TestSampleList( unittest.TestCase ):
         ap = numpy.append( gm.parameters, [0.5] )
         fi = numpy.asarray( [0,1,2,3,-1] )
 
-        sl = SampleList( gm, self.len, parameters=ap, fitIndex=fi )
+        sl = SampleList( gm, self.len, parameters=ap, fitIndex=fi, columnar=columnar )
         k = 0
         for s in sl:
             s.id = k + 1
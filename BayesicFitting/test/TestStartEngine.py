@@ -71,6 +71,14 @@ class TestStartEngine( TestEngine ):
         copeng = engine.copy()
         self.startenginetest( copeng )
 
+        print( "    all walkers at once" )
+        errdis.ncalls = 0
+        engine.executeEnsemble( wl, -math.inf )
+        self.assertTrue( errdis.ncalls == len( wl ) )
+        for samp in wl :
+            self.assertAlmostEqual( samp.logL, errdis.logLikelihood( problem, samp.allpars ), 8 )
+        self.assertTrue( len( set( samp.allpars[0] for samp in wl ) ) == len( wl ) )
+
         if plot :
             parevo = sl.getParameterEvolution()
             sclevo = sl.getScaleEvolution()
@@ -0,0 +1,145 @@
+# run with : python3 -m unittest TestStreamFitter
+
+import numpy as numpy
+from numpy.testing import assert_array_almost_equal as assertAAE
+import unittest
+import os
+import pickle
+import tempfile
+
+from BayesicFitting import *
+
+__author__ = "Do Kester"
+__year__ = 2018
+__license__ = "GPL3"
+__version__ = "0.9"
+__maintainer__ = "Do"
+__status__ = "Development"
+
+#  *
+#  * This file is part of the BayesicFitting package.
+#  *
+#  * BayesicFitting is free software: you can redistribute it and/or modify
+#  * it under the terms of the GNU Lesser General Public License as
+#  * published by the Free Software Foundation, either version 3 of
+#  * the License, or ( at your option ) any later version.
+#  *
+#  * BayesicFitting is distributed in the hope that it will be useful,
+#  * but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  * MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+#  * GNU Lesser General Public License for more details.
+#  *
+#  * The GPL3 license can be found at <http://www.gnu.org/licenses/>.
+#  *
+#  *    2018        Do Kester
+
+class TestStreamFitter( unittest.TestCase ):
+    """
+    Test harness for StreamFitter class.
+
+    Author:      Do Kester
+
+    """
+    def makeData( self ) :
+        numpy.random.seed( 5678 )
+        x = numpy.linspace( -1.0, 2.0, 1001 )
+        y = 1.0 + 0.5 * x - 0.2 * x * x + 0.1 * numpy.random.randn( 1001 )
+        w = numpy.random.rand( 1001 ) + 0.5
+        return ( x, y, w )
+
+    def makeModel( self ) :
+        model = PolynomialModel( 2 )
+        model.setLimits( -10, 10 )
+        return model
+
+    def compare( self, fitter, stream, evidence=True ) :
+        assertAAE( fitter.parameters, stream.parameters )
+        assertAAE( fitter.chisq, stream.chisq )
+        assertAAE( fitter.scale, stream.scale )
+        assertAAE( fitter.stdevs, stream.stdevs )
+        assertAAE( fitter.covariance, stream.covariance )
+        if evidence :
+            assertAAE( fitter.getLogZ( noiseLimits=[0.01,10] ),
+                       stream.getLogZ( noiseLimits=[0.01,10] ) )
+        self.assertTrue( fitter.sumwgt == stream.sumwgt )
+
+    def testStream( self ):
+        print( "\n   StreamFitter Test 1  \n" )
+        x, y, w = self.makeData()
+
+        fitter = Fitter( x, self.makeModel() )
+        par = fitter.fit( y )
+
+        stream = StreamFitter( self.makeModel() )
+        spar = stream.fit( StreamFitter.chunks( x, y, size=300 ) )
+        print( "param  ", par )
+        print( "stream ", spar )
+        self.assertTrue( stream.nxdata == len( x ) )
+        self.compare( fitter, stream )
+
+        ## from files, with weights
+        par = fitter.fit( y, weights=w )
+        stream = StreamFitter( self.makeModel() )
+        with tempfile.TemporaryDirectory() as tmpdir :
+            names = [os.path.join( tmpdir, name ) for name in ["x.npy", "y.npy", "w.npy"]]
+            for name, data in zip( names, [x, y, w] ) :
+                numpy.save( name, data )
+            stream.fit( StreamFitter.chunks( *names, size=256 ) )
+        assertAAE( par, stream.parameters )
+        assertAAE( fitter.chisq, stream.chisq )
+
+    def testMerge( self ):
+        print( "\n   StreamFitter Test 2: merge  \n" )
+        x, y, w = self.makeData()
+
+        keep = {1:0.5}
+        fitter = Fitter( x, self.makeModel(), keep=keep )
+        fitter.fit( y )
+
+        ## accumulate parts separately (as in other processes)
+        parts = []
+        for k in range( 3 ) :
+            part = StreamFitter( self.makeModel(), keep=keep )
+            part.accumulate( x[k::3], y[k::3] )
+            parts += [pickle.loads( pickle.dumps( part ) )]
+
+        stream = parts[0].merge( parts[1] ).merge( parts[2] )
+        stream.fit()
+        print( "param  ", fitter.parameters )
+        print( "stream ", stream.parameters )
+        self.assertTrue( stream.parameters[1] == 0.5 )
+        ## Fitter takes the evidence from the hessian of all parameters
+        self.compare( fitter, stream, evidence=False )
+
+        with self.assertRaises( ValueError ) :
+            stream.merge( StreamFitter( self.makeModel() ) )
+
+    def testOffset( self ):
+        print( "\n   StreamFitter Test 3: large offset  \n" )
+        numpy.random.seed( 2345 )
+        x = numpy.linspace( 0.0, 1.0, 1000001 )
+        y = 1e5 + 2 * x + 1e-3 * numpy.random.randn( 1000001 )
+
+        fitter = Fitter( x, PolynomialModel( 1 ) )
+        par = fitter.fit( y )
+
+        stream = StreamFitter( PolynomialModel( 1 ) )
+        spar = stream.fit( StreamFitter.chunks( x, y, size=100000 ) )
+        print( "param  ", par, fitter.chisq )
+        print( "stream ", spar, stream.chisq )
+        assertAAE( par, spar )
+        self.assertTrue( abs( fitter.chisq - stream.chisq ) < 1e-6 * fitter.chisq )
+
+        ## merged parts
+        parts = [StreamFitter( PolynomialModel( 1 ) ) for k in range( 2 )]
+        parts[0].accumulate( x[::2], y[::2] )
+        parts[1].accumulate( x[1::2], y[1::2] )
+        stream = parts[0].merge( parts[1] )
+        stream.fit()
+        assertAAE( par, stream.parameters )
+        self.assertTrue( abs( fitter.chisq - stream.chisq ) < 1e-6 * fitter.chisq )
+
+
+if __name__ == '__main__':
+    unittest.main( )
+